@@ -0,0 +1,87 @@
+"""
+Import time benchmark
+=====================
+
+Measures the time of importing modules in a fresh interpreter and checks which of them load Qt.
+`mdp_visualizer.logic`, `mdp_visualizer.settings` and `mdp_visualizer.train` must not import Qt.
+
+Run in the project directory:
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --max-ms 500
+
+With `--max-ms` the exit code is 1 if a Qt-free module loads Qt or is imported slower than the threshold.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+# modules which must be importable without Qt, and the GUI for comparison
+QT_FREE_MODULES = ('mdp_visualizer.logic', 'mdp_visualizer.settings', 'mdp_visualizer.train')
+GUI_MODULES = ('mdp_visualizer.gui.mainwindow',)
+
+_PROBE = """
+import sys
+from time import perf_counter
+start = perf_counter()
+import {module}
+elapsed = perf_counter() - start
+print(elapsed, any(name.startswith('PyQt5') for name in sys.modules))
+"""
+
+
+def measure(module, repeats=5):
+    """Imports the module in `repeats` fresh interpreters.
+
+    Returns:
+        tuple: (median import time in seconds, Qt was loaded or not)
+    """
+
+    times = []
+    loads_qt = False
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', _PROBE.format(module=module)],
+                                check=True, capture_output=True, text=True).stdout.split()
+        times.append(float(output[0]))
+        loads_qt = output[1] == 'True'
+
+    return float(np.median(times)), loads_qt
+
+
+def main(argv=None):
+    """Runs the benchmark and prints the results."""
+
+    parser = argparse.ArgumentParser(description='Import time benchmark')
+    parser.add_argument('--repeats', type=int, default=5, help='number of interpreters for every module')
+    parser.add_argument('--max-ms', type=float, help='maximal import time of Qt-free modules')
+    parser.add_argument('--json', help='file to save the results')
+    args = parser.parse_args(argv)
+
+    results = {}
+    failed = False
+    for module in QT_FREE_MODULES + GUI_MODULES:
+        elapsed, loads_qt = measure(module, args.repeats)
+        results[module] = {'import_ms': elapsed * 1000, 'loads_qt': loads_qt}
+        print(f"{module:35} {elapsed * 1000:8.1f} ms  {'Qt' if loads_qt else 'no Qt'}")
+
+        if module in QT_FREE_MODULES:
+            if loads_qt:
+                print(f"  {module} must not import Qt")
+                failed = True
+            if args.max_ms is not None and elapsed * 1000 > args.max_ms:
+                print(f"  {module} is imported slower than {args.max_ms} ms")
+                failed = True
+
+    if args.json is not None:
+        with open(args.json, 'w', encoding='utf-8') as json_file:
+            json.dump(results, json_file, indent=2)
+
+    return int(failed)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
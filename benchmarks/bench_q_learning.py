@@ -0,0 +1,93 @@
+"""
+Q-learning benchmark
+====================
+
+Compares ``q_learning`` with ``q_learning_fast`` on the AutomaticRL board and on FrozenLake (if gym is installed).
+
+Run in the project directory:
+
+    python -m benchmarks.bench_q_learning
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from mdp_visualizer.logic.gameLogic import GameLogic, GameParams
+from mdp_visualizer.logic.actions_objects_list import Modes
+from mdp_visualizer.logic.q_learning import q_learning, q_learning_fast
+from mdp_visualizer import settings
+
+
+class FrozenLake:
+    """FrozenLake-v0 from gym with the interface of GameLogic."""
+
+    def __init__(self):
+        # pylint: disable=C0415
+        import gym
+        self.env = gym.make('FrozenLake-v0')
+
+    def step(self, a):
+        """Performs the action."""
+        return self.env.step(a)
+
+    def reset(self):
+        """Resets the environment."""
+        return self.env.reset()
+
+    @property
+    def n_states(self):
+        """Number of states."""
+        return self.env.observation_space.n
+
+    @property
+    def n_actions(self):
+        """Number of actions."""
+        return self.env.action_space.n
+
+
+def automatic_rl_logic():
+    """GameLogic with the board of AutomaticRL mode."""
+    params = GameParams(Modes.AUTOMATICRL,
+                        game_height=settings.GAME_HEIGHT, game_width=settings.GAME_WIDTH,
+                        lava_random=settings.AUTOMATIC_LAVA_RANDOM, lava_reward=settings.LAVA_REWARD,
+                        lava_is_terminal=True,
+                        green_random=settings.GREEN_RANDOM, green_reward=settings.GREEN_REWARD,
+                        green_is_terminal=True)
+    return GameLogic(params)
+
+
+def measure(function, env, n_episodes=2000, n_steps=100):
+    """Runs Q-learning for a number of episodes and returns steps per second and mean episode reward."""
+    q_table = None
+    total_steps = 0
+    rewards = []
+
+    start = perf_counter()
+    for _ in range(n_episodes):
+        s = env.reset()
+        r, q_table, s, _, info = function(env, s, n_steps=n_steps, q_table=q_table, lr=0.3, gamma=0.95, eps=0.1)
+        total_steps += len(info['actions'])
+        rewards.append(r)
+    elapsed = perf_counter() - start
+
+    return total_steps / elapsed, np.mean(rewards)
+
+
+def main():
+    """Prints steps per second of both implementations."""
+    envs = [('AutomaticRL board', automatic_rl_logic())]
+    try:
+        envs.append(('FrozenLake', FrozenLake()))
+    except ImportError:
+        print("gym is not installed, FrozenLake is skipped")
+
+    for name, env in envs:
+        base, _ = measure(q_learning, env)
+        fast, _ = measure(q_learning_fast, env)
+        print(f"{name:>20}: q_learning {base:10.0f} steps/s, q_learning_fast {fast:10.0f} steps/s, "
+              f"speedup {fast / base:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+Benchmark suite
+===============
+
+Measures the throughput of the game logic and of Q-learning on boards from 4x5 up to 256x256
+in AutomaticRL mode and in IAmRLAgent mode with Hippo and Watermelon:
+
+    * ``step``: `GameLogic.step` calls per second with random actions (finished episodes are reset)
+    * ``reset`` and ``full_reset``: calls per second
+    * ``q_learning`` and ``q_learning_fast``: Q-learning steps per second
+    * ``episodes_to_threshold``: episodes of Q-learning until the greedy policy earns the optimal return
+      (AutomaticRL boards up to 16x16 only, the dynamics is deterministic there)
+
+Rates are the best of several repeats, every repeat runs for at least ``--min-time`` seconds.
+Results are saved to JSON and compared with a baseline: a metric which is worse than the baseline
+by more than ``--threshold`` is reported as a regression and the exit code is 1.
+
+Run in the project directory:
+
+    python -m benchmarks.suite --quick
+    python -m benchmarks.suite --output results.json --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+
+from mdp_visualizer import config
+from mdp_visualizer.logic.actions_objects_list import Modes
+from mdp_visualizer.logic.gameLogic import GameLogic, GameParams
+from mdp_visualizer.logic.planning import solve
+from mdp_visualizer.logic.q_learning import q_learning, q_learning_fast
+
+SIZES = ((4, 5), (16, 16), (64, 64), (256, 256))
+QUICK_SIZES = ((4, 5), (16, 16))
+MODES = ('automatic', 'iamrlagent')
+
+# metrics where lower values are better, the others are rates
+LOWER_IS_BETTER = frozenset(('episodes_to_threshold',))
+
+# Q-learning hyperparameters of the benchmarks
+LR, GAMMA, EPS = 0.5, 0.95, 0.2
+MAX_EPISODES = 2000
+
+
+def game_params(mode, height, width):
+    """Returns GameParams of the mode with the number of lava cells proportional to the board size."""
+
+    n_lava = max(config.AUTOMATIC_LAVA_RANDOM, height * width // 4)
+    if mode == 'automatic':
+        return GameParams(Modes.AUTOMATICRL, game_height=height, game_width=width,
+                          lava_random=n_lava, lava_reward=config.LAVA_REWARD, lava_is_terminal=True,
+                          green_random=config.GREEN_RANDOM, green_reward=config.GREEN_REWARD,
+                          green_is_terminal=True)
+
+    return GameParams(Modes.IAMRLAGENT, game_height=height, game_width=width,
+                      hippo_random=True, hippo_move_prob=config.HIPPO_MOVE_PROB,
+                      watermelon_random=True, watermelon_move_prob=config.WATERMELON_MOVE_PROB,
+                      lava_random=n_lava, lava_is_terminal=True, tick_penalty=config.TICK_PENALTY)
+
+
+def rate(run, min_time, repeats):
+    """Returns the best rate of `run` in calls per second.
+
+    Args:
+        run: Function which makes some calls and returns their number.
+        min_time (float): Minimal time of a repeat.
+        repeats (int): Number of repeats.
+    """
+
+    best = 0.
+    for _ in range(repeats):
+        calls = 0
+        start = perf_counter()
+        while True:
+            calls += run()
+            elapsed = perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, calls / elapsed)
+
+    return best
+
+
+def _calls(function, n_calls=10):
+    def run():
+        for _ in range(n_calls):
+            function()
+        return n_calls
+
+    return run
+
+
+def _step_run(logic, n_steps=1000):
+    actions = np.random.randint(logic.n_actions, size=n_steps).tolist()
+
+    def run():
+        for action in actions:
+            _, _, done, _ = logic.step(action)
+            if done:
+                logic.reset()
+        return n_steps
+
+    return run
+
+
+def _q_learning_run(function, logic, max_steps=1000):
+    q_table = np.zeros([logic.n_states, logic.n_actions])
+
+    def run():
+        _, _, _, _, info = function(logic, logic.reset(), max_steps, q_table, LR, GAMMA, EPS)
+        return len(info['actions'])
+
+    return run
+
+
+def _greedy_return(logic, q_table, max_steps):
+    state = logic.reset()
+    total = 0.
+    for _ in range(max_steps):
+        state, reward, done, _ = logic.step(int(np.argmax(q_table[state])))
+        total += reward
+        if done:
+            break
+    return total
+
+
+def episodes_to_threshold(logic, max_steps=1000, max_episodes=MAX_EPISODES):
+    """Returns the number of Q-learning episodes until the greedy policy earns the optimal return.
+
+    The optimal return is the return of the optimal policy found by value iteration.
+    Returns None if it isn't reached in `max_episodes` episodes.
+    """
+
+    optimal = _greedy_return(logic, solve(logic, gamma=GAMMA).Q, max_steps)
+    q_table = np.zeros([logic.n_states, logic.n_actions])
+    for episode in range(1, max_episodes + 1):
+        q_learning_fast(logic, logic.reset(), max_steps, q_table, LR, GAMMA, EPS)
+        if _greedy_return(logic, q_table, max_steps) >= optimal - config.MAX_FLOAT_DIFF:
+            return episode
+
+    return None
+
+
+def run_case(mode, height, width, min_time, repeats, seed=0):
+    """Runs all benchmarks for one board.
+
+    Returns:
+        dict: metric name -> value
+    """
+
+    random.seed(seed)
+    np.random.seed(seed)
+    logic = GameLogic(game_params(mode, height, width))
+
+    results = {
+        'step': rate(_step_run(logic), min_time, repeats),
+        'reset': rate(_calls(logic.reset), min_time, repeats),
+        'full_reset': rate(_calls(logic.full_reset), min_time, repeats),
+    }
+
+    # the board is fixed after this point
+    random.seed(seed)
+    np.random.seed(seed)
+    logic = GameLogic(game_params(mode, height, width))
+    results['q_learning'] = rate(_q_learning_run(q_learning, logic), min_time, repeats)
+    results['q_learning_fast'] = rate(_q_learning_run(q_learning_fast, logic), min_time, repeats)
+
+    if mode == 'automatic' and height * width <= 16 * 16:
+        random.seed(seed)
+        np.random.seed(seed)
+        results['episodes_to_threshold'] = episodes_to_threshold(logic)
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Compares results with the baseline.
+
+    Returns:
+        list: Tuples (case, metric, value, baseline value) of the regressions.
+    """
+
+    regressions = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            base = baseline.get(case, {}).get(metric)
+            if base is None or value is None:
+                continue
+
+            if metric in LOWER_IS_BETTER:
+                worse = value > base * (1 + threshold)
+            else:
+                worse = value < base * (1 - threshold)
+            if worse:
+                regressions.append((case, metric, value, base))
+
+    return regressions
+
+
+def _format(value):
+    if value is None:
+        return 'not reached'
+    if isinstance(value, int):
+        return str(value)
+    return f"{value:,.0f}/s"
+
+
+def main(argv=None):
+    """Runs the suite, saves and compares the results."""
+
+    parser = argparse.ArgumentParser(description='Benchmarks of the game logic and Q-learning')
+    parser.add_argument('--quick', action='store_true', help='only small boards and short repeats')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--min-time', type=float, help='minimal time of a repeat in seconds')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help='JSON file to save the results')
+    parser.add_argument('--baseline', help='JSON file with the baseline results')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative slowdown')
+    parser.add_argument('--save-baseline', help='JSON file to save the results as a new baseline')
+    args = parser.parse_args(argv)
+
+    sizes = QUICK_SIZES if args.quick else SIZES
+    min_time = args.min_time if args.min_time is not None else (0.05 if args.quick else 0.3)
+
+    results = {}
+    for mode in args.modes:
+        for height, width in sizes:
+            case = f"{mode}/{height}x{width}"
+            results[case] = run_case(mode, height, width, min_time, args.repeats)
+            print(case)
+            for metric, value in results[case].items():
+                print(f"    {metric:24} {_format(value):>16}")
+
+    report = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+        },
+        'results': results
+    }
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as json_file:
+                json.dump(report, json_file, indent=2)
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as json_file:
+        baseline = json.load(json_file)['results']
+
+    regressions = compare(results, baseline, args.threshold)
+    for case, metric, value, base in regressions:
+        print(f"REGRESSION {case} {metric}: {_format(value)} vs baseline {_format(base)}")
+    if not regressions:
+        print(f"no regressions against {args.baseline} with threshold {args.threshold:.0%}")
+
+    return int(bool(regressions))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Config module
+
+Pure Python parameters of the game: animation times and the parameters of the logic
+and of the learning algorithms. They are re-exported by `settings`, but unlike it this
+module doesn't import Qt, so it can be used by the logic and by the headless training.
+"""
+
+# ANIMATION TIME ---------------------------------------------------------------
+
+MOVE_TIME = 300
+ROTATION_TIME = 600
+MODE_SWITCH_TIME = 400
+Q_LEARNING_PLAY_SPEED = 500
+REPLAY_FRAME_TIME = 200
+TRAINER_DISPLAY_TIME = 100
+# turbo play: frame time and the part of it spent on learning, the rest is left for drawing
+TURBO_FRAME_TIME = 50
+TURBO_LEARNING_TIME = 30
+
+VALUE_UPDATE_TIME = 15
+VALUE_UPDATE_MAX_STEPS = 20
+
+# size of the cache of rendered pictures in KB
+PIXMAP_CACHE_LIMIT = 20480
+
+# refresh time of the frame time overlay of the game screen
+FRAME_STATS_TIME = 500
+
+# ROTATION CONFIGURATION -------------------------------------------------------
+
+ROTATION_ANGLE = 55
+SCALE_WHEN_ROTATED = 0.75
+BASE_CELL_OPACITY = 0.65
+
+# GAME LOGIC PARAMETERS --------------------------------------------------------
+
+GAME_HEIGHT = 4
+GAME_WIDTH = 5
+
+# IAmRLAgent mode
+IAMRLAGENT_LAVA_RANDOM = 5
+HIPPO_MOVE_PROB = 0.3
+WATERMELON_MOVE_PROB = 0.1
+TICK_PENALTY = -0.1
+
+# AutomaticRL mode
+AUTOMATIC_LAVA_RANDOM = 5
+GREEN_RANDOM = 2
+
+LAVA_REWARD = -10.0
+GREEN_REWARD = 10.0
+MIN_REWARD = -10
+MAX_REWARD = +10
+# number of colours of cells between MIN_REWARD and MAX_REWARD, it is odd so the middle colour is exact
+COLOR_RAMP_SIZE = 257
+
+MAX_FLOAT_DIFF = 1e-6
+
+# Turbo play in AutomaticRL mode: limits of steps or episodes per frame
+TURBO_MAX_BATCH = 100000
+TURBO_MAX_EPISODE_STEPS = 1000
+
+# Replay mode: transitions replayed per frame
+REPLAY_SPEEDS = (1, 10, 100, 1000, 10000)
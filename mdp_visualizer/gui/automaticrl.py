@@ -5,15 +5,23 @@ Automatic RL module
 This module contains widget for the automatic RL mode.
 """
 
+from functools import partial
+from time import perf_counter
+
 from PyQt5.QtCore import pyqtSignal, QTimer, Qt, QSize
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGridLayout, QSizePolicy
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGridLayout, QSizePolicy, QPushButton, \
+    QComboBox
 from PyQt5.QtGui import QPixmap, QFont
+import numpy as np
 
 from .. import settings
-from ..utils import value_update
+from ..utils import adapt_batch_size
 
 from ..scene.gamescreen import GameScreen
+from ..scene.tweenClock import tween_clock
 from ..logic.q_learning import QLearning
+from ..logic.trainer import make_trainer
+from ..logic import planning
 from ..logic.gameLogic import GameLogic, GameParams
 from ..logic.actions_objects_list import Modes
 
@@ -21,6 +29,9 @@ from .button import Button
 
 __all__ = ('AutomaticRL',)
 
+# play speeds, indices of the speed box
+NORMAL, TURBO_STEPS, TURBO_EPISODES = range(3)
+
 
 class QLabelsVisualization(QWidget):
     """
@@ -64,9 +75,8 @@ class QLabelsVisualization(QWidget):
             _arrow.setScaledContents(False)
 
         self._displayed_coords = None
-        self._timer = QTimer()
-        self._timer.setInterval(settings.VALUE_UPDATE_TIME)
-        self._timer.timeout.connect(self._update)
+        # Q-values are read from the shared table of a training process while it is set
+        self._table = None
 
         self.setLayout(self._layout)
         self.setFixedSize(settings.Q_VISUALIZATION_NAILS)
@@ -76,26 +86,22 @@ class QLabelsVisualization(QWidget):
         cell = self.sender()
         self._displayed_coords = cell.x, cell.y
 
-        qvalues = self._q_learning.get_q_values(self._displayed_coords)
+        qvalues = self._get_q_values()
         self._qvalues = [qvalues[2], qvalues[0], qvalues[3], qvalues[1]]
 
         for i in range(4):
-            self._q_labels[i].setText(f"{self._qvalues[i]:.2f}")
+            tween_clock().stop((self, i))
+            self._show_q_value(i, self._qvalues[i])
 
     def cell_left(self):
         """Removes text from arrows if cursor hovers over nothing"""
         for i in range(4):
+            tween_clock().stop((self, i))
             self._q_labels[i].setText("")
 
-    def _update(self):
-        all_done = True
-        for i in range(4):
-            self._qvalues[i], done = value_update(self._qvalues[i], self._target_qvalues[i], 0.01)
-            all_done = all_done and done
-            self._q_labels[i].setText(f"{self._qvalues[i]:.2f}")
-
-        if all_done:
-            self._timer.stop()
+    def _show_q_value(self, i, value):
+        self._qvalues[i] = value
+        self._q_labels[i].setText(f"{value:.2f}")
 
     def values_updates(self, x: int, y: int):
         """
@@ -106,10 +112,38 @@ class QLabelsVisualization(QWidget):
             y - int
         """
         if (x, y) == self._displayed_coords:
-            qvalues = self._q_learning.get_q_values(self._displayed_coords)
-            self._target_qvalues = [qvalues[2], qvalues[0], qvalues[3], qvalues[1]]
+            qvalues = self._get_q_values()
+            target_qvalues = [qvalues[2], qvalues[0], qvalues[3], qvalues[1]]
+
+            for i in range(4):
+                tween_clock().start((self, i), self._qvalues[i], target_qvalues[i],
+                                    partial(self._show_q_value, i), min_step=0.01)
+
+    def _get_q_values(self):
+        if self._table is None:
+            return self._q_learning.get_q_values(self._displayed_coords)
+
+        x, y = self._displayed_coords
+        return self._table.q_values(self._q_learning.env.start_params.game_width * y + x)
+
+    def set_table(self, table):
+        """
+        Makes widget read Q-values from the trainer instead of Q-learning object
+
+        Args:
+            table - trainer or SharedQTable, anything with `q_values(state)`, or None to read Q-learning object again
+        """
+        self._table = table
+        self.refresh()
+
+    def refresh(self):
+        """Notifies widget that Q-values of all cells could have changed"""
+        if self._displayed_coords is not None:
+            self.values_updates(*self._displayed_coords)
 
-            self._timer.start()
+
+def _max_values(q_table):
+    return q_table.max(axis=1)
 
 
 # noinspection PyArgumentEqualDefault,PyCompatibility
@@ -152,6 +186,21 @@ class AutomaticRL(QWidget):
         self._buttons.setFixedWidth(settings.BUTTONS_NAILS_WIDTH)
         self._command_layout.addWidget(self._buttons, 0, Qt.AlignHCenter)
 
+        # play speed
+        self._speed_box = QComboBox()
+        self._speed_box.addItems([settings.PLAY_SPEED_NORMAL, settings.PLAY_SPEED_TURBO_STEPS,
+                                  settings.PLAY_SPEED_TURBO_EPISODES])
+        self._command_layout.addWidget(self._speed_box)
+
+        # background training
+        self._train_button = QPushButton(settings.BACKGROUND_TRAINING_START)
+        self._train_button.setFont(QFont("Pacifico", 14, QFont.Normal))
+        self._command_layout.addWidget(self._train_button, 0, Qt.AlignHCenter)
+
+        self._status_label = QLabel()
+        self._status_label.setAlignment(Qt.AlignCenter)
+        self._command_layout.addWidget(self._status_label)
+
         self.setLayout(self._command_layout)
 
     def __init__(self, game_screen: GameScreen):
@@ -179,23 +228,46 @@ class AutomaticRL(QWidget):
 
         self._playing = False
         self._timer = QTimer()
-        self._timer.timeout.connect(self._next_step)
+        self._timer.timeout.connect(self._tick)
+
+        # turbo play runs a batch of steps or episodes per frame, the batch is adapted to the frame time
+        self._batch_size = 1
+        self._episode = 0
+
+        # the trainer runs in its own process or thread, its snapshots are shown at the display rate
+        self._trainer = None
+        self._trainer_version = None
+        self._trainer_started = None
+        self._returns = []
+        self._trainer_timer = QTimer()
+        self._trainer_timer.timeout.connect(self._show_training)
+
+        self._active = False
+        self._optimal_values_shown = False
+        # values shown on the cells, only changed values are sent to the cells
+        self._shown_values = None
 
         self._init_ui()
 
         # connecting player buttons
         self._play_button.clicked.connect(self._play)
         self._next_step_button.clicked.connect(self._next_step_click)
+        self._train_button.clicked.connect(self._toggle_training)
+        self._speed_box.currentIndexChanged.connect(self._speed_changed)
 
         self.made_step_signal.connect(game_screen.update_screen)
+        game_screen.key_pressed.connect(self._key_pressed)
 
     def enter_mode(self):
         """Replaces game screen logic with RL environment and resets cells."""
+        self._active = True
         self._game_screen.change_logic(self._logic)
         self.init_cells()
 
     def exit_mode(self):
         """Stops playing. Used when current mode is being changed."""
+        self._active = False
+        self._stop_training()
         if self._playing:
             self._playing = False
             self._timer.stop()
@@ -219,51 +291,190 @@ class AutomaticRL(QWidget):
             cell.leave_signal.connect(self._qlabels.cell_left)
 
         # initialize values
-        for i in range(self._logic.game_size[0]):
-            for j in range(self._logic.game_size[1]):
-                self._game_screen.set_cell_value(i, j, 0.)
+        self._optimal_values_shown = False
+        self._set_cells_values(np.zeros(self._logic.n_states))
+
+    def _set_cells_values(self, values):
+        """
+        Sets values of states to the cells. Terminal cells show their rewards.
+
+        Args:
+            values - np.array of shape (n_states,)
+        """
+        self._game_screen.set_cells_values(values)
+        self._shown_values = None
+
+    def _toggle_optimal_values(self):
+        """Switches cells between optimal values found by value iteration and values learned by Q-learning."""
+        self._optimal_values_shown = not self._optimal_values_shown
+
+        if self._optimal_values_shown:
+            values = planning.solve(self._logic, method='value_iteration').V
+        elif self._trainer is not None:
+            values = self._trainer.latest(_max_values).q_table
+        else:
+            values = self._q_learning.get_q_values().max(axis=1)
 
-        for pos in self._logic.terminal_cells:
-            reward = self._logic.game_board.cell_reward(pos)
-            self._game_screen.set_cell_value(pos[0], pos[1], reward)
+        self._set_cells_values(values)
+
+    def _key_pressed(self, key):
+        if self._active and key == settings.OPTIMAL_VALUES_KEY:
+            self.user_interacted.emit()
+            self._toggle_optimal_values()
 
     def _next_step_click(self):
         self.user_interacted.emit()
         self._stop_playing()
+        self._stop_training()
         self._next_step()
 
+    def _tick(self):
+        if self._speed_box.currentIndex() == NORMAL:
+            self._next_step()
+        else:
+            self._next_frame()
+
     def _next_step(self):
+        # the shown values are updated cell by cell now
+        self._shown_values = None
+
         if self._logic.done:
             self._q_learning.reset()
         else:
             old_x, old_y = self._logic.scrat_position
             # pylint: disable=W0612
             reward, done, info = self._q_learning.step()
+            self._episode += done
             new_value = max(self._q_learning.get_q_values((old_x, old_y)))
 
             # updating value on the cell in game field
-            self._game_screen.set_cell_value(old_x, old_y, new_value)
+            if not self._optimal_values_shown:
+                self._game_screen.set_cell_value(old_x, old_y, new_value)
 
             # updating q-visualization
             self._qlabels.values_updates(old_x, old_y)
 
         self.made_step_signal.emit()
 
+    def _next_frame(self):
+        """Makes a batch of steps or episodes and shows only the final state."""
+        start = perf_counter()
+        if self._speed_box.currentIndex() == TURBO_EPISODES:
+            _, finished = self._q_learning.run_episodes(self._batch_size, settings.TURBO_MAX_EPISODE_STEPS)
+            status = settings.TURBO_EPISODES_STATUS
+        else:
+            _, finished = self._q_learning.run_steps(self._batch_size)
+            status = settings.TURBO_STEPS_STATUS
+        elapsed = (perf_counter() - start) * 1000
+
+        self._episode += finished
+        self._status_label.setText(status.format(episode=self._episode, speed=self._batch_size))
+        self._batch_size = adapt_batch_size(self._batch_size, elapsed, settings.TURBO_LEARNING_TIME,
+                                            settings.TURBO_MAX_BATCH)
+
+        # all values changed by the batch are sent to the cells at once
+        if not self._optimal_values_shown:
+            values = self._q_learning.get_q_values().max(axis=1)
+            self._game_screen.set_cells_values(values, self._shown_values)
+            self._shown_values = values
+        self._qlabels.refresh()
+
+        self.made_step_signal.emit()
+
+    def _speed_changed(self):
+        self.user_interacted.emit()
+        self._batch_size = 1
+        if self._playing:
+            self._timer.start(self._frame_time())
+
+    def _frame_time(self):
+        if self._speed_box.currentIndex() == NORMAL:
+            return settings.Q_LEARNING_PLAY_SPEED
+        return settings.TURBO_FRAME_TIME
+
     def _stop_playing(self):
         if self._playing:
             self._playing = False
             self._timer.stop()
             self._play_button.updatePic(settings.PLAY_BUTTON_IMAGE)
 
+    @property
+    def training(self):
+        """Q-learning is running in the background."""
+        return self._trainer is not None
+
+    def _toggle_training(self):
+        self.user_interacted.emit()
+
+        if self._trainer is not None:
+            self._stop_training()
+            return
+
+        self._stop_playing()
+        self._trainer = make_trainer(self._logic.start_params, self._q_learning.get_q_values())
+        self._trainer_version = None
+        self._shown_values = None
+        self._trainer_started = perf_counter()
+        self._returns = []
+        self._trainer.start()
+        self._qlabels.set_table(self._trainer)
+
+        self._trainer_timer.start(settings.TRAINER_DISPLAY_TIME)
+        self._train_button.setText(settings.BACKGROUND_TRAINING_STOP)
+
+    def _show_training(self):
+        """Shows the latest snapshot of the trainer if it is new."""
+        self._returns = (self._returns + [event.reward for event in self._trainer.events()])[-100:]
+        if self._trainer.version == self._trainer_version:
+            return
+
+        # values of the cells are computed on the shared table, it isn't copied
+        snapshot = self._trainer.latest(_max_values)
+        self._trainer_version = snapshot.version
+        if not self._optimal_values_shown:
+            values = snapshot.q_table
+            self._game_screen.set_cells_values(values, self._shown_values)
+            self._shown_values = values
+        self._qlabels.refresh()
+
+        self._logic.set_state(snapshot.state)
+        self.made_step_signal.emit()
+
+        speed = snapshot.steps / max(perf_counter() - self._trainer_started, 1e-9)
+        mean_return = np.mean(self._returns) if self._returns else 0.0
+        self._status_label.setText(settings.BACKGROUND_TRAINING_STATUS.format(
+            episode=snapshot.episode, speed=speed, mean_return=mean_return))
+
+    def _stop_training(self):
+        """Stops the trainer and takes its Q-values."""
+        if self._trainer is None:
+            return
+
+        self._trainer_timer.stop()
+        self._q_learning.Q = self._trainer.stop()
+        self._qlabels.set_table(None)
+        self._trainer.close()
+        self._trainer = None
+        self._train_button.setText(settings.BACKGROUND_TRAINING_START)
+
+        self._q_learning.reset()
+        if not self._optimal_values_shown:
+            self._set_cells_values(self._q_learning.get_q_values().max(axis=1))
+        self.made_step_signal.emit()
+
     def reset(self):
         """Reset game state and send signal that state changed"""
         self._stop_playing()
+        self._stop_training()
         self._q_learning.reset()
         self.made_step_signal.emit()
 
     def full_reset(self):
         """Reinitialize logic randomly"""
         self._stop_playing()
+        self._stop_training()
+        self._status_label.setText("")
+        self._episode = 0
         self._logic.full_reset()
         self._q_learning.reset_q()
         self.init_cells()
@@ -278,6 +489,8 @@ class AutomaticRL(QWidget):
             self._play_button.updatePic(settings.PLAY_BUTTON_IMAGE)
             return
 
+        self._stop_training()
         self._playing = True
-        self._timer.start(settings.Q_LEARNING_PLAY_SPEED)
+        self._batch_size = 1
+        self._timer.start(self._frame_time())
         self._play_button.updatePic(settings.STOP_BUTTON_IMAGE)
@@ -7,12 +7,12 @@ This module contains IAmRLAgent mode widget.
 
 from random import shuffle
 
-from PyQt5.QtCore import pyqtSignal, QTimer, Qt
+from PyQt5.QtCore import pyqtSignal, Qt
 from PyQt5.QtWidgets import QWidget, QLabel, QGridLayout, QVBoxLayout, QSizePolicy
 from PyQt5.QtGui import QPixmap, QFont
 
 from .. import settings
-from ..utils import value_update
+from ..scene.tweenClock import tween_clock
 from ..logic.gameLogic import GameLogic, GameParams
 from ..logic.actions_objects_list import Modes
 from .button import Button
@@ -44,14 +44,12 @@ class RewardLabel(QLabel):
         self.reward.setFont(settings.REWARD_FONT)
 
         self.value = 0
-        self._timer = QTimer()
-        self._timer.timeout.connect(self._update_value)
 
     def resizeEvent(self, e):
         """Internal Qt function to process resizing of widget"""
         super().resizeEvent(e)
-        self.nut.setGeometry(self.height() / 4, self.height() / 4, self.height() / 2, self.height() / 2)
-        self.reward.setGeometry(self.height() / 2, 0, self.width() - self.height() / 2, self.height())
+        self.nut.setGeometry(self.height() // 4, self.height() // 4, self.height() // 2, self.height() // 2)
+        self.reward.setGeometry(self.height() // 2, 0, self.width() - self.height() // 2, self.height())
 
     def set_value(self, new_value: float):
         """Sets a new target value.
@@ -60,14 +58,10 @@ class RewardLabel(QLabel):
             new_value - new target value.
         """
 
-        self._target_value = new_value
-        self._timer.start(settings.VALUE_UPDATE_TIME)
-
-    def _update_value(self):
-        self.value, stop_timer = value_update(self.value, self._target_value)
-        if stop_timer:
-            self._timer.stop()
+        tween_clock().start(self, self.value, new_value, self._show_value)
 
+    def _show_value(self, value):
+        self.value = value
         self.reward.setText(f"{self.value:.1f}")
 
 
@@ -8,6 +8,7 @@ from .. import settings
 from ..utils import animate
 from .automaticrl import AutomaticRL
 from .iamrlagent import IAmRLAgent
+from .replay import ReplayMode
 
 from ..scene.gamescreen import GameScreen
 from .button import Button
@@ -38,7 +39,7 @@ class ModeSwitcher(QWidget):
           e: additional event information
         """
         for id, content in enumerate(self._contents):
-            content.setGeometry(0 if id == self._id else -1.2 * self.width(), 0, self.width(), self.height())
+            content.setGeometry(0 if id == self._id else int(-1.2 * self.width()), 0, self.width(), self.height())
 
     def sizeHint(self):
         """
@@ -77,7 +78,7 @@ class ModeSwitcher(QWidget):
             self._id = id
 
             self._contents[self._id].setVisible(True)
-            self._contents[self._id].setGeometry(1.2 * self.width(), 0, self.width(), self.height())
+            self._contents[self._id].setGeometry(int(1.2 * self.width()), 0, self.width(), self.height())
             self.appear_anim = animate(self._contents[self._id], "geometry", settings.MODE_SWITCH_TIME,
                                        QRectF(0, 0, self.width(), self.height()))
 
@@ -108,8 +109,8 @@ class MainWindow(QMainWindow):
         # mode switcher
         self._combo_box = QComboBox()
         self._combo_box.setFont(QFont("Pacifico", 14, QFont.Normal))
-        self._combo_box.addItems([settings.I_AM_RL_AGENT, settings.AUTOMATIC_RL])
-        for i in range(2):
+        self._combo_box.addItems([settings.I_AM_RL_AGENT, settings.AUTOMATIC_RL, settings.REPLAY])
+        for i in range(3):
             self._combo_box.setItemData(i, Qt.AlignCenter)
 
         # Reset layout
@@ -127,10 +128,11 @@ class MainWindow(QMainWindow):
         self._game_screen = GameScreen()
         self._iAmRLAgent = IAmRLAgent(self._game_screen)
         self._automaticRL = AutomaticRL(self._game_screen)
+        self._replay = ReplayMode(self._game_screen)
         self._iAmRLAgent.enter_mode()
 
         # mode widget
-        self._mode_widget = ModeSwitcher([self._iAmRLAgent, self._automaticRL])
+        self._mode_widget = ModeSwitcher([self._iAmRLAgent, self._automaticRL, self._replay])
 
         # left widget
         self._left_layout = QVBoxLayout()
@@ -164,6 +166,7 @@ class MainWindow(QMainWindow):
 
         self._iAmRLAgent.user_interacted.connect(self._hide_info)
         self._automaticRL.user_interacted.connect(self._hide_info)
+        self._replay.user_interacted.connect(self._hide_info)
 
     def resizeEvent(self, event):
         """Internal Qt function to process resizing of widget"""
@@ -0,0 +1,277 @@
+"""
+Replay module
+=============
+
+This module contains widget for the replay mode which plays transitions recorded by headless training
+(see `logic.trajectory`) on the game screen.
+"""
+
+from PyQt5.QtCore import pyqtSignal, QTimer, Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider, QComboBox, QPushButton, \
+    QFileDialog, QSizePolicy
+from PyQt5.QtGui import QFont
+import numpy as np
+
+from .. import settings
+
+from ..scene.gamescreen import GameScreen
+from ..logic.gameLogic import GameLogic, GameParams
+from ..logic.actions_objects_list import Modes
+from ..logic.replay import Replay
+from ..logic.trajectory import Trajectories
+
+from .button import Button
+
+__all__ = ('ReplayMode',)
+
+
+# noinspection PyArgumentEqualDefault,PyCompatibility
+# pylint: disable=R0902
+class ReplayMode(QWidget):
+    """
+    This class represents a widget for the replay mode.
+    It consists of open, play/step buttons, a slider to seek and a choice of
+    steps per frame. Positions are set from the recorded states by
+    `logic.replay.Replay`, so seeking to any step is instant.
+    """
+
+    made_step_signal = pyqtSignal()
+    user_interacted = pyqtSignal()
+
+    def _init_ui(self):
+        self._command_layout = QVBoxLayout()
+
+        # Text label
+        self._description_label = QLabel()
+        self._description_label.setFont(QFont("Pacifico", 14, QFont.Normal))
+        self._description_label.setAlignment(Qt.AlignCenter)
+        self._description_label.setText(settings.REPLAY_DESCRIPTION)
+        self._description_label.setSizePolicy(QSizePolicy(QSizePolicy.Preferred, QSizePolicy.Maximum))
+        self._description_label.setFixedSize(settings.AUTO_RL_DESCRIPTION_NAILS)
+        self._command_layout.addWidget(self._description_label, 0, Qt.AlignHCenter)
+
+        self._open_button = QPushButton(settings.REPLAY_OPEN)
+        self._open_button.setFont(QFont("Pacifico", 14, QFont.Normal))
+        self._command_layout.addWidget(self._open_button, 0, Qt.AlignHCenter)
+
+        # position
+        self._status_label = QLabel()
+        self._status_label.setAlignment(Qt.AlignCenter)
+        self._command_layout.addWidget(self._status_label)
+
+        self._slider = QSlider(Qt.Horizontal)
+        self._slider.setEnabled(False)
+        self._command_layout.addWidget(self._slider)
+
+        # steps per frame
+        self._speed_box = QComboBox()
+        self._speed_box.addItems([settings.REPLAY_SPEED.format(speed=speed) for speed in settings.REPLAY_SPEEDS])
+        self._command_layout.addWidget(self._speed_box)
+
+        # player buttons
+        self._buttons = QWidget()
+        self._buttons_layout = QHBoxLayout()
+        self._play_button = Button(settings.PLAY_BUTTON_IMAGE)
+        self._next_step_button = Button(settings.STEP_BUTTON_IMAGE)
+        self._buttons_layout.addWidget(self._play_button)
+        self._buttons_layout.addWidget(self._next_step_button)
+        self._buttons.setLayout(self._buttons_layout)
+        self._buttons.setFixedWidth(settings.BUTTONS_NAILS_WIDTH)
+        self._command_layout.addWidget(self._buttons, 0, Qt.AlignHCenter)
+
+        self.setLayout(self._command_layout)
+
+    def __init__(self, game_screen: GameScreen):
+        """
+        Constructs a ReplayMode widget.
+
+        Until a recorded run is opened, the board of AutomaticRL mode is shown.
+
+        Args:
+            game_screen - GameScreen instance.
+        """
+        super().__init__()
+
+        self._game_screen = game_screen
+        self._params = GameParams(Modes.AUTOMATICRL,
+                                  game_height=settings.GAME_HEIGHT, game_width=settings.GAME_WIDTH,
+                                  lava_random=settings.AUTOMATIC_LAVA_RANDOM, lava_reward=settings.LAVA_REWARD,
+                                  lava_is_terminal=True,
+                                  green_random=settings.GREEN_RANDOM, green_reward=settings.GREEN_REWARD,
+                                  green_is_terminal=True)
+        self._logic = GameLogic(self._params)
+        self._replay = None
+
+        # values shown on the cells, only changed values are sent to the cells
+        self._shown_values = None
+
+        self._playing = False
+        self._timer = QTimer()
+        self._timer.timeout.connect(self._next_frame)
+
+        self._active = False
+
+        self._init_ui()
+
+        self._open_button.clicked.connect(self._open)
+        self._slider.valueChanged.connect(self._slider_moved)
+        self._play_button.clicked.connect(self._play)
+        self._next_step_button.clicked.connect(self._next_step_click)
+
+        self.made_step_signal.connect(game_screen.update_screen)
+
+    def enter_mode(self):
+        """Replaces game screen logic with the replayed board and resets cells."""
+        self._active = True
+        self._game_screen.change_logic(self._logic)
+        self._shown_values = None
+        self._show_values()
+
+    def exit_mode(self):
+        """Stops playing. Used when current mode is being changed."""
+        self._active = False
+        self._stop_playing()
+
+    def open(self, directory):
+        """
+        Loads transitions recorded into the directory and shows the first of them.
+
+        Args:
+            directory - str, directory of `logic.trajectory.TrajectoryRecorder`.
+
+        Returns:
+            bool: the run is loaded or not.
+        """
+        self._stop_playing()
+
+        trajectories = Trajectories(directory)
+        if trajectories.params is None:
+            self._description_label.setText(settings.REPLAY_NO_PARAMS)
+            return False
+
+        self._replay = Replay(trajectories)
+        self._logic = self._replay.logic
+        self._shown_values = None
+        self._description_label.setText(settings.REPLAY_DESCRIPTION)
+
+        self._slider.blockSignals(True)
+        self._slider.setRange(0, self._replay.n_steps)
+        self._slider.setValue(0)
+        self._slider.blockSignals(False)
+        self._slider.setEnabled(True)
+
+        if self._active:
+            self.enter_mode()
+        self._update_status()
+        return True
+
+    def _open(self):
+        self.user_interacted.emit()
+        directory = QFileDialog.getExistingDirectory(self, settings.REPLAY_OPEN)
+        if directory:
+            self.open(directory)
+
+    @property
+    def replay(self):
+        """Replay object of the opened run or None."""
+        return self._replay
+
+    @property
+    def steps_per_frame(self):
+        """Number of transitions replayed per frame."""
+        return settings.REPLAY_SPEEDS[self._speed_box.currentIndex()]
+
+    def seek(self, position):
+        """
+        Shows the state after `position` recorded transitions.
+
+        Args:
+            position - int, number of replayed transitions.
+        """
+        if self._replay is None:
+            return
+
+        self._replay.seek(position)
+        self._show_frame()
+
+    def _show_frame(self):
+        self._slider.blockSignals(True)
+        self._slider.setValue(self._replay.position)
+        self._slider.blockSignals(False)
+
+        self._show_values()
+        self._update_status()
+        self.made_step_signal.emit()
+
+    def _show_values(self):
+        """Sends values of the current snapshot to the cells whose values changed."""
+        # cells show values only in AutomaticRL mode
+        if self._logic.game_mode != Modes.AUTOMATICRL:
+            return
+
+        width, height = self._logic.game_size
+        values = None if self._replay is None else self._replay.cell_values()
+        if values is None:
+            values = np.zeros(width * height)
+
+        self._game_screen.set_cells_values(values, self._shown_values)
+        self._shown_values = values
+
+    def _update_status(self):
+        if self._replay is None:
+            self._status_label.setText("")
+            return
+
+        self._status_label.setText(settings.REPLAY_STATUS.format(step=self._replay.position,
+                                                                  n_steps=self._replay.n_steps,
+                                                                  episode=self._replay.episode))
+
+    def _slider_moved(self, position):
+        self.user_interacted.emit()
+        self.seek(position)
+
+    def _next_step_click(self):
+        self.user_interacted.emit()
+        self._stop_playing()
+        self._next_frame()
+
+    def _next_frame(self):
+        if self._replay is None:
+            return
+
+        self._replay.advance(self.steps_per_frame)
+        self._show_frame()
+
+        if self._replay.finished:
+            self._stop_playing()
+
+    def _stop_playing(self):
+        if self._playing:
+            self._playing = False
+            self._timer.stop()
+            self._play_button.updatePic(settings.PLAY_BUTTON_IMAGE)
+
+    def reset(self):
+        """Rewinds the replay to the start"""
+        self._stop_playing()
+        self.seek(0)
+
+    def full_reset(self):
+        """Rewinds the replay to the start"""
+        self.reset()
+
+    def _play(self):
+        self.user_interacted.emit()
+
+        if self._playing:
+            self._stop_playing()
+            return
+
+        if self._replay is None:
+            return
+        if self._replay.finished:
+            self._replay.seek(0)
+
+        self._playing = True
+        self._timer.start(settings.REPLAY_FRAME_TIME)
+        self._play_button.updatePic(settings.STOP_BUTTON_IMAGE)
@@ -5,7 +5,19 @@ Logic submodule
 This submodule contains all of the logic
 """
 
+from . import gameBoard
 from . import gameLogic
+from . import batchedGameLogic
+from . import mdp
+from . import planning
+from . import stateEncoder
 from . import q_learning
+from . import replay
+from . import rng
+from . import shared_q_table
+from . import sweep
+from . import trainer
+from . import trajectory
 
-__all__ = ('gameLogic', 'q_learning')
+__all__ = ('gameBoard', 'gameLogic', 'batchedGameLogic', 'mdp', 'planning', 'stateEncoder', 'q_learning', 'replay',
+           'rng', 'shared_q_table', 'sweep', 'trainer', 'trajectory')
@@ -0,0 +1,359 @@
+"""
+Batched Game Logic module
+=========================
+
+This module contains a vectorized version of the game logic which steps many independent boards at once.
+Every board is generated by its own `GameLogic` object, after that the whole batch is stored in NumPy arrays
+and all boards are advanced with one call of `BatchedGameLogic.step`.
+
+Typical usage example:
+
+    params = GameParams(game_mode, hippo_random=True, hippo_move_prob=0.3)
+    logic = BatchedGameLogic(params, n_envs=1000)
+    states = logic.reset()
+    states, rewards, dones, infos = logic.step(actions)
+"""
+
+from copy import deepcopy
+
+import numpy as np
+
+from .actions_objects_list import Actions
+from .gameBoard import TERMINAL_LAYER
+from .gameLogic import GameLogic, GameParams
+from .rng import spawn_rngs
+
+__all__ = ('BatchedGameLogic',)
+
+# directions in the order of bits of GameBoard.legal_moves and of actions 0-3
+_DIRECTIONS = np.array([Actions.LEFT.value, Actions.UP.value, Actions.RIGHT.value, Actions.DOWN.value])
+
+# number of legal directions for every legal moves mask and the index of the k-th of them
+_MASKS = np.arange(1 << len(_DIRECTIONS))
+_N_LEGAL = np.array([bin(mask).count('1') for mask in _MASKS])
+_NTH_DIRECTION = np.array([[bits[k] if k < len(bits) else 0 for k in range(len(_DIRECTIONS))]
+                           for bits in ([bit for bit in range(len(_DIRECTIONS)) if mask >> bit & 1]
+                                        for mask in _MASKS)])
+
+
+# pylint: disable=R0902,R0904
+class BatchedGameLogic:
+    """Represents a batch of independent game boards which are stepped simultaneously.
+
+    All boards share the same `GameParams`, but random values (lava, green and terminal cells,
+    objects start positions) are sampled for each board separately. Boards which are finished
+    during a step are reset automatically to their start state.
+    """
+
+    def __init__(self, params: GameParams, n_envs: int, rng=None):
+        """Constructs BatchedGameLogic object.
+
+        Args:
+            params (GameParams): An instance of class GameParams with game settings.
+            n_envs (int): Number of boards in the batch.
+            rng (np.random.Generator): Random generator. By default it is created from `params.seed`.
+                Every board gets its own child stream spawned from it, see `rng.spawn_rngs`.
+        """
+
+        rngs = spawn_rngs(params.seed if rng is None else rng, n_envs + 1)
+
+        self._start_params = params
+        self._n_envs = n_envs
+        self._rng = rngs[0]
+        self._logics = [GameLogic(deepcopy(params), rng=board_rng) for board_rng in rngs[1:]]
+
+        self._rows = np.arange(n_envs)
+        self._size = np.array(self.game_size)
+        self._n_actions = self._logics[0].n_actions
+        self._has_hippo = self._logics[0].hippo is not None
+        self._has_watermelon = self._logics[0].watermelon is not None
+        self._state_encoder = self._logics[0].state_encoder
+
+        # boards
+        self._rewards = None
+        self._terminal = None
+        self._legal_moves = None
+
+        # start positions
+        self._scrat_start = None
+        self._hippo_start = None
+        self._watermelon_start = None
+
+        # current state
+        self._scrat = None
+        self._hippo = None
+        self._watermelon = None
+        self._carrying = np.zeros(n_envs, dtype=bool)
+        self._fed = np.zeros(n_envs, dtype=bool)
+        self._full_rewards = np.zeros(n_envs)
+
+        self._load_boards()
+        self.reset()
+
+    def _flat(self, positions):
+        """Converts an array of (x, y) positions to flat cell indices."""
+
+        return positions[..., 1] * self._size[0] + positions[..., 0]
+
+    def _states(self):
+        """Returns encoded states of all boards: Scrat cells or full states if they are turned on in params."""
+
+        if not self._start_params.full_state:
+            return self._flat(self._scrat)
+
+        hippo = self._flat(self._hippo) if self._has_hippo else None
+        watermelon = self._flat(self._watermelon) if self._has_watermelon else None
+        return self._state_encoder.encode(self._flat(self._scrat), hippo, watermelon, self._carrying, self._fed)
+
+    def _load_boards(self):
+        """Copies boards and start positions of the single-board logics to the batch arrays."""
+
+        layers = np.stack([logic.game_board.layers.ravel() for logic in self._logics])
+        self._rewards = np.stack([logic.game_board.rewards.ravel() for logic in self._logics])
+        self._terminal = layers & TERMINAL_LAYER > 0
+        self._legal_moves = np.stack([logic.game_board.legal_moves.ravel() for logic in self._logics])
+
+        self._scrat_start = np.array([logic.start_params.scrat_start_position for logic in self._logics])
+        if self._has_hippo:
+            self._hippo_start = np.array([logic.start_params.hippo_start_position for logic in self._logics])
+        if self._has_watermelon:
+            self._watermelon_start = np.array([logic.start_params.watermelon_start_position
+                                               for logic in self._logics])
+
+    def _reset_boards(self, mask):
+        """Moves objects of the boards selected by the boolean mask to their start positions."""
+
+        self._scrat[mask] = self._scrat_start[mask]
+        if self._has_hippo:
+            self._hippo[mask] = self._hippo_start[mask]
+        if self._has_watermelon:
+            self._watermelon[mask] = self._watermelon_start[mask]
+
+        self._carrying[mask] = False
+        self._fed[mask] = False
+        self._full_rewards[mask] = 0.
+
+    def _random_move(self, positions, move_prob, active):
+        """Moves objects randomly in place in the same way as `GameObject.take_random_action`.
+
+        With probability `move_prob` an object moves in a direction chosen uniformly
+        from the directions which neither leave the board nor lead to lava.
+
+        Args:
+            positions: An array of shape (n_envs, 2) with positions of the objects.
+            move_prob: The probability of an object making a step.
+            active: A boolean array selecting the objects which are allowed to move.
+        """
+
+        if move_prob <= 0:
+            return
+
+        masks = self._legal_moves[self._rows, self._flat(positions)]
+        n_legal = _N_LEGAL[masks]
+        moving = active & (self._rng.random(self._n_envs) < move_prob) & (n_legal > 0)
+        choices = (self._rng.random(self._n_envs) * n_legal).astype(int)
+
+        positions[moving] += _DIRECTIONS[_NTH_DIRECTION[masks, choices][moving]]
+
+    def step(self, actions):
+        """Makes a game step on every board with specified actions.
+
+        Args:
+            actions: An array of ints from 0 to self.n_actions, one action per board.
+
+        Returns:
+            A tuple of (states, rewards, dones, infos):
+
+            states: Encoded Scrat positions or full states if they are turned on in params.
+                For the finished boards these are start states of the new episodes.
+            rewards: Received rewards.
+            dones: Boards which have been finished by this step.
+            infos: A dictionary with 'final_states' (states before automatic reset) and
+                'episode_rewards' (full rewards of the episodes, meaningful for the finished boards).
+        """
+
+        actions = np.asarray(actions)
+        assert actions.shape == (self._n_envs,), "Number of actions must match the number of boards"
+        assert np.all((actions >= 0) & (actions <= self._n_actions)), "Invalid action got into step function"
+
+        # move objects if they are present
+        last_hippo = None
+        if self._has_hippo:
+            last_hippo = self._hippo.copy()
+            self._random_move(self._hippo, self._start_params.hippo_move_prob, ~self._fed)
+
+        if self._has_watermelon:
+            self._random_move(self._watermelon, self._start_params.watermelon_move_prob,
+                              ~(self._carrying | self._fed))
+
+        # make actions
+        moves = actions < 4
+        directions = _DIRECTIONS[np.where(moves, actions, 0)]
+        targets = self._scrat + directions
+        moves &= np.all((targets >= 0) & (targets < self._size), axis=-1)
+        self._scrat[moves] = targets[moves]
+
+        action_rewards = np.zeros(self._n_envs)
+
+        if self._has_watermelon:
+            # with watermelon
+            carried = moves & self._carrying
+            self._watermelon[carried] += directions[carried]
+
+            take = (actions == Actions.TAKE.value) & np.all(self._scrat == self._watermelon, axis=-1)
+            self._carrying[take] = True
+
+            put_feed = (actions == Actions.PUT_FEED.value) & self._carrying
+            if self._has_hippo:
+                feed = put_feed & np.all(self._scrat == self._hippo, axis=-1) & \
+                    np.all(self._scrat == last_hippo, axis=-1)
+                self._fed[feed] = True
+                action_rewards[feed] = self._start_params.hippo_fed_reward
+            self._carrying[put_feed] = False
+
+        # change cur game params
+        cells = self._flat(self._scrat)
+        rewards = self._rewards[self._rows, cells] + action_rewards + self._start_params.tick_penalty
+        dones = self._terminal[self._rows, cells] | self._fed
+        self._full_rewards += rewards
+
+        infos = {
+            'final_states': self._states(),
+            'episode_rewards': self._full_rewards.copy()
+        }
+
+        # automatic reset of finished boards
+        if dones.any():
+            self._reset_boards(dones)
+            states = self._states()
+        else:
+            states = infos['final_states'].copy()
+
+        return states, rewards, dones, infos
+
+    def reset(self):
+        """Resets all boards to initial parameters without resampling of random values.
+
+        Returns:
+            An array of encoded Scrat start positions.
+        """
+
+        self._scrat = self._scrat_start.copy()
+        if self._has_hippo:
+            self._hippo = self._hippo_start.copy()
+        if self._has_watermelon:
+            self._watermelon = self._watermelon_start.copy()
+
+        self._carrying[:] = False
+        self._fed[:] = False
+        self._full_rewards[:] = 0.
+
+        return self._states()
+
+    def full_reset(self):
+        """Resets all boards to initial parameters with resampling of random values.
+
+        Returns:
+            An array of encoded Scrat start positions.
+        """
+
+        for logic in self._logics:
+            logic.full_reset()
+
+        self._load_boards()
+        return self.reset()
+
+    # main properties
+    @property
+    def rng(self):
+        """Random generator of moves of Hippo and Watermelon on all boards."""
+
+        return self._rng
+
+    @property
+    def n_envs(self):
+        """Number of boards in the batch."""
+
+        return self._n_envs
+
+    @property
+    def logics(self):
+        """A list of GameLogic objects the boards were generated with."""
+
+        return self._logics
+
+    @property
+    def game_mode(self):
+        """Game mode."""
+
+        return self._start_params.game_mode
+
+    @property
+    def game_size(self):
+        """A tuple with game size (width, height)."""
+
+        return self._start_params.game_width, self._start_params.game_height
+
+    @property
+    def n_actions(self):
+        """Number of game actions."""
+
+        return self._n_actions
+
+    @property
+    def n_states(self):
+        """Number of game states."""
+
+        return self._logics[0].n_states
+
+    @property
+    def state_encoder(self):
+        """StateEncoder object which encodes full states of the game."""
+
+        return self._state_encoder
+
+    # objects
+    @property
+    def scrat_positions(self):
+        """An array of shape (n_envs, 2) with Scrat positions."""
+
+        return self._scrat.copy()
+
+    @property
+    def scrat_carrying_watermelon(self):
+        """A boolean array showing on which boards Scrat is carrying the Watermelon."""
+
+        return self._carrying.copy()
+
+    @property
+    def hippo_positions(self):
+        """An array of shape (n_envs, 2) with Hippo positions."""
+
+        if self._has_hippo:
+            return self._hippo.copy()
+
+        return None
+
+    @property
+    def hippo_is_fed(self):
+        """A boolean array showing on which boards Hippo is fed."""
+
+        if self._has_hippo:
+            return self._fed.copy()
+
+        return None
+
+    @property
+    def watermelon_positions(self):
+        """An array of shape (n_envs, 2) with Watermelon positions."""
+
+        if self._has_watermelon:
+            return self._watermelon.copy()
+
+        return None
+
+    @property
+    def full_rewards(self):
+        """Full received rewards of the current episodes."""
+
+        return self._full_rewards.copy()
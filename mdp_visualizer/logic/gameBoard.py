@@ -0,0 +1,339 @@
+"""
+Game Board module
+=================
+
+This module contains the game board stored in flat NumPy arrays: a grid of rewards, a grid of bit masks
+of cell layers and the table of legal moves of Hippo and Watermelon. GameCell is a thin view of one cell.
+
+Typical usage example:
+
+    board = GameBoard(params)
+    board.move_object(Objects.SCRAT, old_position, new_position)
+    reward = board.cell_reward(new_position)
+"""
+
+from itertools import chain
+
+import numpy as np
+
+from .actions_objects_list import Actions, Objects
+
+
+# bit flags of GameBoard cell layers
+TERMINAL_LAYER = 1
+LAVA_LAYER = 2
+GREEN_LAYER = 4
+SCRAT_LAYER = 8
+HIPPO_LAYER = 16
+WATERMELON_LAYER = 32
+
+_OBJECTS_LAYERS = {
+    Objects.SCRAT: SCRAT_LAYER,
+    Objects.HIPPO: HIPPO_LAYER,
+    Objects.WATERMELON: WATERMELON_LAYER
+}
+_STATIC_LAYERS = TERMINAL_LAYER | LAVA_LAYER | GREEN_LAYER
+
+# directions of random moves of Hippo and Watermelon, bit i of a legal moves mask stands for MOVE_DIRECTIONS[i]
+MOVE_DIRECTIONS = (Actions.LEFT.value, Actions.UP.value, Actions.RIGHT.value, Actions.DOWN.value)
+
+# legal directions for every mask
+_MASK_DIRECTIONS = tuple(tuple(direction for bit, direction in enumerate(MOVE_DIRECTIONS) if mask >> bit & 1)
+                         for mask in range(1 << len(MOVE_DIRECTIONS)))
+
+
+class GameCell:
+    """GameCell class is a thin view of one cell of a game board.
+
+    Attributes:
+        reward: A float indicating the reward in the current cell.
+        is_terminal: A boolean indicating if this cell is terminal.
+        scrat_is_here: A boolean indicating if Scrat is standing on this cell.
+        hippo_is_here: A boolean indicating if Hippo is standing on this cell.
+        watermelon_is_here: A boolean indicating if Watermelon is lying on this cell.
+        lava_is_here: A boolean indicating if there is lava on this cell.
+        is_green: A boolean indicating if this cell is green (positive).
+    """
+
+    def __init__(self, x, y, board):
+        """Constructs GameCell object.
+
+        Args:
+            x: Column.
+            y: Row.
+            board: GameBoard object the cell belongs to.
+        """
+
+        self._x = x
+        self._y = y
+        self._board = board
+
+    @property
+    def x(self):
+        """Returns column."""
+
+        return self._x
+
+    @property
+    def y(self):
+        """Returns row."""
+
+        return self._y
+
+    @property
+    def reward(self):
+        """Returns the reward of the cell."""
+
+        return self._board.cell_reward((self._x, self._y))
+
+    @property
+    def is_terminal(self):
+        """Returns True if the cell is terminal."""
+
+        return self._board.is_terminal((self._x, self._y))
+
+    @property
+    def is_green(self):
+        """Returns True if the cell is green (positive)."""
+
+        return self._board.is_green((self._x, self._y))
+
+    @property
+    def lava_is_here(self):
+        """Returns True if the cell contains lava."""
+
+        return self._board.lava_is_here((self._x, self._y))
+
+    @property
+    def scrat_is_here(self):
+        """Returns True if Scrat stands on the cell."""
+
+        return self._board.scrat_is_here((self._x, self._y))
+
+    @property
+    def hippo_is_here(self):
+        """Returns True if Hippo stands on the cell."""
+
+        return self._board.hippo_is_here((self._x, self._y))
+
+    @property
+    def watermelon_is_here(self):
+        """Returns True if Watermelon lies on the cell."""
+
+        return self._board.watermelon_is_here((self._x, self._y))
+
+
+class GameBoard:
+    """Represents the game board which consists of game cells.
+
+    Cells are stored in flat NumPy arrays indexed by ``y * width + x``: a grid of rewards and a grid
+    of bit masks with static layers (terminal, lava, green) and objects occupancy layers.
+    The board also keeps a table of legal moves of Hippo and Watermelon from every cell.
+    """
+
+    def __init__(self, params):
+        self._width = params.game_width
+        self._height = params.game_height
+        self._rewards = np.zeros(self._width * self._height)
+        self._layers = np.zeros(self._width * self._height, dtype=np.uint8)
+        self._legal_moves = None
+        self._legal_directions = None
+
+        self.reset(params)
+
+    def _index(self, position):
+        """Returns flat index of the cell in specified position."""
+
+        return position[1] * self._width + position[0]
+
+    def _set_layer(self, cells, layer):
+        """Sets the layer bit in every cell from the list of positions."""
+
+        if cells:
+            cells = np.fromiter(chain.from_iterable(cells), dtype=int, count=2 * len(cells)).reshape(-1, 2)
+            self._layers[cells[:, 1] * self._width + cells[:, 0]] |= layer
+
+    def reset(self, params):
+        """Refills the board in place with cells and objects positions from the parameters.
+
+        Args:
+          params: GameParams object with game parameters.
+        """
+
+        if (self._width, self._height) != (params.game_width, params.game_height):
+            self._width = params.game_width
+            self._height = params.game_height
+            self._rewards = np.zeros(self._width * self._height)
+            self._layers = np.zeros(self._width * self._height, dtype=np.uint8)
+
+        self._layers.fill(0)
+        self._set_layer(params.lava_cells, LAVA_LAYER)
+        self._set_layer(params.green_cells, GREEN_LAYER)
+        self._set_layer(params.terminal_cells, TERMINAL_LAYER)
+
+        # lava reward overrides green reward
+        self._rewards.fill(0)
+        self._rewards[self._layers & GREEN_LAYER > 0] = params.green_reward
+        self._rewards[self._layers & LAVA_LAYER > 0] = params.lava_reward
+
+        self._update_legal_moves()
+        self.reset_objects(params)
+
+    def _update_legal_moves(self):
+        """Rebuilds the table of moves which neither leave the board nor lead to lava."""
+
+        cells = np.arange(self._width * self._height)
+        x, y = cells % self._width, cells // self._width
+        lava = self._layers & LAVA_LAYER > 0
+
+        self._legal_moves = np.zeros(cells.size, dtype=np.uint8)
+        for bit, (dx, dy) in enumerate(MOVE_DIRECTIONS):
+            inside = (0 <= x + dx) & (x + dx < self._width) & (0 <= y + dy) & (y + dy < self._height)
+            targets = np.where(inside, cells + dy * self._width + dx, cells)
+            self._legal_moves |= (inside & ~lava[targets]).astype(np.uint8) << bit
+
+        self._legal_directions = [_MASK_DIRECTIONS[mask] for mask in self._legal_moves.tolist()]
+
+    def reset_objects(self, params):
+        """Clears objects occupancy layers and puts objects to their start positions.
+
+        Args:
+          params: GameParams object with game parameters.
+        """
+
+        self._layers &= _STATIC_LAYERS
+
+        for position, layer in ((params.scrat_start_position, SCRAT_LAYER),
+                                (params.hippo_start_position, HIPPO_LAYER),
+                                (params.watermelon_start_position, WATERMELON_LAYER)):
+            if position:
+                self._layers[self._index(position)] |= layer
+
+    def move_object(self, obj, old_position, new_position):
+        """Moves an object from the old position to the new position.
+
+        Args:
+          obj: SCRAT, HIPPO or WATERMELON object of Objects class.
+          old_position: A tuple representing the position to move the object from.
+          new_position: A tuple representing the position to move the object to.
+        """
+
+        layer = _OBJECTS_LAYERS[obj]
+        self._layers[self._index(old_position)] &= ~layer & 0xFF
+        self._layers[self._index(new_position)] |= layer
+
+    def _has_layer(self, position, layer):
+        """Returns True if the cell in specified position has the layer bit set."""
+
+        return self._layers.item(position[1] * self._width + position[0]) & layer != 0
+
+    def cell(self, position):
+        """Returns a GameCell view of the cell in specified position.
+
+        Args:
+          position: A tuple representing position.
+        """
+
+        return GameCell(position[0], position[1], self)
+
+    @property
+    def rewards(self):
+        """An array of shape (height, width) with cells rewards. It is a view, not a copy."""
+
+        return self._rewards.reshape(self._height, self._width)
+
+    @property
+    def layers(self):
+        """An array of shape (height, width) with cells layers bit masks. It is a view, not a copy."""
+
+        return self._layers.reshape(self._height, self._width)
+
+    @property
+    def legal_moves(self):
+        """An array of shape (height, width) with bit masks of legal moves, bit i stands for MOVE_DIRECTIONS[i].
+
+        A move is legal if it neither leaves the board nor leads to lava.
+        """
+
+        return self._legal_moves.reshape(self._height, self._width)
+
+    @property
+    def legal_directions(self):
+        """A list with a tuple of legal directions for every cell indexed by ``y * width + x``."""
+
+        return self._legal_directions
+
+    @property
+    def terminal_mask(self):
+        """A boolean array of shape (height, width) marking terminal cells."""
+
+        return self.layers & TERMINAL_LAYER > 0
+
+    @property
+    def lava_mask(self):
+        """A boolean array of shape (height, width) marking lava cells."""
+
+        return self.layers & LAVA_LAYER > 0
+
+    def cell_reward(self, position):
+        """Returns the reward of the cell in specified position.
+
+        Args:
+          position: A tuple representing position.
+        """
+
+        return self._rewards.item(position[1] * self._width + position[0])
+
+    def is_terminal(self, position):
+        """Returns True if the cell in specified position is terminal and False otherwise.
+
+        Args:
+          position: A tuple representing position.
+        """
+
+        return self._has_layer(position, TERMINAL_LAYER)
+
+    def is_green(self, position):
+        """Returns True if the cell in specified position is green (positive) and False otherwise.
+
+        Args:
+          position: A tuple representing position.
+        """
+
+        return self._has_layer(position, GREEN_LAYER)
+
+    def scrat_is_here(self, position):
+        """Returns True if Scrat stands in specified position and False otherwise.
+
+        Args:
+          position: A tuple representing position.
+        """
+
+        return self._has_layer(position, SCRAT_LAYER)
+
+    def hippo_is_here(self, position):
+        """Returns True if Hippo stands in specified position and False otherwise.
+
+        Args:
+          position: A tuple representing position.
+        """
+
+        return self._has_layer(position, HIPPO_LAYER)
+
+    def watermelon_is_here(self, position):
+        """Returns True if Watermelon lies in specified position and False otherwise.
+
+        Args:
+          position: A tuple representing position.
+        """
+
+        return self._has_layer(position, WATERMELON_LAYER)
+
+    def lava_is_here(self, position):
+        """Returns True if the cell in specified position contains lava and False otherwise.
+
+        Args:
+          position: A tuple representing position.
+        """
+
+        return self._has_layer(position, LAVA_LAYER)
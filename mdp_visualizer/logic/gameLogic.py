@@ -10,166 +10,19 @@ Typical usage example:
     logic = GameLogic(params)
 """
 
-from random import shuffle
+import numpy as np
 
 from .actions_objects_list import Actions, Objects
+# GameCell is re-exported, it was defined here before the board got its own module
+from .gameBoard import GameBoard, GameCell  # pylint: disable=W0611
 from .gameObject import Scrat, Hippo, Watermelon
+from .mdp import build_mdp
+from .rng import spawn_rngs, UniformBuffer
+from .stateEncoder import StateEncoder
 
 
-class GameCell:
-    """GameCell class represents one cell of a game board.
-
-    Attributes:
-        reward: A float indicating the reward in the current cell.
-        is_terminal: A boolean indicating if this cell is terminal.
-        scrat_is_here: A boolean indicating if Scrat is standing on this cell.
-        hippo_is_here: A boolean indicating if Hippo is standing on this cell.
-        watermelon_is_here: A boolean indicating if Watermelon is lying on this cell.
-        lava_is_here: A boolean indicating if there is lava on this cell.
-        is_green: A boolean indicating if this cell is green (positive).
-    """
-
-    def __init__(self, x, y, params):
-        """Constructs GameCell object.
-
-        Args:
-            x: Column.
-            y: Row.
-            params: A dictionary with keys 'reward', 'is_terminal', 'scrat_is_here', ' hippo_is_here',
-                'watermelon_is_here', 'lava_is_here', 'is_green' representing properties of the current cell.
-        """
-
-        self._x = x
-        self._y = y
-        self.reward = params["reward"]
-        self.is_terminal = params["is_terminal"]
-        self.scrat_is_here = params["scrat_is_here"]
-        self.hippo_is_here = params["hippo_is_here"]
-        self.watermelon_is_here = params["watermelon_is_here"]
-        self.lava_is_here = params["lava_is_here"]
-        self.is_green = params["is_green"]
-
-    @property
-    def x(self):
-        """Returns column."""
-
-        return self._x
-
-    @property
-    def y(self):
-        """Returns row."""
-
-        return self._y
-
-
-class GameBoard:
-    """Represents the game board which consists of game cells."""
-
-    def __init__(self, params):
-        self._board = []
-
-        for y in range(params.game_height):
-            cur_row = []
-            for x in range(params.game_width):
-                cell_params = dict(scrat_is_here=(params.scrat_start_position == (x, y)),
-                                   hippo_is_here=(params.hippo_start_position == (x, y)),
-                                   watermelon_is_here=(params.watermelon_start_position == (x, y)),
-                                   lava_is_here=((x, y) in params.lava_cells),
-                                   is_terminal=((x, y) in params.terminal_cells),
-                                   is_green=((x, y) in params.green_cells))
-                if cell_params["lava_is_here"]:
-                    reward = params.lava_reward
-                elif cell_params["is_green"]:
-                    reward = params.green_reward
-                else:
-                    reward = 0
-
-                cell_params["reward"] = reward
-
-                cur_row.append(GameCell(x, y, cell_params))
-            self._board.append(cur_row)
-
-    def move_object(self, obj, old_position, new_position):
-        """Moves an object from the old position to the new position.
-
-        Args:
-          obj: A Scrat, Hippo or Watermelon object.
-          old_position: A tuple representing the position to move the object from.
-          new_position: A tuple representing the position to move the object to.
-        """
-
-        if obj == Objects.SCRAT:
-            self._board[old_position[1]][old_position[0]].scrat_is_here = False
-            self._board[new_position[1]][new_position[0]].scrat_is_here = True
-        elif obj == Objects.HIPPO:
-            self._board[old_position[1]][old_position[0]].hippo_is_here = False
-            self._board[new_position[1]][new_position[0]].hippo_is_here = True
-        elif obj == Objects.WATERMELON:
-            self._board[old_position[1]][old_position[0]].watermelon_is_here = False
-            self._board[new_position[1]][new_position[0]].watermelon_is_here = True
-
-    def cell_reward(self, position):
-        """Returns the reward of the cell in specified position.
-
-        Args:
-          position: A tuple representing position.
-        """
-
-        return self._board[position[1]][position[0]].reward
-
-    def is_terminal(self, position):
-        """Returns True if the cell in specified position is terminal and False otherwise.
-
-        Args:
-          position: A tuple representing position.
-        """
-
-        return self._board[position[1]][position[0]].is_terminal
-
-    def is_green(self, position):
-        """Returns True if the cell in specified position is green (positive) and False otherwise.
-
-        Args:
-          position: A tuple representing position.
-        """
-
-        return self._board[position[1]][position[0]].is_green
-
-    def scrat_is_here(self, position):
-        """Returns True if Scrat stands in specified position and False otherwise.
-
-        Args:
-          position: A tuple representing position.
-        """
-
-        return self._board[position[1]][position[0]].scrat_is_here
-
-    def hippo_is_here(self, position):
-        """Returns True if Hippo stands in specified position and False otherwise.
-
-        Args:
-          position: A tuple representing position.
-        """
-
-        return self._board[position[1]][position[0]].hippo_is_here
-
-    def watermelon_is_here(self, position):
-        """Returns True if Watermelon lies in specified position and False otherwise.
-
-        Args:
-          position: A tuple representing position.
-        """
-
-        return self._board[position[1]][position[0]].watermelon_is_here
-
-    def lava_is_here(self, position):
-        """Returns True if the cell in specified position contains lava and False otherwise.
-
-        Args:
-          position: A tuple representing position.
-        """
-
-        return self._board[position[1]][position[0]].lava_is_here
+# larger numbers of random positions are sampled with NumPy
+_MAX_REJECTION_SAMPLES = 64
 
 
 # pylint: disable=R0902,R0903
@@ -200,6 +53,10 @@ class GameParams:
         green_is_terminal: Green (positive) cells are terminal or not.
         green_reward: The reward of green (positive) cells.
         tick_penalty: The penalty for each tick of time.
+        full_state: States returned by the game encode all dynamic objects (see `StateEncoder`)
+            instead of only Scrat position.
+        seed: Seed of the random generator of the game (int or SeedSequence). Random cells, start positions
+            and moves of Hippo and Watermelon are reproducible with the same seed.
     """
 
     # pylint: disable=R0913,R0914
@@ -210,7 +67,7 @@ class GameParams:
                  lava_random=False, lava_cells=None, lava_is_terminal=True, lava_reward=-10,
                  terminal_random=False, terminal_cells=None,
                  green_random=False, green_cells=None, green_is_terminal=True, green_reward=10,
-                 tick_penalty=0):
+                 tick_penalty=0, full_state=False, seed=None):
         """Constructs GameParams object with game parameters."""
 
         # main
@@ -255,6 +112,12 @@ class GameParams:
         # penalty
         self.tick_penalty = tick_penalty
 
+        # states
+        self.full_state = full_state
+
+        # randomness
+        self.seed = seed
+
     @property
     def initial_terminal_cells(self):
         """Terminal cells of the board which are specified explicitly."""
@@ -269,11 +132,14 @@ class GameLogic:
     objects on the board which can move.
     """
 
-    def __init__(self, params: GameParams):
+    def __init__(self, params: GameParams, rng=None):
         """Constructs GameLogic object.
 
         Args:
             params (GameParams): An instance of class GameParams with game settings.
+            rng (np.random.Generator): Random generator of the game. By default it is created from `params.seed`.
+                Placement and moves of Hippo and Watermelon use two streams spawned from it, so moves don't depend
+                on how many cells were sampled. Pass generators from `rng.spawn_rngs` to run independent games.
         """
 
         # params which define game type
@@ -296,33 +162,74 @@ class GameLogic:
         self._hippo = None
         self._watermelon = None
 
+        # states
+        self._state_encoder = None
+
+        # random generators of the placement and of moves of Hippo and Watermelon
+        self._rng, move_rng = spawn_rngs(params.seed if rng is None else rng, 2)
+        self._uniform = UniformBuffer(move_rng)
+
         # generate a new game with start params
         self._generate_new_game()
 
     # generator
-    def _generate_random_positions(self, num_of_pos=1, exclude_cells=None):
-        """Generate a number of positions on the game board excluding the specified cells.
+    def _cells(self, positions):
+        """Returns a set of flat cell numbers ``y * width + x`` of the positions."""
+
+        width = self._start_params.game_width
+        return {y * width + x for x, y in positions}
+
+    def _excluded_cells(self, cache, name):
+        """Returns the set of flat cell numbers of the cells list of start params, building it once per cache.
 
         Args:
-            num_of_pos:  Number of positions to generate. Default: 1.
-            exclude_cells:  A tuple of tuples representing positions which shouldn't be generated. Default: None.
+            cache: A dict with sets built during the current placement.
+            name: Name of the cells list in start params, e.g. 'lava_cells'. The list must be final.
+        """
+
+        if name not in cache:
+            cache[name] = self._cells(getattr(self._start_params, name))
+        return cache[name]
+
+    def _generate_random_positions(self, num_of_pos, exclude=()):
+        """Generate a number of distinct positions on the game board excluding the specified cells.
+
+        A few cells are drawn uniformly with rejection of the excluded and already drawn ones, so it takes
+        O(num_of_pos) expected time while at least half of the board is free. Many cells, or cells of
+        a crowded board, are chosen from the explicit array of free cells with NumPy.
+
+        Args:
+            num_of_pos: Number of positions to generate.
+            exclude: Sets of flat cell numbers (see `_cells`) which shouldn't be generated. Default: none.
 
         Returns:
             A list of tuples with generated positions.
         """
 
-        exclude_cells = set(exclude_cells or [])
-        positions = [(x, y) for y in range(self.game_size[1]) for x in range(self.game_size[0])]
-        shuffle(positions)
-
-        out = []
-        i = 0
-        while len(out) < num_of_pos:
-            if positions[i] not in exclude_cells:
-                out.append(positions[i])
-            i += 1
-
-        return out
+        width, height = self.game_size
+        n_cells = width * height
+        n_excluded = sum(map(len, exclude))
+
+        if num_of_pos > _MAX_REJECTION_SAMPLES or 2 * (num_of_pos + n_excluded) > n_cells:
+            free = np.ones(n_cells, dtype=bool)
+            for cells in exclude:
+                free[np.fromiter(cells, dtype=int, count=len(cells))] = False
+            free_cells = np.flatnonzero(free)
+            assert num_of_pos <= free_cells.size, "Not enough free cells on the board"
+            cells = self._rng.choice(free_cells, num_of_pos, replace=False).tolist()
+        else:
+            cells = []
+            drawn = set()
+            while len(cells) < num_of_pos:
+                for cell in self._rng.integers(n_cells, size=2 * (num_of_pos - len(cells))).tolist():
+                    if cell in drawn or any(cell in cells_set for cells_set in exclude):
+                        continue
+                    drawn.add(cell)
+                    cells.append(cell)
+                    if len(cells) == num_of_pos:
+                        break
+
+        return [(cell % width, cell // width) for cell in cells]
 
     # pylint: disable=R0912
     def _fill_start_params(self, resample=False):
@@ -341,11 +248,13 @@ class GameLogic:
             self._start_params.lava_cells = self._generate_random_positions(int(self._start_params.lava_random))
             # print(self.lava_cells)
 
+        # sets of excluded cells are built only if they are needed, and once for all placements
+        excluded = {}
+
         # secondly green cells
         if (len(self._start_params.green_cells) == 0 or resample) and self._start_params.green_random:
-            exclude = self._start_params.lava_cells
-            self._start_params.green_cells = self._generate_random_positions(int(self._start_params.green_random),
-                                                                             exclude_cells=exclude)
+            self._start_params.green_cells = self._generate_random_positions(
+                int(self._start_params.green_random), [self._excluded_cells(excluded, 'lava_cells')])
 
         # thirdly terminal cells not to set scrat or watermelon in terminal cell
         any_terminal_is_random = self._start_params.terminal_random or \
@@ -361,18 +270,17 @@ class GameLogic:
             # lava is terminal
             if self._start_params.lava_is_terminal:
                 num_to_generate = self._start_params.terminal_random - len(self._start_params.lava_cells)
-                exclude += self._start_params.lava_cells
+                exclude.append(self._excluded_cells(excluded, 'lava_cells'))
             else:
                 num_to_generate = self._start_params.terminal_random
 
             # green is terminal
             if self._start_params.green_is_terminal:
                 num_to_generate -= len(self._start_params.green_cells)
-                exclude += self._start_params.green_cells
+                exclude.append(self._excluded_cells(excluded, 'green_cells'))
 
             if num_to_generate > 0:
-                self._start_params.terminal_cells = self._generate_random_positions(num_to_generate,
-                                                                                    exclude_cells=exclude)
+                self._start_params.terminal_cells = self._generate_random_positions(num_to_generate, exclude)
             else:
                 self._start_params.terminal_cells = []
 
@@ -385,18 +293,18 @@ class GameLogic:
 
         # scrat: without lava and terminal cells
         if (not self._start_params.scrat_start_position or resample) and self._start_params.scrat_random:
-            exclude = self._start_params.terminal_cells
-            self._start_params.scrat_start_position = self._generate_random_positions(exclude_cells=exclude)[0]
+            self._start_params.scrat_start_position = self._generate_random_positions(
+                1, [self._excluded_cells(excluded, 'terminal_cells')])[0]
 
         # hippo without lava cells
         if (not self._start_params.hippo_start_position or resample) and self._start_params.hippo_random:
-            exclude = self._start_params.lava_cells
-            self._start_params.hippo_start_position = self._generate_random_positions(exclude_cells=exclude)[0]
+            self._start_params.hippo_start_position = self._generate_random_positions(
+                1, [self._excluded_cells(excluded, 'lava_cells')])[0]
 
         # watermelon: without lava and terminal cells
         if (not self._start_params.watermelon_start_position or resample) and self._start_params.watermelon_random:
-            exclude = self._start_params.lava_cells + self._start_params.terminal_cells
-            self._start_params.watermelon_start_position = self._generate_random_positions(exclude_cells=exclude)[0]
+            self._start_params.watermelon_start_position = self._generate_random_positions(
+                1, [self._excluded_cells(excluded, 'lava_cells'), self._excluded_cells(excluded, 'terminal_cells')])[0]
 
     def _generate_new_game(self):
         """Initializes GameLogic inner objects at the start of the game."""
@@ -415,10 +323,14 @@ class GameLogic:
         # hippo
         if self._start_params.hippo_start_position:
             self._hippo = Hippo(self._start_params)
+            self._hippo.set_legal_directions(self._game_board.legal_directions)
+            self._hippo.set_random(self._uniform.random)
 
         # watermelon
         if self._start_params.watermelon_start_position:
             self._watermelon = Watermelon(self._start_params)
+            self._watermelon.set_legal_directions(self._game_board.legal_directions)
+            self._watermelon.set_random(self._uniform.random)
 
         # actions!
         if self._watermelon:
@@ -426,6 +338,9 @@ class GameLogic:
         else:
             self._n_actions = 4  # Actions class
 
+        # states
+        self._state_encoder = StateEncoder.from_logic(self)
+
     # other
     # pylint: disable=R0912
     def step(self, action):
@@ -437,7 +352,7 @@ class GameLogic:
         Returns:
             A tuple of (state, reward, done, info):
 
-            state: An encoded Scrat position on the board.
+            state: An encoded Scrat position on the board or an encoded full state if it is turned on in params.
             reward: Received reward.
             done: The game is finished or not.
             info: None.
@@ -448,57 +363,115 @@ class GameLogic:
         # save last action
         self._last_action = action
 
+        # objects and positions are read once, positions are tuples which change only when objects move
+        params = self._start_params
+        scrat, hippo, watermelon = self._scrat, self._hippo, self._watermelon
+
         # save last hippo position
-        last_hippo_position = self.hippo_position if self._hippo else None
+        last_hippo_position = hippo.cur_position if hippo else None
 
         # move objects if they are present
-        if self._hippo:
-            direction = self._hippo.take_random_action()
+        if hippo:
+            direction = hippo.take_random_action()
             if direction:
                 self._move_object(Objects.HIPPO, direction)
 
-        if self._watermelon:
-            if not (self._watermelon.is_taken or self._watermelon.is_eaten):
-                direction = self._watermelon.take_random_action()
+        if watermelon:
+            if not (watermelon.is_taken or watermelon.is_eaten):
+                direction = watermelon.take_random_action()
                 if direction:
                     self._move_object(Objects.WATERMELON, direction)
 
         # make action
         action_reward = 0
+        scrat_position = scrat.cur_position
 
-        if action == 0 and self.scrat_position[0] > 0:
+        if action == 0 and scrat_position[0] > 0:
             self._move_object(Objects.SCRAT, Actions.LEFT.value)
-        if action == 1 and self.scrat_position[1] > 0:
+        elif action == 1 and scrat_position[1] > 0:
             self._move_object(Objects.SCRAT, Actions.UP.value)
-        if action == 2 and self.scrat_position[0] < self.game_size[0] - 1:
+        elif action == 2 and scrat_position[0] < params.game_width - 1:
             self._move_object(Objects.SCRAT, Actions.RIGHT.value)
-        if action == 3 and self.scrat_position[1] < self.game_size[1] - 1:
+        elif action == 3 and scrat_position[1] < params.game_height - 1:
             self._move_object(Objects.SCRAT, Actions.DOWN.value)
-        if action == Actions.TAKE.value and self.scrat_position == self.watermelon_position:
+        elif action == Actions.TAKE.value and watermelon and scrat_position == watermelon.cur_position:
             self._interact_with_watermelon(Actions.TAKE)
-        if action == Actions.PUT_FEED.value and self.scrat_carrying_watermelon:
-            if self.scrat_position == self.hippo_position and self.scrat_position == last_hippo_position:
+        elif action == Actions.PUT_FEED.value and scrat.carrying_watermelon:
+            if hippo is not None and scrat_position == hippo.cur_position == last_hippo_position:
                 self._interact_with_watermelon(Actions.FEED)
                 action_reward = self._interact_with_hippo(Actions.FEED)
             else:
                 self._interact_with_watermelon(Actions.PUT)
 
-        # penalty
-        tick_penalty = self._start_params.tick_penalty
+        scrat_position = scrat.cur_position
 
         # change cur game params
-        cell_reward = self._game_board.cell_reward(self.scrat_position)
-        self._last_reward = cell_reward + action_reward + tick_penalty
+        cell_reward = self._game_board.cell_reward(scrat_position)
+        self._last_reward = cell_reward + action_reward + params.tick_penalty
         self._full_reward += self._last_reward
-        self._done = self._game_board.is_terminal(self.scrat_position) or (self._hippo and self.hippo_is_fed)
+        self._done = self._game_board.is_terminal(scrat_position) or (hippo is not None and hippo.is_fed)
 
-        state = self.scrat_position[1] * self._start_params.game_width + self.scrat_position[0]
+        if params.full_state:
+            state = self._state_encoder.encode_logic(self)
+        else:
+            state = params.game_width * scrat_position[1] + scrat_position[0]
         reward = self._last_reward
         done = self._done
         info = None
 
         return state, reward, done, info
 
+    def to_mdp(self, sparse=False):
+        """Builds transition and reward tensors of the current board. See `mdp.build_mdp`.
+
+        Args:
+            sparse (bool): Return transition probabilities as a sparse matrix. Default: False.
+
+        Returns:
+            MDP: a named tuple (P, R, terminal, encoder).
+        """
+
+        return build_mdp(self, sparse)
+
+    def set_state(self, state):
+        """Puts the objects to the positions of the state, e.g. to replay recorded transitions.
+
+        Positions of Hippo and Watermelon are only encoded in full states, otherwise they are kept.
+
+        Args:
+            state: An encoded Scrat position or an encoded full state if it is turned on in params.
+        """
+
+        if self._start_params.full_state:
+            scrat, hippo, watermelon, carrying, fed = self._state_encoder.decode(state)
+        else:
+            scrat, hippo, watermelon, carrying, fed = state, None, None, None, None
+
+        for name, obj, cell in ((Objects.SCRAT, self._scrat, scrat),
+                                (Objects.HIPPO, self._hippo, hippo),
+                                (Objects.WATERMELON, self._watermelon, watermelon)):
+            if obj is not None and cell is not None:
+                x, y = obj.cur_position
+                new_x, new_y = self._state_encoder.position(int(cell))
+                obj.change_position(new_x - x, new_y - y)
+                self._game_board.move_object(name, obj.prev_position, obj.cur_position)
+
+        if carrying is not None:
+            if carrying:
+                self._interact_with_watermelon(Actions.TAKE)
+            else:
+                self._scrat.release_watermelon()
+                self._watermelon.become_released()
+        if fed is not None:
+            if fed:
+                self._hippo.become_fed()
+                self._watermelon.become_eaten()
+            else:
+                self._hippo.become_hungry()
+                self._watermelon.become_not_eaten()
+
+        self._done = self._game_board.is_terminal(self.scrat_position) or bool(self._hippo and self.hippo_is_fed)
+
     def _move_object(self, obj, direction):  # with watermelon if it is taken
         """Moves the specified object in specified direction.
 
@@ -507,20 +480,23 @@ class GameLogic:
             direction: Value of one of LEFT, UP, RIGHT or DOWN actions of Actions class.
         """
 
+        board = self._game_board
         if obj == Objects.SCRAT:
-            self._scrat.change_position(*direction)
-            self._game_board.move_object(obj, self._scrat.prev_position, self.scrat_position)
+            scrat = self._scrat
+            scrat.change_position(*direction)
+            board.move_object(obj, scrat.prev_position, scrat.cur_position)
 
             # with watermelon
-            if self.scrat_carrying_watermelon:
-                self._watermelon.change_position(*direction)
-                self._game_board.move_object(self._watermelon, self._watermelon.prev_position, self.watermelon_position)
+            if scrat.carrying_watermelon:
+                watermelon = self._watermelon
+                watermelon.change_position(*direction)
+                board.move_object(Objects.WATERMELON, watermelon.prev_position, watermelon.cur_position)
         elif obj == Objects.HIPPO:
             self._hippo.change_position(*direction)
-            self._game_board.move_object(obj, self._hippo.prev_position, self.hippo_position)
+            board.move_object(obj, self._hippo.prev_position, self._hippo.cur_position)
         elif obj == Objects.WATERMELON:
             self._watermelon.change_position(*direction)
-            self._game_board.move_object(obj, self._watermelon.prev_position, self.watermelon_position)
+            board.move_object(obj, self._watermelon.prev_position, self._watermelon.cur_position)
 
     def _interact_with_watermelon(self, action):
         """Updates objects' parameters which are connected to the Watermelon.
@@ -569,6 +545,12 @@ class GameLogic:
 
         return self._start_params.game_width, self._start_params.game_height
 
+    @property
+    def rng(self):
+        """Random generator of the placement of random cells and start positions."""
+
+        return self._rng
+
     @property
     def game_board(self):
         """Game board."""
@@ -603,8 +585,27 @@ class GameLogic:
     def n_states(self):
         """Number of game states."""
 
+        if self._start_params.full_state:
+            return self._state_encoder.n_states
+
         return self._start_params.game_width * self._start_params.game_height
 
+    @property
+    def state_encoder(self):
+        """StateEncoder object which encodes full states of the game."""
+
+        return self._state_encoder
+
+    @property
+    def state(self):
+        """Current state: encoded Scrat position or encoded full state if it is turned on in params."""
+
+        if self._start_params.full_state:
+            return self._state_encoder.encode_logic(self)
+
+        x, y = self.scrat_position
+        return self._start_params.game_width * y + x
+
     # rewards
     @property
     def last_reward(self):
@@ -700,27 +701,31 @@ class GameLogic:
         return self._start_params.green_cells
 
     # reset
-    def _reset_objects(self):
-        """Reset game logic objects to initial parameters."""
+    def _reset_objects(self, resample=False):
+        """Reset game logic objects to initial parameters.
 
-        # game board
-        self._game_board = GameBoard(self._start_params)
+        Args:
+            resample: Cells of the board were resampled and have to be refilled. Default: False.
+        """
 
-        # scrat
-        self._scrat.reset_position(self._start_params)
-        self._scrat.update_params(self._start_params)
-        self._scrat.release_watermelon()
+        # game board: in place, cells only change after resampling
+        if resample:
+            self._game_board.reset(self._start_params)
+        else:
+            self._game_board.reset_objects(self._start_params)
 
-        # hippo
-        if self._start_params.hippo_start_position:
-            self._hippo.reset_position(self._start_params)
-            self._hippo.update_params(self._start_params)
-            self._hippo.become_hungry()
+        # objects: board size and legal moves are updated only after resampling as well
+        for obj in (self._scrat, self._hippo, self._watermelon):
+            if obj:
+                obj.reset_position(self._start_params)
+                if resample:
+                    obj.update_params(self._start_params)
+                    obj.set_legal_directions(self._game_board.legal_directions)
 
-        # watermelon
-        if self._start_params.watermelon_start_position:
-            self._watermelon.reset_position(self._start_params)
-            self._watermelon.update_params(self._start_params)
+        self._scrat.release_watermelon()
+        if self._hippo:
+            self._hippo.become_hungry()
+        if self._watermelon:
             self._watermelon.become_released()
             self._watermelon.become_not_eaten()
 
@@ -729,12 +734,11 @@ class GameLogic:
 
         self._fill_start_params()
         self._reset_objects()
-        x, y = self.scrat_position
         self._done = self._game_board.is_terminal(self.scrat_position) or (self._hippo and self.hippo_is_fed)
-        return self._start_params.game_width * y + x
+        return self.state
 
     def full_reset(self):  # with resampling of random values
         """Reset game logic to initial parameters with resampling of random values."""
 
         self._fill_start_params(resample=True)
-        self._reset_objects()
+        self._reset_objects(resample=True)
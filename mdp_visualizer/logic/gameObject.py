@@ -5,13 +5,19 @@ Game Object module
 This module contains backend implementations of game objects like Scrat, Hippo and Watermelon.
 """
 
-from random import randint, random
-
-from .actions_objects_list import Actions
+from random import random
 
 
 class GameObject:
-    """A class that implements backend logic of game objects like Scrat, Hippo and Watermelon."""
+    """A class that implements backend logic of game objects like Scrat, Hippo and Watermelon.
+
+    Positions are stored as tuples which are created only when the object moves,
+    so reading a position doesn't allocate anything.
+    Random moves are drawn from the table of legal directions of the game board.
+    """
+
+    __slots__ = ('_position', '_prev_position', '_game_height', '_game_width', '_legal_directions', '_random',
+                 '_move_prob')
 
     def __init__(self, params):
         """A constructor which initializes object parameters.
@@ -20,15 +26,14 @@ class GameObject:
             params: A GameParams object with game parameters.
         """
 
-        self._x = 0
-        self._y = 0
+        self._position = (0, 0)
+        self._prev_position = (-1, -1)
         self._game_height = params.game_height
         self._game_width = params.game_width
 
         # additional fields
-        self._prev_x = -1
-        self._prev_y = -1
-        self._lava_cells = params.lava_cells
+        self._legal_directions = None
+        self._random = random
 
         self._move_prob = 0
 
@@ -36,31 +41,41 @@ class GameObject:
     def x(self):
         """X position of the object."""
 
-        return self._x
+        return self._position[0]
 
     @property
     def y(self):
         """Y position of the object."""
 
-        return self._y
+        return self._position[1]
 
     @property
     def cur_position(self):
         """Tuple with current position of the object."""
 
-        return self._x, self._y
+        return self._position
 
     @property
     def prev_position(self):
         """Tuple with previous position of the object."""
 
-        return self._prev_x, self._prev_y
+        return self._prev_position
 
     @property
     def dx_dy(self):
         """Tuple with the last differences in X and Y coordinates."""
 
-        return self._x - self._prev_x, self._y - self._prev_y
+        return self._position[0] - self._prev_position[0], self._position[1] - self._prev_position[1]
+
+    def _set_position(self, position):
+        """Puts the object to the position and forgets the previous one.
+
+        Args:
+          position: A tuple or a list with the new position.
+        """
+
+        self._position = (position[0], position[1])
+        self._prev_position = (-1, -1)
 
     def reset_position(self, params):
         """An abstract method for resetting object params
@@ -79,47 +94,46 @@ class GameObject:
           dy: Difference in y coordinate.
         """
 
-        self._prev_x = self._x
-        self._prev_y = self._y
-        self._x += dx
-        self._y += dy
+        x, y = self._prev_position = self._position
+        self._position = (x + dx, y + dy)
 
     def take_random_action(self):
-        """Returns a random action number with specified probability."""
-
-        random_action = None
-
-        if self._move_prob > 0:
-            take_action = random() < self._move_prob
-            if take_action:
-                action_taken = False
-                num_samples = 0
-                while not action_taken and num_samples < 4:
-                    random_action = randint(0, 3)
-                    if random_action == 0 and self.x > 0 and (self.x - 1, self.y) not in self._lava_cells:
-                        random_action = Actions.LEFT.value
-                        action_taken = True
-                    elif random_action == 1 and self.y > 0 and (self.x, self.y - 1) not in self._lava_cells:
-                        random_action = Actions.UP.value
-                        action_taken = True
-                    elif random_action == 2 and self.x < self._game_width - 1 and (
-                            self.x + 1, self.y) not in self._lava_cells:
-                        random_action = Actions.RIGHT.value
-                        action_taken = True
-                    elif random_action == 3 and self.y < self._game_height - 1 and (
-                            self.x, self.y + 1) not in self._lava_cells:
-                        random_action = Actions.DOWN.value
-                        action_taken = True
-
-                    num_samples += 1
-
-                if num_samples == 4 and not action_taken:
-                    random_action = None
-
-        return random_action
+        """Returns a random direction with the move probability or None.
+
+        The direction is chosen uniformly from the directions which neither leave the board nor lead to lava.
+        The object doesn't move if there are no such directions or the table of them isn't set.
+        """
+
+        if self._move_prob > 0 and self._legal_directions is not None and self._random() < self._move_prob:
+            x, y = self._position
+            directions = self._legal_directions[y * self._game_width + x]
+            if directions:
+                return directions[int(self._random() * len(directions))]
+
+        return None
+
+    def set_legal_directions(self, legal_directions):
+        """Sets the table of legal directions used by random moves.
+
+        Args:
+          legal_directions: A list with a tuple of legal directions for every cell indexed by ``y * width + x``,
+            see `GameBoard.legal_directions`.
+        """
+
+        self._legal_directions = legal_directions
+
+    def set_random(self, random_function):
+        """Sets the source of uniform random numbers from [0, 1) used by random moves.
+
+        Args:
+          random_function: A function without arguments, e.g. `rng.UniformBuffer.random` of the game.
+            The global `random.random` is used by default.
+        """
+
+        self._random = random_function
 
     def update_params(self, params):
-        """Updates game height, width and lava cells saved parameters of the object.
+        """Updates game height and width saved parameters of the object.
 
         Args:
           params: GameParams object with game parameters.
@@ -128,21 +142,19 @@ class GameObject:
         self._game_height = params.game_height
         self._game_width = params.game_width
 
-        # additional fields
-        self._lava_cells = params.lava_cells
-
 
 class Scrat(GameObject):
     """A class that implements specific Scrat object details."""
 
+    __slots__ = ('_carrying_watermelon',)
+
     def __init__(self, params):
         """"A constructor. Also saves the fact Scrat is carrying the Watermelon or not."""
 
         super().__init__(params)
 
         # base
-        self._x = params.scrat_start_position[0]
-        self._y = params.scrat_start_position[1]
+        self._set_position(params.scrat_start_position)
 
         # specific properties
         self._carrying_watermelon = False
@@ -154,10 +166,7 @@ class Scrat(GameObject):
           params: GameParams object with game parameters.
         """
 
-        self._x = params.scrat_start_position[0]
-        self._y = params.scrat_start_position[1]
-        self._prev_x = -1
-        self._prev_y = -1
+        self._set_position(params.scrat_start_position)
 
     def take_watermelon(self):
         """Saves the fact Scrat is carrying the Watermelon now."""
@@ -179,6 +188,8 @@ class Scrat(GameObject):
 class Hippo(GameObject):
     """A class that implements specific Hippo object details."""
 
+    __slots__ = ('_is_fed',)
+
     def __init__(self, params):
         """"A constructor. Also saves Hippo move probability and his/her fed state.
 
@@ -189,8 +200,7 @@ class Hippo(GameObject):
         super().__init__(params)
 
         # base
-        self._x = params.hippo_start_position[0]
-        self._y = params.hippo_start_position[1]
+        self._set_position(params.hippo_start_position)
         self._move_prob = params.hippo_move_prob
 
         # specific properties
@@ -203,10 +213,7 @@ class Hippo(GameObject):
           params: GameParams object with game parameters.
         """
 
-        self._x = params.hippo_start_position[0]
-        self._y = params.hippo_start_position[1]
-        self._prev_x = -1
-        self._prev_y = -1
+        self._set_position(params.hippo_start_position)
 
     def become_fed(self):
         """Saves the fact Hippo is fed now."""
@@ -228,6 +235,8 @@ class Hippo(GameObject):
 class Watermelon(GameObject):
     """A class that implements specific Watermelon object details."""
 
+    __slots__ = ('_is_taken', '_is_eaten')
+
     def __init__(self, params):
         """"A constructor. Also saves Watermelon move probability and its eaten and taken states.
 
@@ -238,8 +247,7 @@ class Watermelon(GameObject):
         super().__init__(params)
 
         # base
-        self._x = params.watermelon_start_position[0]
-        self._y = params.watermelon_start_position[1]
+        self._set_position(params.watermelon_start_position)
         self._move_prob = params.watermelon_move_prob
 
         # specific properties
@@ -253,10 +261,7 @@ class Watermelon(GameObject):
           params: GameParams object with game parameters.
         """
 
-        self._x = params.watermelon_start_position[0]
-        self._y = params.watermelon_start_position[1]
-        self._prev_x = -1
-        self._prev_y = -1
+        self._set_position(params.watermelon_start_position)
 
     def become_taken(self):
         """Saves the fact Watermelon is taken now."""
@@ -0,0 +1,217 @@
+"""
+MDP module
+==========
+
+This module builds the transition and reward tensors of the Markov decision process defined by a game board.
+The stochastic moves of Hippo and Watermelon are taken into account analytically, so no simulation is needed.
+
+Typical usage example:
+
+    mdp = logic.to_mdp()
+    next_states_probs = mdp.P[state, action]
+    expected_reward = mdp.R[state, action]
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .actions_objects_list import Actions
+
+__all__ = ('MDP', 'build_mdp')
+
+MDP = namedtuple('MDP', ('P', 'R', 'terminal', 'encoder'))
+MDP.__doc__ = """Transition and reward tensors of the game.
+
+Attributes:
+    P: Transition probabilities. Dense array of shape (n_states, n_actions, n_states) or sparse CSR matrix
+        of shape (n_states * n_actions, n_states) with row ``state * n_actions + action``.
+    R: Array of shape (n_states, n_actions) with expected rewards.
+    terminal: Boolean array of shape (n_states,) marking terminal states. They are absorbing and give zero reward.
+    encoder: StateEncoder object which defines the states numbering.
+"""
+
+# directions in the order used by GameObject.take_random_action and by actions 0-3
+_DIRECTIONS = (Actions.LEFT.value, Actions.UP.value, Actions.RIGHT.value, Actions.DOWN.value)
+
+
+def _moves_table(game_size):
+    """Returns cells reached from every cell by every direction and a mask of moves inside the board.
+
+    Args:
+        game_size: A tuple with game size (width, height).
+
+    Returns:
+        A tuple of two arrays of shape (n_cells, 4). Moves outside the board leave the cell unchanged.
+    """
+
+    width, height = game_size
+    cells = np.arange(width * height)
+    x, y = cells % width, cells // width
+
+    targets = np.empty((cells.size, len(_DIRECTIONS)), dtype=int)
+    inside = np.empty((cells.size, len(_DIRECTIONS)), dtype=bool)
+    for i, (dx, dy) in enumerate(_DIRECTIONS):
+        inside[:, i] = (0 <= x + dx) & (x + dx < width) & (0 <= y + dy) & (y + dy < height)
+        targets[:, i] = np.where(inside[:, i], cells + dy * width + dx, cells)
+
+    return targets, inside
+
+
+def _random_move_table(game_size, legal_moves, move_prob):
+    """Returns the distribution of the next cell of an object which moves as `GameObject.take_random_action`.
+
+    With probability `move_prob` an object moves in a direction chosen uniformly from the legal ones,
+    so with L legal directions every one of them is taken with probability ``move_prob / L``.
+
+    Args:
+        game_size: A tuple with game size (width, height).
+        legal_moves: Array of shape (n_cells,) with bit masks of legal directions, see `GameBoard.legal_moves`.
+        move_prob: The probability of the object making a step.
+
+    Returns:
+        A tuple of two arrays of shape (n_cells, 5) with next cells and their probabilities.
+        The first column corresponds to staying in place, the others to the four directions.
+    """
+
+    targets, _ = _moves_table(game_size)
+    legal = (legal_moves[:, None] >> np.arange(len(_DIRECTIONS))) & 1 > 0
+
+    next_cells = np.hstack([np.arange(targets.shape[0])[:, None], targets])
+    probs = np.zeros(next_cells.shape)
+
+    if move_prob > 0:
+        n_legal = legal.sum(axis=1)
+        probs[:, 1:] = np.where(legal, move_prob / np.maximum(n_legal, 1)[:, None], 0.)
+
+    probs[:, 0] = 1 - probs[:, 1:].sum(axis=1)
+
+    return next_cells, probs
+
+
+# pylint: disable=R0913,R0914
+def _apply_action(action, moves, scrat, hippo, last_hippo, watermelon, carrying, fed, fed_reward):
+    """Applies Scrat action to the arrays of states after Hippo and Watermelon moves as `GameLogic.step` does.
+
+    Returns:
+        A tuple (scrat, watermelon, carrying, fed, action_reward) with new arrays.
+    """
+
+    action_reward = 0.
+
+    if action < len(_DIRECTIONS):
+        new_scrat = moves[scrat, action]
+        if watermelon is not None:
+            watermelon = np.where(carrying & (new_scrat != scrat), moves[watermelon, action], watermelon)
+        scrat = new_scrat
+    elif action == Actions.TAKE.value and watermelon is not None:
+        carrying = carrying | (scrat == watermelon)
+    elif action == Actions.PUT_FEED.value and watermelon is not None:
+        if fed is not None:
+            feed = carrying & (scrat == hippo) & (scrat == last_hippo)
+            fed = fed | feed
+            action_reward = np.where(feed, fed_reward, 0.)
+        carrying = np.zeros_like(carrying)
+
+    return scrat, watermelon, carrying, fed, action_reward
+
+
+# pylint: disable=R0914,R0915
+def build_mdp(logic, sparse=False):
+    """Builds transition and reward tensors of the current board of the game.
+
+    States are all combinations of the dynamic components of the game, see `StateEncoder`.
+    They coincide with the states returned by the game if `full_state` is turned on in its params.
+    A state is terminal if Scrat stands on a terminal cell or Hippo is fed.
+
+    Args:
+        logic: GameLogic object.
+        sparse (bool): Return P as a sparse matrix. Dense P has n_states ** 2 * n_actions elements,
+            so it is only suitable for the boards without Hippo and Watermelon or for very small ones.
+
+    Returns:
+        MDP: a named tuple (P, R, terminal, encoder).
+    """
+
+    # scipy is imported only when it's needed, it makes importing the logic much slower
+    # pylint: disable=C0415
+    from scipy.sparse import csr_matrix
+
+    params = logic.start_params
+    encoder = logic.state_encoder
+    n_states, n_actions = encoder.n_states, logic.n_actions
+
+    board = logic.game_board
+    cell_rewards = board.rewards.ravel()
+    legal_moves = board.legal_moves.ravel()
+    moves, _ = _moves_table(logic.game_size)
+
+    scrat, hippo, watermelon, carrying, fed = encoder.decode(np.arange(n_states))
+    terminal = board.terminal_mask.ravel()[scrat]
+    if fed is not None:
+        terminal |= fed
+
+    # only non-terminal states are simulated
+    states = np.flatnonzero(~terminal)
+    scrat = scrat[states]
+    if hippo is not None:
+        hippo = hippo[states]
+        hippo_cells, hippo_probs = _random_move_table(logic.game_size, legal_moves, params.hippo_move_prob)
+    if watermelon is not None:
+        watermelon = watermelon[states]
+        carrying = carrying[states]
+        watermelon_cells, watermelon_probs = _random_move_table(logic.game_size, legal_moves,
+                                                                params.watermelon_move_prob)
+    if fed is not None:
+        fed = fed[states]
+
+    rows, cols, data = [], [], []
+    rewards = np.zeros((n_states, n_actions))
+
+    for hippo_outcome in range(5) if hippo is not None else (None,):
+        if hippo is not None:
+            new_hippo = hippo_cells[hippo, hippo_outcome]
+            hippo_prob = hippo_probs[hippo, hippo_outcome]
+        else:
+            new_hippo, hippo_prob = None, 1.
+
+        for watermelon_outcome in range(5) if watermelon is not None else (None,):
+            prob = hippo_prob
+            new_watermelon = watermelon
+            if watermelon is not None:
+                movable = ~carrying if fed is None else ~(carrying | fed)
+                new_watermelon = np.where(movable, watermelon_cells[watermelon, watermelon_outcome], watermelon)
+                prob = prob * np.where(movable, watermelon_probs[watermelon, watermelon_outcome],
+                                       float(watermelon_outcome == 0))
+
+            prob = np.broadcast_to(prob, states.shape)
+            if not prob.any():
+                continue
+
+            for action in range(n_actions):
+                next_scrat, next_watermelon, next_carrying, next_fed, action_reward = _apply_action(
+                    action, moves, scrat, new_hippo, hippo, new_watermelon, carrying, fed, params.hippo_fed_reward)
+
+                reward = cell_rewards[next_scrat] + action_reward + params.tick_penalty
+                rewards[states, action] += prob * reward
+
+                possible = prob > 0
+                rows.append(states[possible] * n_actions + action)
+                cols.append(np.broadcast_to(
+                    encoder.encode(next_scrat, new_hippo, next_watermelon, next_carrying, next_fed),
+                    states.shape)[possible])
+                data.append(prob[possible])
+
+    # terminal states are absorbing
+    terminal_states = np.flatnonzero(terminal)
+    for action in range(n_actions):
+        rows.append(terminal_states * n_actions + action)
+        cols.append(terminal_states)
+        data.append(np.ones(terminal_states.size))
+
+    transitions = csr_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(n_states * n_actions, n_states))
+    if not sparse:
+        transitions = transitions.toarray().reshape(n_states, n_actions, n_states)
+
+    return MDP(transitions, rewards, terminal, encoder)
@@ -0,0 +1,214 @@
+"""
+Planning module
+===============
+
+This module contains exact dynamic programming solvers for the MDP of a game board:
+    1. ``value_iteration``
+    2. ``policy_iteration``
+    3. ``modified_policy_iteration``
+
+All of them take an `mdp.MDP` built by `GameLogic.to_mdp` and work both with dense and sparse transition tensors.
+
+Typical usage example:
+
+    result = solve(logic, method='value_iteration', gamma=0.95)
+    optimal_values = result.V
+"""
+
+from collections import namedtuple
+from time import perf_counter
+
+import numpy as np
+
+__all__ = ('PlanningResult', 'value_iteration', 'policy_iteration', 'modified_policy_iteration', 'solve')
+
+# boards whose dense transition tensor (n_states ** 2 * n_actions values) would be larger are solved
+# with sparse transition matrices, 2 ** 20 float values take 8 MB
+DENSE_MAX_ELEMENTS = 2 ** 20
+
+PlanningResult = namedtuple('PlanningResult', ('V', 'Q', 'policy', 'iterations', 'converged', 'delta', 'time'))
+PlanningResult.__doc__ = """Result of a planning algorithm.
+
+Attributes:
+    V: Array of shape (n_states,) with state values.
+    Q: Array of shape (n_states, n_actions) with action values.
+    policy: Array of shape (n_states,) with greedy actions.
+    iterations: Number of made iterations.
+    converged: The tolerance was reached or not.
+    delta: Maximal change of values (or number of changed actions for policy iteration) on the last iteration.
+    time: Running time in seconds.
+"""
+
+
+def _is_sparse(matrix):
+    """Checks if the matrix is a SciPy sparse matrix. SciPy is imported only for sparse MDPs."""
+
+    return not isinstance(matrix, np.ndarray)
+
+
+def _q_values(mdp, values, gamma):
+    """Computes Q-values for given state values: Q = R + gamma * P V."""
+
+    n_states, n_actions = mdp.R.shape
+    if _is_sparse(mdp.P):
+        return mdp.R + gamma * (mdp.P @ values).reshape(n_states, n_actions)
+
+    return mdp.R + gamma * (mdp.P @ values)
+
+
+def _policy_tensors(mdp, policy):
+    """Returns transition matrix and rewards of the states under the deterministic policy."""
+
+    n_states, n_actions = mdp.R.shape
+    states = np.arange(n_states)
+    if _is_sparse(mdp.P):
+        transitions = mdp.P[states * n_actions + policy]
+    else:
+        transitions = mdp.P[states, policy]
+
+    return transitions, mdp.R[states, policy]
+
+
+def _evaluate_policy(mdp, policy, gamma):
+    """Solves the linear system (I - gamma * P_pi) V = R_pi for the state values of the policy."""
+
+    transitions, rewards = _policy_tensors(mdp, policy)
+    n_states = rewards.size
+    if _is_sparse(transitions):
+        # pylint: disable=C0415
+        from scipy import sparse as sp
+        from scipy.sparse import linalg as sp_linalg
+
+        return sp_linalg.spsolve((sp.identity(n_states, format='csc') - gamma * transitions).tocsc(), rewards)
+
+    return np.linalg.solve(np.eye(n_states) - gamma * transitions, rewards)
+
+
+def _result(mdp, values, gamma, iterations, converged, delta, start_time):
+    """Packs values into PlanningResult adding Q-values and greedy policy."""
+
+    q_values = _q_values(mdp, values, gamma)
+    return PlanningResult(values, q_values, q_values.argmax(axis=1), iterations, converged, delta,
+                          perf_counter() - start_time)
+
+
+def value_iteration(mdp, gamma=0.95, tol=1e-6, max_iter=10000, values=None):
+    """Implements value iteration.
+
+    Args:
+        mdp (MDP): MDP of the game.
+        gamma (float): Discount coefficient.
+        tol (float): Iterations stop when values change by less than `tol`.
+        max_iter (int): Maximum number of iterations.
+        values (np.array): Initial state values.
+
+    Returns:
+        PlanningResult: values, Q-values, policy and statistics.
+    """
+
+    start_time = perf_counter()
+    values = np.zeros(mdp.R.shape[0]) if values is None else np.asarray(values, dtype=float)
+
+    delta = np.inf
+    iteration = 0
+    while iteration < max_iter and delta >= tol:
+        new_values = _q_values(mdp, values, gamma).max(axis=1)
+        delta = np.abs(new_values - values).max()
+        values = new_values
+        iteration += 1
+
+    return _result(mdp, values, gamma, iteration, delta < tol, delta, start_time)
+
+
+def policy_iteration(mdp, gamma=0.95, max_iter=1000, policy=None):
+    """Implements policy iteration with exact policy evaluation.
+
+    Args:
+        mdp (MDP): MDP of the game.
+        gamma (float): Discount coefficient, must be less than 1.
+        max_iter (int): Maximum number of iterations.
+        policy (np.array): Initial policy.
+
+    Returns:
+        PlanningResult: values, Q-values, policy and statistics.
+    """
+
+    start_time = perf_counter()
+    policy = np.zeros(mdp.R.shape[0], dtype=int) if policy is None else np.asarray(policy)
+
+    changed = np.inf
+    iteration = 0
+    values = None
+    while iteration < max_iter and changed > 0:
+        values = _evaluate_policy(mdp, policy, gamma)
+        q_values = _q_values(mdp, values, gamma)
+
+        # keep the current action on ties not to cycle between equally good policies
+        new_policy = np.where(q_values[np.arange(policy.size), policy] >= q_values.max(axis=1) - 1e-12,
+                              policy, q_values.argmax(axis=1))
+        changed = np.count_nonzero(new_policy != policy)
+        policy = new_policy
+        iteration += 1
+
+    return _result(mdp, values, gamma, iteration, changed == 0, changed, start_time)
+
+
+# pylint: disable=R0913
+def modified_policy_iteration(mdp, gamma=0.95, tol=1e-6, max_iter=10000, n_evaluations=20, values=None):
+    """Implements modified policy iteration: the policy is evaluated approximately with a few Bellman backups.
+
+    Args:
+        mdp (MDP): MDP of the game.
+        gamma (float): Discount coefficient.
+        tol (float): Iterations stop when values change by less than `tol` during the greedy step.
+        max_iter (int): Maximum number of iterations.
+        n_evaluations (int): Number of backups of policy evaluation on every iteration.
+        values (np.array): Initial state values.
+
+    Returns:
+        PlanningResult: values, Q-values, policy and statistics.
+    """
+
+    start_time = perf_counter()
+    values = np.zeros(mdp.R.shape[0]) if values is None else np.asarray(values, dtype=float)
+
+    delta = np.inf
+    iteration = 0
+    while iteration < max_iter and delta >= tol:
+        q_values = _q_values(mdp, values, gamma)
+        new_values = q_values.max(axis=1)
+        delta = np.abs(new_values - values).max()
+        values = new_values
+
+        transitions, rewards = _policy_tensors(mdp, q_values.argmax(axis=1))
+        for _ in range(n_evaluations):
+            values = rewards + gamma * (transitions @ values)
+
+        iteration += 1
+
+    return _result(mdp, values, gamma, iteration, delta < tol, delta, start_time)
+
+
+def solve(logic, method='value_iteration', **kwargs):
+    """Builds the MDP of the game and solves it. Large boards are solved with sparse matrices.
+
+    Args:
+        logic: GameLogic object.
+        method (str): 'value_iteration', 'policy_iteration' or 'modified_policy_iteration'.
+        **kwargs: Parameters of the method.
+
+    Returns:
+        PlanningResult: values, Q-values, policy and statistics.
+    """
+
+    methods = {
+        'value_iteration': value_iteration,
+        'policy_iteration': policy_iteration,
+        'modified_policy_iteration': modified_policy_iteration
+    }
+    assert method in methods, f"Unknown planning method {method}"
+
+    # the size is checked before the transitions are built, a large dense tensor is never allocated
+    n_states = logic.state_encoder.n_states
+    mdp = logic.to_mdp(sparse=n_states ** 2 * logic.n_actions > DENSE_MAX_ELEMENTS)
+    return methods[method](mdp, **kwargs)
@@ -5,12 +5,84 @@ Q-learning module
 This module contains Q-learning in two forms:
     1. ``q_learning`` functional interface which is more flexible
     2. ``QLearning`` class interface which encapsulates environment and Q-values
+
+Q-values can be stored in a dense NumPy array or in ``SparseQTable`` for large state spaces.
+``q_learning_fast`` is a drop-in replacement of ``q_learning`` for long runs.
+``BatchedQLearning`` trains on many environments of `BatchedGameLogic` in lockstep.
 """
 
 import numpy as np
-from .. import settings
+from .. import config
+
+__all__ = ('QLearning', 'BatchedQLearning', 'SparseQTable', 'q_learning', 'q_learning_fast')
+
+
+def _random_functions(rng):
+    """Returns functions drawing uniform floats and integers from the generator or from the global NumPy state.
+
+    Args:
+        rng (np.random.Generator): Random generator or None.
+
+    Returns:
+        tuple: (random, integers) with signatures of `Generator.random` and `Generator.integers`.
+    """
+    if rng is None:
+        return np.random.random, np.random.randint
+    return rng.random, rng.integers
+
+
+class SparseQTable:
+    """
+    Q-table which stores Q-values only for the visited states in a hash table.
+    Suitable for huge state spaces, e.g. full states of the game, most of which are never visited.
+    Supports the same indexing as a NumPy array: ``q[s]``, ``q[s, :]``, ``q[s, a]``.
+    Not visited states have zero Q-values.
+    """
+
+    def __init__(self, n_states, n_actions):
+        """Constructs SparseQTable object.
 
-__all__ = ('QLearning', 'q_learning')
+        Args:
+            n_states (int): Number of states.
+            n_actions (int): Number of actions.
+        """
+        self.shape = (n_states, n_actions)
+        self._rows = {}
+        self._zeros = np.zeros(n_actions)
+        self._zeros.flags.writeable = False
+
+    @staticmethod
+    def _split_key(key):
+        if isinstance(key, tuple):
+            return key
+        return key, slice(None)
+
+    def __getitem__(self, key):
+        state, action = self._split_key(key)
+        return self._rows.get(state, self._zeros)[action]
+
+    def __setitem__(self, key, value):
+        state, action = self._split_key(key)
+        row = self._rows.get(state)
+        if row is None:
+            row = self._rows[state] = np.zeros(self.shape[1])
+        row[action] = value
+
+    def __len__(self):
+        """Number of stored states."""
+        return len(self._rows)
+
+    @property
+    def nbytes(self):
+        """Memory occupied by stored Q-values."""
+        return len(self._rows) * self._zeros.nbytes
+
+    def to_array(self):
+        """Converts the table to a dense array of shape (n_states, n_actions)."""
+        q_table = np.zeros(self.shape)
+        for state, row in self._rows.items():
+            q_table[state] = row
+        return q_table
 
 
 class QLearning:
@@ -19,15 +91,27 @@ class QLearning:
     more convenient interface.
     """
 
-    def __init__(self, env):
+    def __init__(self, env, sparse=False, rng=None, recorder=None):
         """Constructs QLearning object.
 
         Args:
             env: Environment to train on.
+            sparse (bool): Store Q-values in SparseQTable instead of a dense array.
+            rng (np.random.Generator): Random generator of exploration. The global NumPy state is used by default.
+            recorder (TrajectoryRecorder): Optional recorder of the transitions.
         """
         self.env = env
-        self.Q = np.zeros([self.env.n_states, self.env.n_actions])
+        self.sparse = sparse
+        self.rng = rng
+        self.recorder = recorder
+        self.Q = self._new_q_table(env)
         self.state = self.env.reset()
+        self.done = False
+
+    def _new_q_table(self, env):
+        if self.sparse:
+            return SparseQTable(env.n_states, env.n_actions)
+        return np.zeros([env.n_states, env.n_actions])
 
     def reset_q(self, env=None):
         """Resets Q-values and environment if needed.
@@ -36,8 +120,9 @@ class QLearning:
             env: New environment.
         """
         env = env or self.env
-        self.Q = np.zeros([env.n_states, env.n_actions])
+        self.Q = self._new_q_table(env)
         self.state = self.env.reset()
+        self.done = False
 
     def step(self, lr=0.1, gamma=0.95, eps=0.1):
         """Iterates one step of Q-learning.
@@ -50,19 +135,79 @@ class QLearning:
         Returns:
             tuple: (cumulative reward, done, info about states, actions and rewards)
         """
-        params = dict(lr=lr, gamma=gamma, eps=eps, n_steps=1)
-        r_all, self.Q, self.state, done, info = q_learning(self.env, self.state, q_table=self.Q, **params)
-        return r_all, done, info
+        params = dict(lr=lr, gamma=gamma, eps=eps, n_steps=1, rng=self.rng, recorder=self.recorder)
+        r_all, self.Q, self.state, self.done, info = q_learning(self.env, self.state, q_table=self.Q, **params)
+        return r_all, self.done, info
+
+    def run_steps(self, n_steps, lr=0.1, gamma=0.95, eps=0.1):
+        """Iterates `n_steps` steps of Q-learning, starting new episodes when they finish.
+
+        Unlike ``step`` it uses ``q_learning_fast`` and doesn't collect the info, so it is suitable
+        for many steps at once. The last episode may stay finished, like after ``step``.
+
+        Args:
+            n_steps (int): Number of steps.
+            lr (float): Learning rate.
+            gamma (float): Discount coefficient.
+            eps (float): Epsilon from eps-greedy.
+
+        Returns:
+            tuple: (number of made steps, number of finished episodes)
+        """
+        made = finished = 0
+        while made < n_steps:
+            if self.done:
+                self.reset()
+            made_now, self.done = self._run(n_steps - made, lr, gamma, eps)
+            made += made_now
+            finished += self.done
+
+        return made, finished
+
+    def run_episodes(self, n_episodes, max_steps=1000, lr=0.1, gamma=0.95, eps=0.1):
+        """Runs Q-learning for `n_episodes` chunks of at most `max_steps` steps.
+
+        A chunk ends when the episode finishes or after `max_steps` steps. An episode which is not
+        finished by then is continued by the next chunk, so fewer than `n_episodes` episodes may finish.
+
+        Args:
+            n_episodes (int): Number of chunks, each of them finishes at most one episode.
+            max_steps (int): Maximum number of steps per chunk.
+            lr (float): Learning rate.
+            gamma (float): Discount coefficient.
+            eps (float): Epsilon from eps-greedy.
+
+        Returns:
+            tuple: (number of made steps, number of finished episodes)
+        """
+        made = finished = 0
+        for _ in range(n_episodes):
+            if self.done:
+                self.reset()
+            made_now, self.done = self._run(max_steps, lr, gamma, eps)
+            made += made_now
+            finished += self.done
+
+        return made, finished
+
+    def _run(self, n_steps, lr, gamma, eps):
+        params = dict(lr=lr, gamma=gamma, eps=eps, rng=self.rng, recorder=self.recorder)
+        _, self.Q, self.state, done, info = q_learning_fast(self.env, self.state, n_steps, q_table=self.Q, **params)
+        return len(info['actions']), bool(done)
 
     def reset(self):
         """Resets environment to start new episode."""
+        if self.recorder is not None:
+            self.recorder.end_episode()
         self.state = self.env.reset()
+        self.done = False
 
     def get_q_values(self, state=None):
         """Returns all Q-values or for specific state.
 
         Args:
-            state: Optional state to take Q-values from.
+            state: Optional state to take Q-values from. A tuple is treated
+                as Scrat position, so it is only valid if the full state is turned off.
 
         Returns:
             np.array: Q-values for all states or for the given state.
@@ -87,24 +232,127 @@ class QLearning:
         return np.max(self.Q[state])
 
 
+class BatchedQLearning:
+    """
+    Implements Q-learning on a batch of environments stepped in lockstep,
+    e.g. `logic.batchedGameLogic.BatchedGameLogic`. Action selection and
+    TD updates are vectorized over the batch.
+
+    Every environment has its own Q-table (they are stacked into an array
+    of shape (n_envs, n_states, n_actions)), or all of them update one shared
+    Q-table of shape (n_states, n_actions). In the shared mode updates of the
+    same state-action pair made by several environments on one step are summed.
+    """
+
+    def __init__(self, env, shared=False, rng=None):
+        """Constructs BatchedQLearning object.
+
+        Args:
+            env: Batched environment to train on. Its `step` takes an array of actions
+                and returns arrays (states, rewards, dones, infos), finished environments
+                are reset automatically and `infos['final_states']` holds states before reset.
+            shared (bool): Use one Q-table for all environments.
+            rng (np.random.Generator): Random generator of exploration. The global NumPy state is used by default.
+        """
+        self.env = env
+        self.shared = shared
+        self.rng = rng
+        self.Q = self._new_q_table()
+        self.states = self.env.reset()
+        self._rows = np.arange(self.env.n_envs)
+
+    def _new_q_table(self):
+        if self.shared:
+            return np.zeros([self.env.n_states, self.env.n_actions])
+        return np.zeros([self.env.n_envs, self.env.n_states, self.env.n_actions])
+
+    def reset_q(self):
+        """Resets Q-values and environments."""
+        self.Q = self._new_q_table()
+        self.states = self.env.reset()
+
+    def reset(self):
+        """Resets environments to start new episodes."""
+        self.states = self.env.reset()
+
+    def _q_rows(self, states):
+        if self.shared:
+            return self.Q[states]
+        return self.Q[self._rows, states]
+
+    def step(self, lr=0.1, gamma=0.95, eps=0.1):
+        """Iterates one step of Q-learning in every environment.
+
+        Hyperparameters are either numbers or arrays of shape (n_envs,) with a value for every environment.
+
+        Args:
+            lr (float or np.array): Learning rate.
+            gamma (float or np.array): Discount coefficient.
+            eps (float or np.array): Epsilon from eps-greedy.
+
+        Returns:
+            tuple: (rewards, dones, infos) returned by the environment
+        """
+        n_envs, n_actions = self._rows.size, self.env.n_actions
+
+        # eps-greedy with random tie-breaking among the best actions
+        qvalues = self._q_rows(self.states)
+        best = qvalues >= qvalues.max(axis=1, keepdims=True) - config.MAX_FLOAT_DIFF
+        random, integers = _random_functions(self.rng)
+        greedy = np.where(best, random((n_envs, n_actions)), -1.).argmax(axis=1)
+        explore = random(n_envs) < eps
+        actions = np.where(explore, integers(n_actions, size=n_envs), greedy)
+
+        next_states, rewards, dones, infos = self.env.step(actions)
+
+        # finished environments are already reset, so the update uses their final states
+        final_states = infos.get('final_states', next_states)
+        target = rewards + gamma * self._q_rows(final_states).max(axis=1)
+        delta = lr * (target - qvalues[self._rows, actions])
+
+        if self.shared:
+            np.add.at(self.Q, (self.states, actions), delta)
+        else:
+            self.Q[self._rows, self.states, actions] += delta
+
+        self.states = next_states
+        return rewards, dones, infos
+
+    def get_q_values(self, env_id=None):
+        """Returns Q-values of all environments or of one of them.
+
+        Args:
+            env_id: Optional number of environment. Ignored for the shared Q-table.
+
+        Returns:
+            np.array: Q-values.
+        """
+        if self.shared or env_id is None:
+            return self.Q
+        return self.Q[env_id]
+
+
 # pylint: disable=R0913,R0914
-def q_learning(env, s, n_steps, q_table=None, lr=0.1, gamma=0.95, eps=0.5):
+def q_learning(env, s, n_steps, q_table=None, lr=0.1, gamma=0.95, eps=0.5, rng=None, recorder=None):
     """Implements Q-learning.
 
     Args:
         env: Environment to train on.
         s: Initial state.
         n_steps (int): Maximum number of steps.
-        q_table (np.array): Initial Q-values.
+        q_table (np.array or SparseQTable): Initial Q-values.
         lr (float): Learning rate.
         gamma (float): Discount coefficient.
         eps (float): Epsilon from eps-greedy.
+        rng (np.random.Generator): Random generator of exploration. The global NumPy state is used by default.
+        recorder (TrajectoryRecorder): Optional recorder of the transitions.
 
     Returns:
         tuple: (Cumulative reward, new Q-values, last state, done, info about rewards, actions, states)
     """
     if q_table is None:
         q_table = np.zeros([env.n_states, env.n_actions])
+    rng = np.random if rng is None else rng
 
     info = {
         'rewards': [],
@@ -116,12 +364,12 @@ def q_learning(env, s, n_steps, q_table=None, lr=0.1, gamma=0.95, eps=0.5):
     done = False
 
     for _ in range(n_steps):
-        if np.random.rand() < eps:
-            a = np.random.choice(env.n_actions)
+        if rng.random() < eps:
+            a = rng.choice(env.n_actions)
         else:
             qvalues = q_table[s, :]
             value = max(qvalues)
-            a = np.random.choice(np.where(np.abs(qvalues - value) < settings.MAX_FLOAT_DIFF)[0])
+            a = rng.choice(np.where(np.abs(qvalues - value) < config.MAX_FLOAT_DIFF)[0])
         s1, r, done, _ = env.step(a)
         q_table[s, a] = q_table[s, a] + lr * (r + gamma * np.max(q_table[s1, :]) - q_table[s, a])
 
@@ -135,4 +383,96 @@ def q_learning(env, s, n_steps, q_table=None, lr=0.1, gamma=0.95, eps=0.5):
         if done:
             break
 
+    if recorder is not None:
+        recorder.record_steps(info['states'], info['actions'], info['rewards'], done)
+
+    return r_all, q_table, s, done, info
+
+
+# pylint: disable=R0913,R0914
+def q_learning_fast(env, s, n_steps, q_table=None, lr=0.1, gamma=0.95, eps=0.5, block_size=1024, rng=None,
+                    recorder=None):
+    """Implements Q-learning with less NumPy overhead per step than ``q_learning``.
+
+    Exploration decisions, random actions and tie-breaking numbers are drawn in blocks which grow
+    from 16 up to `block_size` steps (so short episodes don't waste random numbers), greedy actions
+    are chosen on Python lists and the info is written to preallocated arrays.
+    The algorithm is the same as in ``q_learning``.
+
+    Args:
+        env: Environment to train on.
+        s: Initial state.
+        n_steps (int): Maximum number of steps.
+        q_table (np.array or SparseQTable): Initial Q-values.
+        lr (float): Learning rate.
+        gamma (float): Discount coefficient.
+        eps (float): Epsilon from eps-greedy.
+        block_size (int): Number of steps to draw random numbers for at once.
+        rng (np.random.Generator): Random generator of exploration. The global NumPy state is used by default.
+        recorder (TrajectoryRecorder): Optional recorder of the transitions.
+
+    Returns:
+        tuple: (Cumulative reward, new Q-values, last state, done, info about rewards, actions, states)
+        where info contains NumPy arrays instead of lists.
+    """
+    if q_table is None:
+        q_table = np.zeros([env.n_states, env.n_actions])
+
+    n_actions = env.n_actions
+    max_float_diff = config.MAX_FLOAT_DIFF
+    random, integers = _random_functions(rng)
+
+    states = np.empty(n_steps + 1, dtype=int)
+    actions = np.empty(n_steps, dtype=int)
+    rewards = np.empty(n_steps)
+    states[0] = s
+
+    r_all = 0.
+    done = False
+    n_made = 0
+    explore = random_actions = tie_breaks = None
+    size = j = 0
+    block = min(16, block_size)
+
+    for step in range(n_steps):
+        if j == size:
+            size = min(block, n_steps - step)
+            block = min(2 * block, block_size)
+            j = 0
+            explore = (random(size) < eps).tolist()
+            random_actions = integers(n_actions, size=size).tolist()
+            tie_breaks = random(size).tolist()
+
+        if explore[j]:
+            a = random_actions[j]
+        else:
+            qvalues = q_table[s].tolist()
+            value = max(qvalues)
+            best = [action for action, q in enumerate(qvalues) if value - q < max_float_diff]
+            a = best[int(tie_breaks[j] * len(best))]
+
+        s1, r, done, _ = env.step(a)
+        q_sa = q_table[s, a]
+        q_table[s, a] = q_sa + lr * (r + gamma * max(q_table[s1].tolist()) - q_sa)
+
+        states[step + 1] = s1
+        actions[step] = a
+        rewards[step] = r
+        n_made += 1
+        j += 1
+
+        r_all += r
+        s = s1
+
+        if done:
+            break
+
+    info = {
+        'rewards': rewards[:n_made],
+        'actions': actions[:n_made],
+        'states': states[:n_made + 1]
+    }
+    if recorder is not None:
+        recorder.record_steps(info['states'], info['actions'], info['rewards'], done)
+
     return r_all, q_table, s, done, info
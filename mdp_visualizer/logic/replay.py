@@ -0,0 +1,173 @@
+"""
+Replay module
+=============
+
+This module replays transitions recorded by `trajectory.TrajectoryRecorder` on a GameLogic object.
+
+The board is rebuilt from the saved game parameters and every position of the replay is set directly
+from the recorded states, so seeking to any step is instant and doesn't depend on the length of the run.
+Values of the cells are taken from the last Q-values snapshot saved at or before the position.
+
+Typical usage example:
+
+    replay = Replay(Trajectories('runs/automatic'))
+    replay.seek(500000)
+    replay.advance(100)  # frame skipping
+    logic, values = replay.logic, replay.cell_values()
+"""
+
+from copy import deepcopy
+
+import numpy as np
+
+from .gameLogic import GameLogic
+
+__all__ = ('Replay',)
+
+
+class Replay:
+    """Deterministic cursor over recorded transitions.
+
+    The position is the number of replayed transitions: position 0 shows the first recorded state,
+    position ``i > 0`` shows the state after transition ``i - 1``.
+    """
+
+    def __init__(self, trajectories, params=None):
+        """Constructs Replay object.
+
+        Args:
+            trajectories (Trajectories): Recorded transitions.
+            params (GameParams): Game parameters of the recorded board. By default they are loaded
+                from the trajectories directory.
+        """
+
+        params = trajectories.params if params is None else params
+        if params is None:
+            raise ValueError("game parameters weren't saved with the trajectories")
+
+        self._trajectories = trajectories
+        self._logic = GameLogic(deepcopy(params))
+        self._n_steps = len(trajectories)
+        self._position = 0
+        self._transition = None
+        self._episode = None
+        self._snapshot_step, self._q_values = None, None
+
+        self.seek(0)
+
+    @property
+    def logic(self):
+        """GameLogic object showing the state at the current position."""
+
+        return self._logic
+
+    @property
+    def trajectories(self):
+        """Replayed Trajectories."""
+
+        return self._trajectories
+
+    @property
+    def n_steps(self):
+        """Number of recorded transitions, the last position of the replay."""
+
+        return self._n_steps
+
+    @property
+    def position(self):
+        """Number of replayed transitions."""
+
+        return self._position
+
+    @property
+    def transition(self):
+        """The last replayed transition (a dict column name -> value) or None at position 0."""
+
+        return self._transition
+
+    @property
+    def episode(self):
+        """Number of the episode of the shown state or None if nothing is recorded."""
+
+        return self._episode
+
+    @property
+    def finished(self):
+        """All transitions are replayed."""
+
+        return self._position >= self._n_steps
+
+    @property
+    def snapshot_step(self):
+        """Step of the current Q-values snapshot or None."""
+
+        return self._snapshot_step
+
+    @property
+    def q_values(self):
+        """Q-values of the current snapshot or None if there is no snapshot before the position."""
+
+        return self._q_values
+
+    def seek(self, position):
+        """Moves the replay to the position and puts the objects to the recorded state.
+
+        Args:
+            position (int): Number of replayed transitions, it is clipped to [0, n_steps].
+
+        Returns:
+            int: new position.
+        """
+
+        self._position = position = min(max(int(position), 0), self._n_steps)
+        if not self._n_steps:
+            return position
+
+        if position == 0:
+            self._transition = None
+            first = self._trajectories.transition(0)
+            state, self._episode = first['state'], first['episode']
+        else:
+            self._transition = self._trajectories.transition(position - 1)
+            state, self._episode = self._transition['next_state'], self._transition['episode']
+        self._logic.set_state(state)
+
+        # snapshots are memory-mapped only when the position passes to another one
+        if self._trajectories.snapshot_step(position) != self._snapshot_step:
+            self._snapshot_step, self._q_values = self._trajectories.q_snapshot(position)
+
+        return position
+
+    def advance(self, n_steps=1):
+        """Moves the replay by `n_steps` transitions, backwards if it is negative.
+
+        Args:
+            n_steps (int): Number of transitions, steps > 1 skip frames.
+
+        Returns:
+            int: new position.
+        """
+
+        return self.seek(self._position + n_steps)
+
+    def cell_values(self):
+        """Returns values (maximum Q-values) of the states with Scrat in every cell and the other objects as they are.
+
+        Returns:
+            np.array: Array of shape (width * height,) indexed by ``y * width + x`` or None if there is no snapshot.
+        """
+
+        if self._q_values is None:
+            return None
+
+        logic = self._logic
+        width, height = logic.game_size
+        cells = np.arange(width * height)
+        if logic.start_params.full_state:
+            encoder = logic.state_encoder
+            _, hippo, watermelon, carrying, fed = encoder.decode(logic.state)
+            states = encoder.encode(cells, hippo, watermelon, carrying, fed)
+        else:
+            states = cells
+
+        return np.asarray(self._q_values[states]).max(axis=1)
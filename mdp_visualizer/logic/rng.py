@@ -0,0 +1,71 @@
+"""
+RNG module
+==========
+
+This module creates `numpy.random.Generator` streams of the game and of the learning algorithms.
+Independent child streams for parallel or batched runs are spawned from one seed with `numpy.random.SeedSequence`.
+
+Typical usage example:
+
+    board_rng, train_rng = spawn_rngs(seed, 2)
+    logic = GameLogic(params, rng=board_rng)
+    q_learning(logic, logic.reset(), n_steps, rng=train_rng)
+"""
+
+from random import getrandbits
+
+import numpy as np
+
+__all__ = ('spawn_rngs', 'UniformBuffer')
+
+
+def spawn_rngs(seed, n):
+    """Returns `n` independent random generators derived from the seed.
+
+    Args:
+        seed: None, int, SeedSequence or Generator. A Generator is advanced to draw the root seed.
+        n (int): Number of generators.
+
+    Returns:
+        list: np.random.Generator objects.
+    """
+
+    if isinstance(seed, np.random.Generator):
+        seed = int(seed.integers(2 ** 63))
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(getrandbits(64) if seed is None else seed)
+
+    return [np.random.default_rng(child) for child in seed.spawn(n)]
+
+
+class UniformBuffer:
+    """Draws uniform numbers from [0, 1) one by one, but takes them from a generator in blocks.
+
+    A call of `random` is as cheap as `random.random`, while the numbers come from a seedable Generator.
+    """
+
+    __slots__ = ('_rng', '_block_size', '_values', '_index')
+
+    def __init__(self, rng, block_size=1024):
+        """Constructs UniformBuffer object.
+
+        Args:
+            rng (np.random.Generator): Source of random numbers.
+            block_size (int): Number of values drawn at once.
+        """
+
+        self._rng = rng
+        self._block_size = block_size
+        self._values = []
+        self._index = 0
+
+    def random(self):
+        """Returns the next uniform number from [0, 1)."""
+
+        if self._index == len(self._values):
+            self._values = self._rng.random(self._block_size).tolist()
+            self._index = 0
+
+        value = self._values[self._index]
+        self._index += 1
+        return value
@@ -0,0 +1,158 @@
+"""
+Shared Q-table module
+=====================
+
+This module contains a Q-table stored in shared memory, so a trainer running in another process can
+publish Q-values and the GUI can read them without pickling or copying the table every frame.
+
+The table is guarded by a sequence lock. The writer makes the sequence number odd, writes Q-values
+in place and makes it even again. A reader runs its function on the shared array (e.g. takes maximums
+over the actions) and repeats it if the sequence number was odd or has changed meanwhile, so it always
+gets a consistent result. Readers never block the writer.
+
+Typical usage example:
+
+    table = SharedQTable((n_states, n_actions))            # GUI process, owns the memory
+    other = SharedQTable((n_states, n_actions), table.name)  # trainer process
+    other.publish(q_table, state=state, episode=episode, steps=steps)
+    ...
+    if table.version != shown_version:
+        snapshot = table.read(lambda q: q.max(axis=1))
+    table.close()
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+__all__ = ('TableSnapshot', 'SharedQTable')
+
+TableSnapshot = namedtuple('TableSnapshot', ('version', 'state', 'episode', 'steps', 'result'))
+TableSnapshot.__doc__ = """Consistent snapshot of SharedQTable.
+
+Attributes:
+    version: Number of publications.
+    state: Published state of the trainer, -1 if nothing is published.
+    episode: Published number of finished episodes.
+    steps: Published number of made steps.
+    result: Result of the reader's function of the table.
+"""
+
+# header: sequence number, state, episode, steps
+_HEADER = 4
+_SEQUENCE, _STATE, _EPISODE, _STEPS = range(_HEADER)
+
+
+class SharedQTable:
+    """Q-table in shared memory guarded by a sequence lock.
+
+    There must be only one writer at a time, the number of readers is unlimited.
+    """
+
+    def __init__(self, shape, name=None):
+        """Constructs SharedQTable object.
+
+        Args:
+            shape (tuple): Shape of the table (n_states, n_actions).
+            name (str): Name of an existing table to attach to. A new table is created by default,
+                its creator frees the memory on `close`.
+        """
+
+        # shared_memory is imported only when it's needed, it is not available in Python 3.7
+        # pylint: disable=C0415
+        from multiprocessing import shared_memory
+
+        self._shape = tuple(shape)
+        size = np.dtype(np.int64).itemsize * _HEADER + np.dtype(float).itemsize * int(np.prod(self._shape))
+        self._owner = name is None
+        self._memory = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+
+        self._header = np.ndarray(_HEADER, dtype=np.int64, buffer=self._memory.buf)
+        self._table = np.ndarray(self._shape, dtype=float, buffer=self._memory.buf, offset=self._header.nbytes)
+        if self._owner:
+            self._header[:] = 0
+            self._header[_STATE] = -1
+            self._table[:] = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def name(self):
+        """Name of the shared memory, used to attach to the table from another process."""
+
+        return self._memory.name
+
+    @property
+    def shape(self):
+        """Shape of the table."""
+
+        return self._shape
+
+    @property
+    def version(self):
+        """Number of publications. It is cheap to check, so readers can skip unchanged tables."""
+
+        return int(self._header[_SEQUENCE]) // 2
+
+    def publish(self, q_table, state=-1, episode=0, steps=0):
+        """Writes Q-values and progress of the training in place.
+
+        Args:
+            q_table (np.array): Q-values of shape `shape`.
+            state (int): Current state of the trainer.
+            episode (int): Number of finished episodes.
+            steps (int): Number of made steps.
+        """
+
+        header = self._header
+        header[_SEQUENCE] += 1
+        self._table[...] = q_table
+        header[_STATE], header[_EPISODE], header[_STEPS] = state, episode, steps
+        header[_SEQUENCE] += 1
+
+    def read(self, function=None):
+        """Reads a consistent snapshot.
+
+        Args:
+            function (callable): Function of the shared array which computes the needed result
+                without keeping references to the array. By default the table is copied.
+
+        Returns:
+            TableSnapshot: Published progress with the result of the function.
+        """
+
+        if function is None:
+            function = np.copy
+
+        header = self._header
+        while True:
+            sequence = int(header[_SEQUENCE])
+            if sequence % 2:
+                continue
+
+            result = function(self._table)
+            state, episode, steps = int(header[_STATE]), int(header[_EPISODE]), int(header[_STEPS])
+            if int(header[_SEQUENCE]) == sequence:
+                return TableSnapshot(sequence // 2, state, episode, steps, result)
+
+    def q_values(self, state):
+        """Returns a copy of Q-values of one state."""
+
+        return self.read(lambda table: table[state].copy()).result
+
+    def close(self):
+        """Detaches from the memory. The creator of the table also frees it."""
+
+        if self._memory is None:
+            return
+
+        # the arrays must be released before the memory is closed
+        self._header = self._table = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+        self._memory = None
@@ -0,0 +1,146 @@
+"""
+State Encoder module
+====================
+
+This module contains StateEncoder class which packs all dynamic components of the game state into one integer.
+
+Typical usage example:
+
+    encoder = StateEncoder.from_logic(logic)
+    state = encoder.encode_logic(logic)
+    scrat, hippo, watermelon, carrying, fed = encoder.decode(state)
+"""
+
+__all__ = ('StateEncoder',)
+
+
+class StateEncoder:
+    """Mixed-radix encoder of the game state.
+
+    Components of the state from the least significant one are: Scrat cell, Hippo cell, Watermelon cell,
+    Scrat is carrying the Watermelon, Hippo is fed. Cells are encoded as ``y * width + x``.
+    Components of the absent objects are omitted, so for a board without Hippo and Watermelon
+    the state is just the encoded Scrat position.
+
+    `encode` and `decode` accept both scalars and NumPy arrays.
+    """
+
+    def __init__(self, game_size, has_hippo=False, has_watermelon=False):
+        """Constructs StateEncoder object.
+
+        Args:
+            game_size: A tuple with game size (width, height).
+            has_hippo: Hippo is present on the board or not.
+            has_watermelon: Watermelon is present on the board or not.
+        """
+
+        self._width, self._height = game_size
+        self._has_hippo = has_hippo
+        self._has_watermelon = has_watermelon
+        self._has_fed = has_hippo and has_watermelon
+
+        n_cells = self._width * self._height
+        self._radices = [n_cells] + [n_cells] * has_hippo + [n_cells] * has_watermelon + \
+            [2] * has_watermelon + [2] * self._has_fed
+        self._n_states = 1
+        for radix in self._radices:
+            self._n_states *= radix
+
+    @classmethod
+    def from_logic(cls, logic):
+        """Constructs StateEncoder for the objects present in GameLogic object.
+
+        Args:
+            logic: GameLogic object.
+        """
+
+        return cls(logic.game_size, logic.hippo is not None, logic.watermelon is not None)
+
+    @property
+    def n_states(self):
+        """Number of encoded states."""
+
+        return self._n_states
+
+    @property
+    def radices(self):
+        """A tuple with numbers of values of every component, from the least significant one."""
+
+        return tuple(self._radices)
+
+    def cell(self, position):
+        """Encodes (x, y) position as a cell number."""
+
+        return position[1] * self._width + position[0]
+
+    def position(self, cell):
+        """Decodes a cell number to (x, y) position."""
+
+        return cell % self._width, cell // self._width
+
+    # pylint: disable=R0913
+    def encode(self, scrat, hippo=None, watermelon=None, carrying=False, fed=False):
+        """Packs state components into one integer.
+
+        Args:
+            scrat: Scrat cell.
+            hippo: Hippo cell. Ignored if there is no Hippo.
+            watermelon: Watermelon cell. Ignored if there is no Watermelon.
+            carrying: Scrat is carrying the Watermelon or not. Ignored if there is no Watermelon.
+            fed: Hippo is fed or not. Ignored if there is no Hippo or no Watermelon.
+
+        Returns:
+            Encoded state.
+        """
+
+        digits = [scrat]
+        if self._has_hippo:
+            digits.append(hippo)
+        if self._has_watermelon:
+            digits.append(watermelon)
+            digits.append(carrying * 1)
+        if self._has_fed:
+            digits.append(fed * 1)
+
+        state = 0
+        for digit, radix in zip(reversed(digits), reversed(self._radices)):
+            state = state * radix + digit
+
+        return state
+
+    def decode(self, state):
+        """Unpacks state into components.
+
+        Args:
+            state: Encoded state.
+
+        Returns:
+            A tuple (scrat, hippo, watermelon, carrying, fed) with None for the absent components.
+        """
+
+        digits = []
+        for radix in self._radices:
+            digits.append(state % radix)
+            state = state // radix
+
+        scrat = digits.pop(0)
+        hippo = digits.pop(0) if self._has_hippo else None
+        watermelon = digits.pop(0) if self._has_watermelon else None
+        carrying = digits.pop(0) == 1 if self._has_watermelon else None
+        fed = digits.pop(0) == 1 if self._has_fed else None
+
+        return scrat, hippo, watermelon, carrying, fed
+
+    def encode_logic(self, logic):
+        """Encodes the current state of GameLogic object.
+
+        Args:
+            logic: GameLogic object.
+        """
+
+        hippo = self.cell(logic.hippo_position) if self._has_hippo else None
+        watermelon = self.cell(logic.watermelon_position) if self._has_watermelon else None
+
+        return self.encode(self.cell(logic.scrat_position), hippo, watermelon,
+                           self._has_watermelon and logic.scrat_carrying_watermelon,
+                           self._has_fed and logic.hippo_is_fed)
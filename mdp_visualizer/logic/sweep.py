@@ -0,0 +1,174 @@
+"""
+Sweep module
+============
+
+This module runs Q-learning for many hyperparameter settings and random boards in parallel processes.
+Every configuration is trained in a separate task of `concurrent.futures.ProcessPoolExecutor`,
+results are yielded as soon as they are finished and can be saved into one compressed ``.npz`` file.
+
+Runs are reproducible: the board of a configuration is generated with the seed derived from
+(`seed`, board number), so all hyperparameters are compared on the same boards, and training
+uses the seed derived from (`seed`, configuration number). Results don't depend on the number
+of workers or the order in which tasks are finished.
+
+Typical usage example:
+
+    configs = make_grid(lr=[0.1, 0.5], gamma=[0.9, 0.99], eps=[0.1], n_boards=4)
+    for result in iter_sweep(params, configs, n_episodes=100):
+        print(result.config, result.returns.mean())
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
+from itertools import product
+
+import numpy as np
+
+from .gameLogic import GameLogic
+from .q_learning import q_learning_fast
+
+__all__ = ('SweepConfig', 'SweepResult', 'make_grid', 'iter_sweep', 'run_sweep', 'save_results', 'load_results')
+
+SweepConfig = namedtuple('SweepConfig', ('lr', 'gamma', 'eps', 'board'))
+SweepConfig.__doc__ = """Hyperparameters of one Q-learning run.
+
+Attributes:
+    lr: Learning rate.
+    gamma: Discount coefficient.
+    eps: Epsilon from eps-greedy.
+    board: Number of the random board.
+"""
+
+SweepResult = namedtuple('SweepResult', ('index', 'config', 'returns', 'q_table'))
+SweepResult.__doc__ = """Result of one Q-learning run.
+
+Attributes:
+    index: Number of the configuration in the sweep.
+    config: SweepConfig of the run.
+    returns: Array of shape (n_episodes,) with cumulative rewards of episodes.
+    q_table: Final Q-values.
+"""
+
+# streams of board generation and training are separated by the first spawn key
+_BOARD_STREAM, _TRAIN_STREAM = 0, 1
+
+
+def _stream(seed, *keys):
+    """Returns the random generator of the stream with the given spawn keys."""
+
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=keys))
+
+
+def make_grid(lr=(0.1,), gamma=(0.95,), eps=(0.5,), n_boards=1):
+    """Returns all combinations of the given hyperparameters for every board.
+
+    Args:
+        lr: Learning rates.
+        gamma: Discount coefficients.
+        eps: Epsilons from eps-greedy.
+        n_boards (int): Number of random boards.
+
+    Returns:
+        list: SweepConfig objects.
+    """
+
+    return [SweepConfig(*values) for values in product(lr, gamma, eps, range(n_boards))]
+
+
+# pylint: disable=R0913
+def _run_config(params, index, config, n_episodes, max_steps, seed):
+    """Trains Q-learning for one configuration. Executed in a worker process."""
+
+    logic = GameLogic(deepcopy(params), rng=_stream(seed, _BOARD_STREAM, config.board))
+    rng = _stream(seed, _TRAIN_STREAM, index)
+    q_table = np.zeros([logic.n_states, logic.n_actions])
+    returns = np.empty(n_episodes)
+    for episode in range(n_episodes):
+        returns[episode], q_table, _, _, _ = q_learning_fast(
+            logic, logic.reset(), max_steps, q_table, config.lr, config.gamma, config.eps, rng=rng)
+
+    return SweepResult(index, config, returns, q_table)
+
+
+# pylint: disable=R0913
+def iter_sweep(params, configs, n_episodes=100, max_steps=1000, seed=0, n_workers=None):
+    """Runs Q-learning for every configuration in a pool of processes.
+
+    Args:
+        params (GameParams): Game settings. Random values are sampled for every board.
+        configs: SweepConfig objects, e.g. returned by `make_grid`.
+        n_episodes (int): Number of training episodes.
+        max_steps (int): Maximum number of steps in an episode.
+        seed (int): Seed of the whole sweep.
+        n_workers (int): Number of processes. All CPUs are used by default.
+
+    Yields:
+        SweepResult: results in the order of completion.
+    """
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [executor.submit(_run_config, params, index, config, n_episodes, max_steps, seed)
+                   for index, config in enumerate(configs)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+# pylint: disable=R0913
+def run_sweep(params, configs, n_episodes=100, max_steps=1000, seed=0, n_workers=None, path=None):
+    """Runs Q-learning for every configuration and collects the results.
+
+    Args:
+        params (GameParams): Game settings. Random values are sampled for every board.
+        configs: SweepConfig objects, e.g. returned by `make_grid`.
+        n_episodes (int): Number of training episodes.
+        max_steps (int): Maximum number of steps in an episode.
+        seed (int): Seed of the whole sweep.
+        n_workers (int): Number of processes. All CPUs are used by default.
+        path (str): Optional file to save the results with `save_results`.
+
+    Returns:
+        list: SweepResult objects in the order of `configs`.
+    """
+
+    results = sorted(iter_sweep(params, configs, n_episodes, max_steps, seed, n_workers),
+                     key=lambda result: result.index)
+    if path is not None:
+        save_results(path, results)
+
+    return results
+
+
+def save_results(path, results):
+    """Saves sweep results into a compressed ``.npz`` file.
+
+    The file contains arrays `lr`, `gamma`, `eps`, `board` of shape (n_configs,), `returns` of shape
+    (n_configs, n_episodes) and `q_tables` of shape (n_configs, n_states, n_actions) stored as float32.
+
+    Args:
+        path (str): File name.
+        results: SweepResult objects.
+    """
+
+    configs = np.array([result.config for result in results])
+    np.savez_compressed(path,
+                        lr=configs[:, 0], gamma=configs[:, 1], eps=configs[:, 2],
+                        board=configs[:, 3].astype(int),
+                        returns=np.stack([result.returns for result in results]),
+                        q_tables=np.stack([result.q_table for result in results]).astype(np.float32))
+
+
+def load_results(path):
+    """Loads sweep results saved by `save_results`.
+
+    Args:
+        path (str): File name.
+
+    Returns:
+        list: SweepResult objects.
+    """
+
+    with np.load(path) as data:
+        return [SweepResult(index, SweepConfig(float(lr), float(gamma), float(eps), int(board)), returns, q_table)
+                for index, (lr, gamma, eps, board, returns, q_table) in enumerate(
+                    zip(data['lr'], data['gamma'], data['eps'], data['board'], data['returns'], data['q_tables']))]
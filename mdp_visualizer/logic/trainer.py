@@ -0,0 +1,405 @@
+"""
+Trainer module
+==============
+
+This module runs Q-learning in the background, so training speed doesn't depend on the GUI.
+
+`BackgroundTrainer` trains on its own copy of the board as fast as possible. It publishes a copy of
+Q-values and the current state at most every `publish_interval` seconds and reports finished episodes
+through a bounded thread-safe queue. The GUI samples the latest snapshot at its display rate.
+
+`ProcessTrainer` has the same interface, but trains in a separate process, so it doesn't share the GIL
+with the GUI. Q-values are published in place into a `shared_q_table.SharedQTable`, readers compute
+what they need (e.g. values of the cells) directly on the shared memory without copying the table.
+`make_trainer` returns it where shared memory is available and falls back to `BackgroundTrainer`.
+
+Typical usage example:
+
+    trainer = BackgroundTrainer(logic.start_params, q_table, lr=0.1, gamma=0.95, eps=0.1)
+    trainer.start()
+    ...
+    snapshot = trainer.latest()  # e.g. in a QTimer callback
+    events = trainer.events()
+    ...
+    q_table = trainer.stop()
+"""
+
+import multiprocessing
+import threading
+from collections import namedtuple
+from copy import deepcopy
+from queue import Queue, Empty, Full
+from time import perf_counter
+
+import numpy as np
+
+from .gameLogic import GameLogic
+from .q_learning import q_learning_fast
+from .rng import spawn_rngs
+from .shared_q_table import SharedQTable
+
+__all__ = ('TrainerSnapshot', 'EpisodeEvent', 'BackgroundTrainer', 'ProcessTrainer', 'make_trainer')
+
+TrainerSnapshot = namedtuple('TrainerSnapshot', ('version', 'episode', 'steps', 'state', 'q_table'))
+TrainerSnapshot.__doc__ = """Published state of the trainer.
+
+Attributes:
+    version: Number of the snapshot, it grows with every publication.
+    episode: Number of finished episodes.
+    steps: Number of made steps.
+    state: The last state of the training board.
+    q_table: A copy of Q-values which belongs to the reader.
+"""
+
+EpisodeEvent = namedtuple('EpisodeEvent', ('episode', 'reward', 'steps', 'done'))
+EpisodeEvent.__doc__ = """Finished episode.
+
+Attributes:
+    episode: Number of the episode from 1.
+    reward: Cumulative reward.
+    steps: Number of steps.
+    done: The episode reached a terminal state, otherwise it was truncated.
+"""
+
+TrainingSettings = namedtuple('TrainingSettings', ('lr', 'gamma', 'eps', 'max_steps', 'publish_interval',
+                                                   'max_episodes'))
+
+
+def _report(events, event):
+    """Puts the event into the queue, dropping the oldest one if it is full."""
+
+    while True:
+        try:
+            events.put_nowait(event)
+            return
+        except Full:
+            try:
+                events.get_nowait()
+            except Empty:
+                pass
+
+
+# pylint: disable=R0913
+def _train(logic, q_table, episode, steps, training, rng, stop_event, publish, events):
+    """Runs episodes until the stop event is set or `max_episodes` episodes are finished.
+
+    Args:
+        publish (callable): Function of (q_table, state, episode, steps) called at most every `publish_interval`
+            seconds and after the last episode.
+        events (Queue): Queue of EpisodeEvents.
+
+    Returns:
+        tuple: (Q-values, number of finished episodes, number of made steps)
+    """
+
+    last_publish = perf_counter()
+    state = logic.state
+
+    while not stop_event.is_set():
+        if training.max_episodes is not None and episode >= training.max_episodes:
+            break
+
+        reward, q_table, state, done, info = q_learning_fast(
+            logic, logic.reset(), training.max_steps, q_table, training.lr, training.gamma, training.eps, rng=rng)
+        episode += 1
+        steps += len(info['actions'])
+        _report(events, EpisodeEvent(episode, reward, len(info['actions']), bool(done)))
+
+        if perf_counter() - last_publish >= training.publish_interval:
+            publish(q_table, state, episode, steps)
+            last_publish = perf_counter()
+
+    publish(q_table, state, episode, steps)
+    return q_table, episode, steps
+
+
+def _train_process(logic, table_name, training, rng, stop_event, events):
+    """Entry point of ProcessTrainer's process. It continues from the Q-values and progress in the shared table."""
+
+    # events are dropped anyway when they aren't read, unread events mustn't block the exit of the process
+    events.cancel_join_thread()
+
+    table = SharedQTable((logic.n_states, logic.n_actions), table_name)
+    try:
+        snapshot = table.read()
+        _train(logic, snapshot.result, snapshot.episode, snapshot.steps, training, rng, stop_event, table.publish, events)
+    finally:
+        table.close()
+
+
+# pylint: disable=R0902
+class BackgroundTrainer:
+    """Runs episodes of ``q_learning_fast`` in a daemon thread.
+
+    The Q-table is only touched by the thread while it is running, readers get copies of it.
+    """
+
+    # pylint: disable=R0913
+    def __init__(self, params, q_table=None, lr=0.1, gamma=0.95, eps=0.1, max_steps=1000,
+                 publish_interval=0.05, max_episodes=None, max_events=1000, rng=None):
+        """Constructs BackgroundTrainer object.
+
+        Args:
+            params (GameParams): Game settings. They are copied, so params of a running game keep its board.
+            q_table (np.array): Initial Q-values, they are copied. Zeros by default.
+            lr (float): Learning rate.
+            gamma (float): Discount coefficient.
+            eps (float): Epsilon from eps-greedy.
+            max_steps (int): Maximum number of steps in an episode.
+            publish_interval (float): Minimal time between snapshots in seconds.
+            max_episodes (int): The thread stops after this number of episodes. Unlimited by default.
+            max_events (int): Size of the queue of episode events, the oldest events are dropped when it is full.
+            rng (np.random.Generator): Random generator, streams of the board and of exploration are spawned from it.
+        """
+
+        board_rng, self._rng = spawn_rngs(rng, 2)
+        self._logic = GameLogic(deepcopy(params), rng=board_rng)
+        if q_table is None:
+            q_table = np.zeros([self._logic.n_states, self._logic.n_actions])
+        self._q_table = np.array(q_table, dtype=float)
+
+        self._training = TrainingSettings(lr, gamma, eps, max_steps, publish_interval, max_episodes)
+
+        self._episode = 0
+        self._steps = 0
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._events = Queue(max_events)
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self._publish(self._q_table, self._logic.reset(), 0, 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _publish(self, q_table, state, episode, steps):
+        """Publishes a copy of Q-values."""
+
+        version = 0 if self._snapshot is None else self._snapshot.version + 1
+        snapshot = TrainerSnapshot(version, episode, steps, state, q_table.copy())
+        with self._lock:
+            self._snapshot = snapshot
+
+    def _run(self):
+        self._q_table, self._episode, self._steps = _train(
+            self._logic, self._q_table, self._episode, self._steps, self._training, self._rng, self._stop_event,
+            self._publish, self._events)
+
+    def start(self):
+        """Starts training in the background thread. Does nothing if it is running."""
+
+        if self.running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='BackgroundTrainer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops training after the current episode and waits for the thread.
+
+        Returns:
+            np.array: Trained Q-values.
+        """
+
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+        return self._q_table
+
+    def join(self, timeout=None):
+        """Waits until the thread stops, e.g. after `max_episodes` episodes."""
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self):
+        """Stops training. It is the same as `stop`, for compatibility with ProcessTrainer."""
+
+        self.stop()
+
+    @property
+    def running(self):
+        """The training thread is running."""
+
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def logic(self):
+        """GameLogic of the training board. It must not be used while the trainer is running."""
+
+        return self._logic
+
+    @property
+    def version(self):
+        """Version of the latest snapshot, it is cheap to check before reading."""
+
+        with self._lock:
+            return self._snapshot.version
+
+    def latest(self, function=None):
+        """Returns the latest TrainerSnapshot.
+
+        Args:
+            function (callable): Function of the Q-table whose result is returned as `q_table`,
+                e.g. ``lambda q: q.max(axis=1)``. By default the table is copied.
+        """
+
+        with self._lock:
+            snapshot = self._snapshot
+
+        if function is None:
+            return snapshot
+        return snapshot._replace(q_table=function(snapshot.q_table))
+
+    def q_values(self, state):
+        """Returns a copy of the latest Q-values of one state."""
+
+        return self.latest(lambda q_table: q_table[state].copy()).q_table
+
+    def events(self):
+        """Returns all EpisodeEvents reported since the previous call."""
+
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except Empty:
+                return events
+
+
+# pylint: disable=R0902
+class ProcessTrainer:
+    """Runs episodes of ``q_learning_fast`` in a separate process.
+
+    Q-values are exchanged through a SharedQTable owned by this object, so it must be closed
+    to free the shared memory.
+    """
+
+    # pylint: disable=R0913
+    def __init__(self, params, q_table=None, lr=0.1, gamma=0.95, eps=0.1, max_steps=1000,
+                 publish_interval=0.05, max_episodes=None, max_events=1000, rng=None):
+        """Constructs ProcessTrainer object. Arguments are the same as BackgroundTrainer's ones."""
+
+        board_rng, self._rng = spawn_rngs(rng, 2)
+        self._logic = GameLogic(deepcopy(params), rng=board_rng)
+        self._training = TrainingSettings(lr, gamma, eps, max_steps, publish_interval, max_episodes)
+
+        # the table is created first, it raises ImportError where shared memory is not available
+        self._table = SharedQTable((self._logic.n_states, self._logic.n_actions))
+        self._table.publish(0. if q_table is None else q_table, self._logic.reset())
+
+        # the process is spawned, Qt of the parent process mustn't be forked
+        self._context = multiprocessing.get_context('spawn')
+        self._events = self._context.Queue(max_events)
+        self._stop_event = self._context.Event()
+        self._process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        """Starts training in the background process. Does nothing if it is running."""
+
+        if self.running:
+            return
+
+        self._stop_event.clear()
+        self._process = self._context.Process(
+            target=_train_process, name='ProcessTrainer', daemon=True,
+            args=(self._logic, self._table.name, self._training, self._rng, self._stop_event, self._events))
+        self._process.start()
+
+    def stop(self):
+        """Stops training after the current episode and waits for the process.
+
+        Returns:
+            np.array: A copy of trained Q-values.
+        """
+
+        if self._process is not None:
+            self._stop_event.set()
+            self._process.join()
+            self._process = None
+
+        return self._table.read().result
+
+    def join(self, timeout=None):
+        """Waits until the process stops, e.g. after `max_episodes` episodes."""
+
+        if self._process is not None:
+            self._process.join(timeout)
+
+    def close(self):
+        """Stops training and frees the shared memory."""
+
+        if self._table is not None:
+            self.stop()
+            self._table.close()
+            self._table = None
+
+    @property
+    def running(self):
+        """The training process is running."""
+
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def table(self):
+        """SharedQTable with the latest Q-values."""
+
+        return self._table
+
+    @property
+    def version(self):
+        """Version of the latest snapshot, it is cheap to check before reading."""
+
+        return self._table.version
+
+    def latest(self, function=None):
+        """Returns the latest TrainerSnapshot.
+
+        Args:
+            function (callable): Function of the shared Q-table whose result is returned as `q_table`,
+                e.g. ``lambda q: q.max(axis=1)``. By default the table is copied.
+        """
+
+        snapshot = self._table.read(function)
+        return TrainerSnapshot(snapshot.version, snapshot.episode, snapshot.steps, snapshot.state, snapshot.result)
+
+    def q_values(self, state):
+        """Returns a copy of the latest Q-values of one state."""
+
+        return self._table.q_values(state)
+
+    def events(self):
+        """Returns all EpisodeEvents reported since the previous call."""
+
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except Empty:
+                return events
+
+
+def make_trainer(params, q_table=None, **kwargs):
+    """Returns ProcessTrainer or BackgroundTrainer if shared memory is not available (Python 3.7).
+
+    Arguments are the same as BackgroundTrainer's ones.
+    """
+
+    try:
+        return ProcessTrainer(params, q_table, **kwargs)
+    except ImportError:
+        return BackgroundTrainer(params, q_table, **kwargs)
@@ -0,0 +1,419 @@
+"""
+Trajectory module
+=================
+
+This module records transitions (state, action, reward, next state, done, episode) of game runs on disk.
+
+`TrajectoryRecorder` appends transitions to preallocated typed NumPy columns and writes every full chunk
+as a segment of ``.npy`` files (one file per column), so millions of steps are logged with constant memory.
+`Trajectories` loads the segments as memory maps without reading them into memory.
+Game parameters of the board and snapshots of Q-values can be saved next to the segments to replay the run,
+see `replay.Replay`.
+
+Typical usage example:
+
+    with TrajectoryRecorder('runs/automatic') as recorder:
+        recorder.save_params(logic.start_params)
+        for _ in range(n_episodes):
+            q_learning_fast(logic, logic.reset(), max_steps, q_table, recorder=recorder)
+            recorder.end_episode()
+            recorder.save_q_snapshot(q_table)
+
+    trajectories = Trajectories('runs/automatic')
+    rewards = trajectories['reward']
+    first = trajectories.episode(0)
+"""
+
+import json
+import os
+from glob import glob
+
+import numpy as np
+
+from .actions_objects_list import Modes
+from .gameLogic import GameParams
+
+__all__ = ('COLUMNS', 'TrajectoryRecorder', 'Trajectories')
+
+# names and types of the columns
+COLUMNS = (
+    ('episode', np.int64),
+    ('state', np.int64),
+    ('action', np.int16),
+    ('reward', np.float64),
+    ('next_state', np.int64),
+    ('done', np.bool_),
+)
+
+_SEGMENT_PATTERN = 'segment_{:06d}.{}.npy'
+_SNAPSHOT_PATTERN = 'q_{:012d}.npy'
+_PARAMS_FILE = 'params.json'
+
+# params which are positions or lists of positions
+_POSITION_PARAMS = ('scrat_start_position', 'hippo_start_position', 'watermelon_start_position')
+_CELLS_PARAMS = ('lava_cells', 'green_cells', 'terminal_cells')
+
+
+def _segment_path(directory, index, column):
+    return os.path.join(directory, _SEGMENT_PATTERN.format(index, column))
+
+
+def _segment_indices(directory):
+    """Returns sorted numbers of the segments saved in the directory."""
+
+    paths = glob(os.path.join(directory, 'segment_*.episode.npy'))
+    return sorted(int(os.path.basename(path)[len('segment_'):].split('.')[0]) for path in paths)
+
+
+def _snapshot_steps(directory):
+    """Returns sorted steps of the Q-values snapshots saved in the directory."""
+
+    paths = glob(os.path.join(directory, 'q_*.npy'))
+    return sorted(int(os.path.basename(path)[len('q_'):].split('.')[0]) for path in paths)
+
+
+def _params_to_dict(params):
+    """Converts GameParams with the sampled cells and start positions to a JSON-compatible dict."""
+
+    values = {name: value for name, value in vars(params).items() if not name.startswith('_')}
+    values['game_mode'] = params.game_mode.name
+    # cells of terminal lava and green cells are added to the terminal cells by GameLogic again
+    values['terminal_cells'] = list(params.initial_terminal_cells)
+    if not isinstance(values['seed'], int):
+        values['seed'] = None
+
+    return values
+
+
+def _params_from_dict(values):
+    """Builds GameParams from a dict made by `_params_to_dict`."""
+
+    values = dict(values, game_mode=Modes[values['game_mode']])
+    for name in _POSITION_PARAMS:
+        if values[name] is not None:
+            values[name] = tuple(values[name])
+    for name in _CELLS_PARAMS:
+        values[name] = [tuple(cell) for cell in values[name]]
+
+    return GameParams(**values)
+
+
+class TrajectoryRecorder:
+    """Records transitions into chunks of typed columns and saves full chunks as ``.npy`` segments.
+
+    Episode numbers grow by one after a transition with ``done`` or a call of `end_episode`.
+    Recording into a directory with saved segments continues their numbering from a new episode.
+    """
+
+    def __init__(self, directory, chunk_size=65536):
+        """Constructs TrajectoryRecorder object.
+
+        Args:
+            directory (str): Directory of the segments. It is created if it doesn't exist.
+            chunk_size (int): Number of transitions in a segment.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._directory = directory
+        self._chunk_size = chunk_size
+        self._columns = {name: np.empty(chunk_size, dtype=dtype) for name, dtype in COLUMNS}
+        self._size = 0
+
+        indices = _segment_indices(directory)
+        self._segment = indices[-1] + 1 if indices else 0
+        self._n_saved = 0
+        self._episode = 0
+        self._step_offset = 0
+        if indices:
+            self._episode = int(np.load(_segment_path(directory, indices[-1], 'episode'), mmap_mode='r')[-1]) + 1
+            self._step_offset = sum(len(np.load(_segment_path(directory, index, 'episode'), mmap_mode='r'))
+                                    for index in indices)
+        self._episode_steps = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # pylint: disable=R0913
+    def record(self, state, action, reward, next_state, done):
+        """Appends one transition."""
+
+        if self._size == self._chunk_size:
+            self.flush()
+
+        i = self._size
+        columns = self._columns
+        columns['episode'][i] = self._episode
+        columns['state'][i] = state
+        columns['action'][i] = action
+        columns['reward'][i] = reward
+        columns['next_state'][i] = next_state
+        columns['done'][i] = done
+        self._size += 1
+
+        self._episode_steps += 1
+        if done:
+            self.end_episode()
+
+    def record_steps(self, states, actions, rewards, done=False):
+        """Appends consecutive transitions of one episode, e.g. from the info of ``q_learning``.
+
+        Args:
+            states: States of length ``n + 1``, `states[i + 1]` is the state after `actions[i]`.
+            actions: Actions of length ``n``.
+            rewards: Rewards of length ``n``.
+            done (bool): The last transition finishes the episode.
+        """
+
+        states = np.asarray(states)
+        n_steps = len(actions)
+        start = 0
+        while start < n_steps:
+            if self._size == self._chunk_size:
+                self.flush()
+
+            count = min(n_steps - start, self._chunk_size - self._size)
+            chunk = slice(self._size, self._size + count)
+            steps = slice(start, start + count)
+            columns = self._columns
+            columns['episode'][chunk] = self._episode
+            columns['state'][chunk] = states[start:start + count]
+            columns['action'][chunk] = actions[steps]
+            columns['reward'][chunk] = rewards[steps]
+            columns['next_state'][chunk] = states[start + 1:start + count + 1]
+            columns['done'][chunk] = False
+
+            self._size += count
+            start += count
+
+        self._episode_steps += n_steps
+        if done and n_steps:
+            self._columns['done'][self._size - 1] = True
+            self.end_episode()
+
+    def end_episode(self):
+        """Finishes the current episode, e.g. after it is truncated. Does nothing if it has no transitions."""
+
+        if self._episode_steps:
+            self._episode += 1
+            self._episode_steps = 0
+
+    def flush(self):
+        """Saves the recorded transitions as a new segment."""
+
+        if not self._size:
+            return
+
+        for name, values in self._columns.items():
+            np.save(_segment_path(self._directory, self._segment, name), values[:self._size])
+
+        self._segment += 1
+        self._n_saved += self._size
+        self._size = 0
+
+    def close(self):
+        """Saves the recorded transitions."""
+
+        self.flush()
+
+    def save_params(self, params):
+        """Saves game parameters of the recorded board, so it can be rebuilt for a replay.
+
+        Args:
+            params (GameParams): Start parameters of the game, e.g. `GameLogic.start_params`,
+                with the sampled cells and start positions.
+        """
+
+        with open(os.path.join(self._directory, _PARAMS_FILE), 'w', encoding='utf-8') as params_file:
+            json.dump(_params_to_dict(params), params_file, default=lambda value: value.item())
+
+    def save_q_snapshot(self, q_table):
+        """Saves a snapshot of Q-values after all transitions recorded so far.
+
+        Args:
+            q_table (np.array or SparseQTable): Q-values.
+        """
+
+        to_array = getattr(q_table, 'to_array', None)
+        np.save(os.path.join(self._directory, _SNAPSHOT_PATTERN.format(self.step)),
+                np.asarray(q_table) if to_array is None else to_array())
+
+    @property
+    def directory(self):
+        """Directory of the segments."""
+
+        return self._directory
+
+    @property
+    def n_steps(self):
+        """Number of transitions recorded by this object."""
+
+        return self._n_saved + self._size
+
+    @property
+    def step(self):
+        """Number of transitions in the directory including the segments saved before this object was created."""
+
+        return self._step_offset + self.n_steps
+
+    @property
+    def episode(self):
+        """Number of the current episode."""
+
+        return self._episode
+
+
+class Trajectories:
+    """Transitions saved by `TrajectoryRecorder`.
+
+    Segments are memory-mapped read-only, so loading is fast and doesn't depend on the number of steps.
+    A column of one segment and an episode inside one segment are returned without copying.
+    """
+
+    def __init__(self, directory):
+        """Constructs Trajectories object.
+
+        Args:
+            directory (str): Directory of the segments.
+        """
+
+        self._directory = directory
+        self._segments = [
+            {name: np.load(_segment_path(directory, index, name), mmap_mode='r') for name, _ in COLUMNS}
+            for index in _segment_indices(directory)
+        ]
+        self._starts = np.cumsum([0] + [len(segment['episode']) for segment in self._segments])
+        self._snapshot_steps = np.array(_snapshot_steps(directory), dtype=np.int64)
+
+        # episode numbers grow, so the first and the last episode of every segment locate episodes
+        self._first_episodes = np.array([segment['episode'][0] for segment in self._segments], dtype=np.int64)
+        self._last_episodes = np.array([segment['episode'][-1] for segment in self._segments], dtype=np.int64)
+
+    def __len__(self):
+        return int(self._starts[-1])
+
+    def __getitem__(self, column):
+        """Returns the column of all transitions."""
+
+        if len(self._segments) == 1:
+            return self._segments[0][column]
+        if not self._segments:
+            return np.empty(0, dtype=dict(COLUMNS)[column])
+
+        return np.concatenate([segment[column] for segment in self._segments])
+
+    @property
+    def segments(self):
+        """List of dicts column name -> memory-mapped array."""
+
+        return self._segments
+
+    @property
+    def params(self):
+        """GameParams of the recorded board or None if they weren't saved."""
+
+        path = os.path.join(self._directory, _PARAMS_FILE)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, encoding='utf-8') as params_file:
+            return _params_from_dict(json.load(params_file))
+
+    @property
+    def snapshot_steps(self):
+        """Sorted array of steps of the saved Q-values snapshots."""
+
+        return self._snapshot_steps
+
+    def snapshot_step(self, step):
+        """Returns the step of the last snapshot of Q-values saved at or before the step or None."""
+
+        i = np.searchsorted(self._snapshot_steps, step, side='right') - 1
+        return int(self._snapshot_steps[i]) if i >= 0 else None
+
+    def q_snapshot(self, step):
+        """Returns the last snapshot of Q-values saved at or before the step.
+
+        Args:
+            step (int): Number of transitions.
+
+        Returns:
+            tuple: (step of the snapshot, memory-mapped Q-values) or (None, None) if there is no such snapshot.
+        """
+
+        snapshot_step = self.snapshot_step(step)
+        if snapshot_step is None:
+            return None, None
+
+        return snapshot_step, np.load(os.path.join(self._directory, _SNAPSHOT_PATTERN.format(snapshot_step)),
+                                      mmap_mode='r')
+
+    def transition(self, step):
+        """Returns the transition with the number.
+
+        Args:
+            step (int): Number of the transition from 0.
+
+        Returns:
+            dict: column name -> value.
+        """
+
+        if not 0 <= step < len(self):
+            raise IndexError(step)
+
+        i = np.searchsorted(self._starts, step, side='right') - 1
+        segment = self._segments[i]
+        step -= self._starts[i]
+        return {name: values[step].item() for name, values in segment.items()}
+
+    @property
+    def n_episodes(self):
+        """Number of episodes."""
+
+        if not self._segments:
+            return 0
+        return int(self._last_episodes[-1] - self._first_episodes[0]) + 1
+
+    @property
+    def episode_ids(self):
+        """Numbers of the saved episodes."""
+
+        if not self._segments:
+            return range(0)
+        return range(int(self._first_episodes[0]), int(self._last_episodes[-1]) + 1)
+
+    def episode(self, episode_id):
+        """Returns the transitions of the episode.
+
+        Args:
+            episode_id (int): Number of the episode.
+
+        Returns:
+            dict: column name -> array.
+        """
+
+        first = np.searchsorted(self._last_episodes, episode_id, side='left')
+        last = np.searchsorted(self._first_episodes, episode_id, side='right')
+
+        parts = []
+        for segment in self._segments[first:last]:
+            episodes = segment['episode']
+            start = np.searchsorted(episodes, episode_id, side='left')
+            stop = np.searchsorted(episodes, episode_id, side='right')
+            parts.append({name: values[start:stop] for name, values in segment.items()})
+
+        if not parts:
+            raise KeyError(episode_id)
+        if len(parts) == 1:
+            return parts[0]
+
+        return {name: np.concatenate([part[name] for part in parts]) for name, _ in COLUMNS}
+
+    def iter_episodes(self):
+        """Yields (episode number, transitions) of all episodes."""
+
+        for episode_id in self.episode_ids:
+            yield episode_id, self.episode(episode_id)
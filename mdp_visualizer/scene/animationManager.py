@@ -0,0 +1,93 @@
+"""
+Animation Manager module
+========================
+
+This module contains a pool of animations which are reused instead of creating a new animation
+for every move. An animation of a property is retargeted in place: it is stopped and started again
+from the current value of the property to the new end value.
+"""
+
+from PyQt5.QtCore import QEasingCurve, QParallelAnimationGroup, QPropertyAnimation
+
+__all__ = ('AnimationManager',)
+
+
+class AnimationManager:
+    """Keeps one animation per (item, property) and one group per (item, properties).
+
+    A property animated in a group mustn't be animated by `animate`, the group controls its animation.
+    """
+
+    def __init__(self):
+        self._animations = {}
+        self._groups = {}
+
+    def __len__(self):
+        """Number of animations in the pool."""
+
+        return len(self._animations)
+
+    def _animation(self, obj, prop):
+        key = obj, prop
+        anim = self._animations.get(key)
+        if anim is None:
+            anim = QPropertyAnimation(obj, prop.encode())
+            anim.setEasingCurve(QEasingCurve.InQuad)
+            self._animations[key] = anim
+        return anim
+
+    def animate(self, obj, prop, time, val):
+        """
+        Starts animation of some QProperty for some QObject obj from its current value
+
+        Args:
+          obj: QObject
+          prop: name of property, str
+          time: time of animation, int
+          val: target value of property
+
+        Returns: QPropertyAnimation
+        """
+        anim = self._animation(obj, prop)
+        anim.stop()
+        anim.setDuration(time)
+        anim.setEndValue(val)
+        anim.start()
+
+        return anim
+
+    def animate_group(self, obj, time, **values):
+        """
+        Starts parallel animations of several QProperties for some QObject obj
+
+        Args:
+          obj: QObject
+          time: time of animation, int
+          values: target values of properties by their names
+
+        Returns: QParallelAnimationGroup
+        """
+        props = tuple(sorted(values))
+        group = self._groups.get((obj, props))
+        if group is None:
+            group = QParallelAnimationGroup()
+            for prop in props:
+                group.addAnimation(self._animation(obj, prop))
+            self._groups[obj, props] = group
+
+        group.stop()
+        for prop in props:
+            anim = self._animations[obj, prop]
+            anim.setDuration(time)
+            anim.setEndValue(values[prop])
+        group.start()
+
+        return group
+
+    def stop(self):
+        """Stops all animations."""
+
+        for group in self._groups.values():
+            group.stop()
+        for anim in self._animations.values():
+            anim.stop()
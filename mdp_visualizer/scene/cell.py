@@ -1,15 +1,45 @@
 """Cell module"""
 
-from PyQt5.QtCore import pyqtSignal, Qt, QPointF, QTimer
+from functools import lru_cache
+
+from PyQt5.QtCore import pyqtSignal, Qt, QPointF
 from PyQt5.QtGui import QColor, QPixmap
 
 from .. import settings
-from ..utils import animate, value_update
+from ..utils import animate, ramp_index
 
 from .roundRectItem import RoundRectItem
+from .tweenClock import tween_clock
 from ..logic.actions_objects_list import Modes
 
 
+@lru_cache(maxsize=1)
+def _color_ramp(min_reward, max_reward, size):
+    """
+    Returns colours of cells for values from min_reward to max_reward: red, yellow in the middle, green.
+    It is computed again only when the bounds change.
+    """
+    mid = (min_reward + max_reward) / 2
+    ramp = []
+    for i in range(size):
+        value = min_reward + (max_reward - min_reward) * i / (size - 1)
+        if value < mid:
+            c = (value - min_reward) / (mid - min_reward)
+            color2 = settings.RED_CELL
+        else:
+            c = (max_reward - value) / (max_reward - mid)
+            color2 = settings.GREEN_CELL
+
+        ramp.append(QColor(
+            int(c * settings.YELLOW_CELL.red() + (1 - c) * color2.red()),
+            int(c * settings.YELLOW_CELL.green() + (1 - c) * color2.green()),
+            int(c * settings.YELLOW_CELL.blue() + (1 - c) * color2.blue()),
+            int(c * settings.YELLOW_CELL.alpha() + (1 - c) * color2.alpha())
+        ))
+
+    return tuple(ramp)
+
+
 class Cell(RoundRectItem):
     """
     One cell of game field graphic visualization.
@@ -29,8 +59,6 @@ class Cell(RoundRectItem):
 
         if self.logic.game_mode == Modes.AUTOMATICRL:
             self.value = logic.game_board.cell_reward((self.x, self.y))
-            self._timer = QTimer()
-            self._timer.timeout.connect(self._update_value)
         else:
             self.value = None
         super().__init__(settings.ICON_RECT, self._compute_color(), parent=pad)
@@ -60,24 +88,12 @@ class Cell(RoundRectItem):
             self.update()
 
     def _compute_color(self):
-        if self.value:
-            mid = (settings.MIN_REWARD + settings.MAX_REWARD) / 2  # TODO: logic gameboard ref
-            if self.value < mid:
-                c = (self.value - settings.MIN_REWARD) / (mid - settings.MIN_REWARD)
-                color2 = settings.RED_CELL
-            else:
-                c = (settings.MAX_REWARD - self.value) / (settings.MAX_REWARD - mid)
-                color2 = settings.GREEN_CELL
-        else:
-            c = 1
-            color2 = settings.RED_CELL  # not important because c = 1
+        # TODO: logic gameboard ref
+        ramp = _color_ramp(settings.MIN_REWARD, settings.MAX_REWARD, settings.COLOR_RAMP_SIZE)
+        if not self.value:
+            return ramp[len(ramp) // 2]  # yellow
 
-        return QColor(
-            c * settings.YELLOW_CELL.red() + (1 - c) * color2.red(),
-            c * settings.YELLOW_CELL.green() + (1 - c) * color2.green(),
-            c * settings.YELLOW_CELL.blue() + (1 - c) * color2.blue(),
-            c * settings.YELLOW_CELL.alpha() + (1 - c) * color2.alpha()
-        )
+        return ramp[ramp_index(self.value, settings.MIN_REWARD, settings.MAX_REWARD, len(ramp))]
 
     def paint(self, painter, option, widget):
         """
@@ -121,15 +137,10 @@ class Cell(RoundRectItem):
         Args:
           new_value: float
         """
-        self._target_value = new_value
-        self._timer.start(settings.VALUE_UPDATE_TIME)
-
-    def _update_value(self):
-        self.value, stop_timer = value_update(self.value, self._target_value)
-        if stop_timer:
-            self._timer.stop()
+        tween_clock().start(self, self.value, new_value, self._show_value, item=self)
 
-        self.update()
+    def _show_value(self, value):
+        self.value = value
 
     def posForLocation(self, column: int, row: int):
         """
@@ -0,0 +1,94 @@
+"""
+Frame Time Overlay module
+=========================
+
+This module contains the overlay of the game screen which shows how often and how long the screen is
+painted and which part of it is repainted per frame. It is used to compare the repainting of dirty
+regions with the repainting of the full viewport on large boards.
+
+Typical usage example:
+
+    overlay = FrameTimeOverlay(view.viewport())
+    overlay.setVisible(True)
+    ...
+    overlay.record(paint_time, area)   # in paintEvent of the view
+"""
+
+from time import perf_counter
+
+from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtWidgets import QLabel
+
+from .. import settings
+from ..utils import frame_statistics
+
+__all__ = ('FrameTimeOverlay',)
+
+
+class FrameTimeOverlay(QLabel):
+    """
+    Label in the corner of the viewport which shows statistics of the frames every `FRAME_STATS_TIME` ms
+    while it is visible.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.mode = ''
+        self._paint_times = []
+        self._areas = []
+        self._start = perf_counter()
+
+        # the label is opaque, so its own updates don't repaint the viewport below it
+        palette = self.palette()
+        palette.setColor(QPalette.Window, QColor(30, 30, 30))
+        palette.setColor(QPalette.WindowText, Qt.white)
+        self.setPalette(palette)
+        self.setAutoFillBackground(True)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setMargin(4)
+        self.move(4, 4)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(settings.FRAME_STATS_TIME)
+        self._timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def setVisible(self, visible):
+        """Starts collecting the statistics when the overlay is shown. Overrides the base class method."""
+
+        super().setVisible(visible)
+        if visible:
+            self._reset()
+            self.refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _reset(self):
+        self._paint_times.clear()
+        self._areas.clear()
+        self._start = perf_counter()
+
+    def record(self, paint_time: float, area: float):
+        """
+        Adds a painted frame to the statistics
+
+        Args:
+          paint_time: duration of painting, in ms
+          area: repainted part of the view, from 0 to 1
+        """
+        if self.isVisible():
+            self._paint_times.append(paint_time)
+            self._areas.append(area)
+
+    def refresh(self):
+        """Shows the statistics of the frames painted since the last refresh."""
+
+        elapsed = 1000 * (perf_counter() - self._start)
+        fps, mean_time, max_time, area = frame_statistics(self._paint_times, self._areas, elapsed)
+        self.setText(settings.FRAME_TIME_STATUS.format(fps=fps, mean_time=mean_time, max_time=max_time,
+                                                       area=area, mode=self.mode))
+        self.adjustSize()
+        self._reset()
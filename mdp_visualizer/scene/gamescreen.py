@@ -3,15 +3,23 @@ Game Screen module
 =================
 
 This module contains implementation of game screen with the graphical scene on it.
+
+The screen repaints only the dirty regions of the changed items, a tween of a cell repaints only the cell.
+Press F to show the frame time overlay and U to switch to repainting of the full viewport to compare.
 """
 
-from PyQt5.QtCore import Qt
+from time import perf_counter
+
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QPainter
 from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene
+import numpy as np
 
+from .. import settings
 from .pad import FlippablePad
 from .objectPicture import ObjectPicture
 from .splash import SplashItem
+from .frameTimeOverlay import FrameTimeOverlay
 
 
 class GameScreen(QGraphicsView):
@@ -24,6 +32,14 @@ class GameScreen(QGraphicsView):
         objects_pictures: A list of ObjectPictures of game objects.
     """
 
+    key_pressed = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._full_update = False
+        self._frame_overlay = FrameTimeOverlay(self.viewport())
+
     def _init_with_logic(self, logic):
         """Initializes the screen with game board and objects from the new logic.
 
@@ -58,7 +74,7 @@ class GameScreen(QGraphicsView):
         # general flags
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self._set_update_mode()
         self.setCacheMode(QGraphicsView.CacheBackground)
         self.setRenderHints(QPainter.Antialiasing |
                             QPainter.SmoothPixmapTransform | QPainter.TextAntialiasing)
@@ -80,6 +96,30 @@ class GameScreen(QGraphicsView):
 
         self.pad.set_cell_value(column, row, value)
 
+    def set_cells_values(self, values, previous=None):
+        """Sets values of states to the cells. Terminal cells show their rewards.
+
+        Args:
+          values: An array with a value for every cell indexed by ``row * width + column``.
+          previous: Values which are shown now. If they are given, only the changed values are set.
+        """
+
+        width, height = self.logic.game_size
+        if previous is not None:
+            terminal = set(self.logic.terminal_cells)
+            for cell in np.flatnonzero(values != previous).tolist():
+                position = cell % width, cell // width
+                if position not in terminal:
+                    self.pad.set_cell_value(position[0], position[1], values[cell])
+            return
+
+        for i in range(width):
+            for j in range(height):
+                self.pad.set_cell_value(i, j, values[j * width + i])
+
+        for pos in self.logic.terminal_cells:
+            self.pad.set_cell_value(pos[0], pos[1], self.logic.game_board.cell_reward(pos))
+
     def change_logic(self, logic):
         """Changes the logic of the visualized game.
 
@@ -104,14 +144,64 @@ class GameScreen(QGraphicsView):
         """Rotate the pad and animate the objects during rotation."""
 
         self.pad.rotate()
+        self.pad.rot.finished.connect(self._rotation_finished)
+        self._set_update_mode()
         for obj in self.objects_pictures:
             obj.pad_rotated()
 
+    def _rotation_finished(self):
+        """Returns to repainting of the dirty regions after the rotation."""
+
+        self._set_update_mode()
+        self.viewport().update()
+
+    def _set_update_mode(self):
+        """Sets repainting of the full viewport or of the dirty regions.
+
+        The full viewport is also repainted while the pad rotates: the perspective transform of the pad
+        changes its whole projection on every step, and its tracked dirty regions may miss its edges.
+        """
+
+        if self._full_update or self.pad.rotating:
+            self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+            self._frame_overlay.mode = settings.VIEWPORT_UPDATE_FULL
+        else:
+            # the dirty rectangles are merged into their bounding rectangle when there are too many of them
+            self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+            self._frame_overlay.mode = settings.VIEWPORT_UPDATE_DIRTY
+
+    def paintEvent(self, event):
+        """Paints the dirty region and measures the frame time. Overrides the base class method."""
+
+        if not self._frame_overlay.isVisible():
+            super().paintEvent(event)
+            return
+
+        start = perf_counter()
+        super().paintEvent(event)
+        paint_time = 1000 * (perf_counter() - start)
+
+        viewport = self.viewport().rect()
+        area = sum(rect.width() * rect.height() for rect in event.region().rects())
+        self._frame_overlay.record(paint_time, area / max(viewport.width() * viewport.height(), 1))
+
     def keyPressEvent(self, event):
-        """Rotate the pad if T key is pressed. Overrides the base class method. See base class method."""
+        """Rotate the pad if T key is pressed, show the frame time overlay if F key is pressed,
+        switch between repainting of the dirty regions and of the full viewport if U key is pressed,
+        otherwise emit key_pressed signal with the key.
+        Overrides the base class method. See base class method."""
 
-        if event.nativeVirtualKey() == Qt.Key_T:
+        key = event.nativeVirtualKey()
+        if key == Qt.Key_T:
             self._make_rotated()
+        elif key == settings.FRAME_TIME_KEY:
+            self._frame_overlay.setVisible(not self._frame_overlay.isVisible())
+        elif key == settings.FULL_UPDATE_KEY:
+            self._full_update = not self._full_update
+            self._set_update_mode()
+            self.viewport().update()
+        else:
+            self.key_pressed.emit(key)
 
     def resizeEvent(self, event):
         """Resizes the screen. Overrides the base class method."""
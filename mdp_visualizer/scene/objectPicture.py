@@ -8,11 +8,11 @@ This module contains frontend implementations of game objects like Scrat, Hippo
 from math import cos, pi
 
 from PyQt5.QtCore import QRectF, Qt
-from PyQt5.QtGui import QPixmap, QTransform
+from PyQt5.QtGui import QTransform
 
 from .. import settings
-from ..utils import animate
 
+from .animationManager import AnimationManager
 from .roundRectItem import RoundRectItem
 from ..logic.gameObject import Scrat, Hippo, Watermelon
 
@@ -43,6 +43,8 @@ class ObjectPicture:
         self._obj = obj
         self.pad = pad
         self._logic = logic
+        # one animation per picture and property is reused by all moves
+        self._animations = AnimationManager()
         pos = self.pad.cellAt(self.x, self.y).pos()
 
         # selection underneath the cells!
@@ -63,49 +65,49 @@ class ObjectPicture:
 
         # pic2 = None
         if isinstance(obj, Scrat):
-            self.active_pic.setPixmap(QPixmap(settings.SCRAT_IMAGE))
+            self.active_pic.setPixmap(settings.SCRAT_IMAGE)
 
             # 1 -- near watermelon
             pic2 = RoundRectItem(QRectF(-50, -50, 100, 100))
             pic2.setOpacity(0)
             pic2.setZValue(self.y)
             pic2.setPos(pos)
-            pic2.setPixmap(QPixmap(settings.SCRAT_AND_WATERMELON_IMAGE))
+            pic2.setPixmap(settings.SCRAT_AND_WATERMELON_IMAGE)
 
             # 2 -- with watermelon
             pic3 = RoundRectItem(QRectF(-50, -50, 100, 100))
             pic3.setOpacity(0)
             pic3.setZValue(self.y)
             pic3.setPos(pos)
-            pic3.setPixmap(QPixmap(settings.SCRAT_WITH_WATERMELON_IMAGE))
+            pic3.setPixmap(settings.SCRAT_WITH_WATERMELON_IMAGE)
 
             # 3 -- near hippo without watermelon
             pic4 = RoundRectItem(QRectF(-100, -50, 200, 100))
             pic4.setOpacity(0)
             pic4.setZValue(self.y)
             pic4.setPos(pos)
-            pic4.setPixmap(QPixmap(settings.SCRAT_HIPPO_IMAGE))
+            pic4.setPixmap(settings.SCRAT_HIPPO_IMAGE)
 
             # 4 -- near hippo and watermelon
             pic5 = RoundRectItem(QRectF(-100, -50, 200, 100))
             pic5.setOpacity(0)
             pic5.setZValue(self.y)
             pic5.setPos(pos)
-            pic5.setPixmap(QPixmap(settings.SCRAT_HIPPO_AND_WATERMELON_IMAGE))
+            pic5.setPixmap(settings.SCRAT_HIPPO_AND_WATERMELON_IMAGE)
 
             # 5 -- near hippo carrying watermelon
             pic6 = RoundRectItem(QRectF(-100, -50, 200, 100))
             pic6.setOpacity(0)
             pic6.setZValue(self.y)
             pic6.setPos(pos)
-            pic6.setPixmap(QPixmap(settings.SCRAT_WITH_WATERMELON_HIPPO_IMAGE))
+            pic6.setPixmap(settings.SCRAT_WITH_WATERMELON_HIPPO_IMAGE)
 
             # 6 -- near hippo, hippo is fed
             pic7 = RoundRectItem(QRectF(-100, -50, 200, 100))
             pic7.setOpacity(0)
             pic7.setZValue(self.y)
             pic7.setPos(pos)
-            pic7.setPixmap(QPixmap(settings.SCRAT_HIPPO_FED_IMAGE))
+            pic7.setPixmap(settings.SCRAT_HIPPO_FED_IMAGE)
 
             self.pics.append(pic2)
             self.pics.append(pic3)
@@ -137,14 +139,14 @@ class ObjectPicture:
                 self.active_pic.setOpacity(0)
                 self.active_pic = self.pics[3]
         elif isinstance(obj, Hippo):
-            self.active_pic.setPixmap(QPixmap(settings.HIPPO_IMAGE))
+            self.active_pic.setPixmap(settings.HIPPO_IMAGE)
 
             # 1 -- near watermelon
             pic2 = RoundRectItem(QRectF(-50, -50, 100, 100))
             pic2.setOpacity(0)
             pic2.setZValue(self.y)
             pic2.setPos(pos)
-            pic2.setPixmap(QPixmap(settings.HIPPO_AND_WATERMELON_IMAGE))
+            pic2.setPixmap(settings.HIPPO_AND_WATERMELON_IMAGE)
 
             self.pics.append(pic2)  # 0 -- far from watermelon, 1 -- near watermelon
 
@@ -158,19 +160,13 @@ class ObjectPicture:
             if self.cur_position == self._logic.scrat_position or self.cur_position == self._logic.hippo_position:
                 self.active_pic.setOpacity(0)
 
-            self.active_pic.setPixmap(QPixmap(settings.WATERMELON_IMAGE))
+            self.active_pic.setPixmap(settings.WATERMELON_IMAGE)
 
         self._update_neighborhood_params()
 
         for pic in self.pics:
             scene.addItem(pic)
 
-        # for animation
-        self.sel_pos = None
-        self.anim_list = []
-        self.anim = None
-        self.anim2 = None
-
     @property
     def x(self):
         """X coordinate of the object."""
@@ -217,8 +213,8 @@ class ObjectPicture:
 
         self.disappearing_pic = self.active_pic
         self.active_pic = self.pics[num]
-        self.anim = animate(self.active_pic, "opacity", 100, 1)
-        self.anim2 = animate(self.disappearing_pic, "opacity", 100, 0)
+        self._animations.animate(self.active_pic, "opacity", 100, 1)
+        self._animations.animate(self.disappearing_pic, "opacity", 100, 0)
 
     # pylint: disable=R0912,R0915
     def change_position(self):
@@ -279,13 +275,13 @@ class ObjectPicture:
 
         elif isinstance(self._obj, Hippo):
             if self.cur_position == self._logic.scrat_position and self.active_pic.opacity() > 0:  # near Scrat
-                self.anim = animate(self.active_pic, "opacity", 100, 0)
+                self._animations.animate(self.active_pic, "opacity", 100, 0)
             elif self.cur_position != self._logic.scrat_position and self.active_pic.opacity() < 1:  # far from Scrat
                 if self.cur_position == self._logic.watermelon_position:  # near watermelon
                     self.active_pic = self.pics[1]  # 1 -- near watermelon
                 else:
                     self.active_pic = self.pics[0]  # 0 -- without watermelon
-                self.anim = animate(self.active_pic, "opacity", 100, 1)
+                self._animations.animate(self.active_pic, "opacity", 100, 1)
 
             elif not self.is_near_watermelon and self.cur_position == self._logic.watermelon_position and \
                     self.cur_position != self._logic.scrat_position:  # became near
@@ -297,10 +293,10 @@ class ObjectPicture:
         elif isinstance(self._obj, Watermelon):
             if self.active_pic.opacity() > 0 and (self.cur_position == self._logic.scrat_position or
                                                   self.cur_position == self._logic.hippo_position):  # near object
-                self.anim = animate(self.active_pic, "opacity", 100, 0)
+                self._animations.animate(self.active_pic, "opacity", 100, 0)
             elif self.active_pic.opacity() < 1 and self.cur_position != self._logic.scrat_position and \
                     self.cur_position != self._logic.hippo_position:  # far from object
-                self.anim = animate(self.active_pic, "opacity", 100, 1)
+                self._animations.animate(self.active_pic, "opacity", 100, 1)
 
         self._update_neighborhood_params()
 
@@ -315,7 +311,7 @@ class ObjectPicture:
 
         # selection marker is inside the pad, so nothing complex here
         pos = icon.pos()
-        self.sel_pos = animate(self.selection, "pos", time, pos)
+        self._animations.animate(self.selection, "pos", time, pos)
 
         # turning the Scrat picture turned out to be a quest :(
         trans = QTransform()
@@ -340,20 +336,9 @@ class ObjectPicture:
         # moving up to give illusion of "staying" on the platform
         new_pos_y += (res.height() - sc * original.height()) / 2
 
-        # animation
+        # animation, all pictures move together, so the hidden ones are in place when they appear
         for pic in self.pics:
-            if pic is self.active_pic:
-                self.anim_list.append(animate(self.active_pic, "x", time, new_pos_x))
-                self.anim_list.append(animate(self.active_pic, "y", time, new_pos_y))
-                self.anim_list.append(animate(self.active_pic, "scale", time, sc))
-            elif pic is self.disappearing_pic:
-                self.anim_list.append(animate(self.disappearing_pic, "x", time, new_pos_x))
-                self.anim_list.append(animate(self.disappearing_pic, "y", time, new_pos_y))
-                self.anim_list.append(animate(self.disappearing_pic, "scale", time, sc))
-            else:
-                self.anim_list.append(animate(pic, "x", time, new_pos_x))
-                self.anim_list.append(animate(pic, "y", time, new_pos_y))
-                self.anim_list.append(animate(pic, "scale", time, sc))
+            self._animations.animate_group(pic, time, x=new_pos_x, y=new_pos_y, scale=sc)
 
     def pad_rotated(self):
         """Moves the picture during rotation of the pad."""
@@ -1,6 +1,6 @@
 """Pad module"""
 
-from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtCore import QAbstractAnimation, Qt, QRectF
 from PyQt5.QtWidgets import QGraphicsRotation, QGraphicsScale
 
 from .. import settings
@@ -33,6 +33,7 @@ class FlippablePad(RoundRectItem):
         # rotation
         self.goal_rotation = 0
         self.goal_scale = 1
+        self.rot = None
         self.scaleTransform = QGraphicsScale(self)
         self.yRotation = QGraphicsRotation(self)
         self.yRotation.setAxis(Qt.XAxis)
@@ -80,6 +81,13 @@ class FlippablePad(RoundRectItem):
                       (-height / 2.0) * 150, width * 150,
                       height * 150)
 
+    @property
+    def rotating(self):
+        """
+        Returns: bool, whether the rotation animation is running
+        """
+        return self.rot is not None and self.rot.state() == QAbstractAnimation.Running
+
     def rotate(self):
         """
         Starts rotation animation.
@@ -0,0 +1,127 @@
+"""
+Pixmap Cache module
+===================
+
+This module renders images and rounded rectangles of the scene once and keeps them in the process-wide
+`QPixmapCache`, which evicts the least recently used pixmaps when its limit is reached. Images are
+loaded from disk once per path, items paint the cached pixmaps instead of drawing gradients and
+scaling images on every paint.
+"""
+
+from math import ceil
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QBrush, QColor, QLinearGradient, QPainter, QPen, QPixmap, QPixmapCache
+
+from .. import settings
+
+__all__ = ('load_pixmap', 'rounded_pixmap', 'rounded_rect_pixmap')
+
+_limit_set = False
+
+
+def _find(key):
+    global _limit_set  # pylint: disable=W0603
+    if not _limit_set:
+        QPixmapCache.setCacheLimit(settings.PIXMAP_CACHE_LIMIT)
+        _limit_set = True
+
+    return QPixmapCache.find(key)
+
+
+def _new_pixmap(bounds: QRectF):
+    """Returns a transparent pixmap covering the bounds and a painter with the origin at their corner."""
+    pixmap = QPixmap(ceil(bounds.width()), ceil(bounds.height()))
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.translate(-bounds.topLeft())
+    return pixmap, painter
+
+
+def _bounds_key(bounds: QRectF):
+    return f"{bounds.x()},{bounds.y()},{bounds.width()},{bounds.height()}"
+
+
+def load_pixmap(pixmap_path: str):
+    """
+    Loads an image, it is read from disk only once
+
+    Args:
+      pixmap_path: path to image
+
+    Returns: QPixmap
+    """
+    key = f"file:{pixmap_path}"
+    pixmap = _find(key)
+    if pixmap is None:
+        pixmap = QPixmap(pixmap_path)
+        QPixmapCache.insert(key, pixmap)
+
+    return pixmap
+
+
+def rounded_pixmap(pixmap_path: str, bounds: QRectF, radius: float):
+    """
+    Returns an image scaled to the bounds and cut by a rounded rectangle
+
+    Args:
+      pixmap_path: path to image
+      bounds: QRectF, rectangle of the image
+      radius: radius of the corners
+
+    Returns: QPixmap which should be drawn at the top left corner of the bounds
+    """
+    key = f"rounded:{pixmap_path}:{_bounds_key(bounds)}:{radius}"
+    pixmap = _find(key)
+    if pixmap is None:
+        pixmap, painter = _new_pixmap(bounds)
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        brush = QBrush(load_pixmap(pixmap_path).scaled(int(bounds.width()), int(bounds.height())))
+        # the brush texture starts at the origin as it did when the item was drawn directly
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(brush)
+        painter.drawRoundedRect(bounds, radius, radius)
+        painter.end()
+        QPixmapCache.insert(key, pixmap)
+
+    return pixmap
+
+
+def rounded_rect_pixmap(color: QColor, bounds: QRectF, radius: float, fill: QColor = None):
+    """
+    Returns a rounded rectangle with a shadow, filled with a vertical gradient of the color
+
+    Args:
+      color: QColor of the gradient
+      bounds: QRectF, rectangle without the shadow
+      radius: radius of the corners
+      fill: QColor to fill the rectangle with instead of the gradient or None
+
+    Returns: QPixmap which should be drawn at the top left corner of the bounds
+    """
+    fill_key = 'gradient' if fill is None else fill.rgba()
+    key = f"rect:{color.rgba()}:{_bounds_key(bounds)}:{radius}:{fill_key}"
+    pixmap = _find(key)
+    if pixmap is None:
+        pixmap, painter = _new_pixmap(bounds.adjusted(0, 0, 2, 2))
+
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 64))
+        painter.drawRoundedRect(bounds.translated(2, 2), radius, radius)
+
+        if fill is None:
+            gradient = QLinearGradient()
+            gradient.setStart((bounds.topLeft() + bounds.topRight()) / 2)
+            gradient.setFinalStop((bounds.bottomLeft() + bounds.bottomRight()) / 2)
+            gradient.setColorAt(0, color)
+            gradient.setColorAt(1, color.darker(200))
+            painter.setBrush(gradient)
+        else:
+            painter.setBrush(fill)
+
+        painter.setPen(QPen(Qt.black, 1))
+        painter.drawRoundedRect(bounds, radius, radius)
+        painter.end()
+        QPixmapCache.insert(key, pixmap)
+
+    return pixmap
@@ -1,9 +1,12 @@
 """RoundRectItem module"""
 
-from PyQt5.QtCore import QRectF, Qt
-from PyQt5.QtGui import QColor, QLinearGradient, QPalette, QPen, QPixmap, QPainter, QBrush
+from PyQt5.QtCore import QPointF, QRectF
+from PyQt5.QtGui import QPalette, QPixmap
 from PyQt5.QtWidgets import QApplication, QGraphicsItem, QGraphicsObject
 
+# the helper is renamed, `rounded_pixmap` is the name of the flag of setPixmap
+from .pixmapCache import load_pixmap, rounded_pixmap as cached_rounded_pixmap, rounded_rect_pixmap
+
 
 # noinspection PyArgumentEqualDefault
 class RoundRectItem(QGraphicsObject):
@@ -21,6 +24,8 @@ class RoundRectItem(QGraphicsObject):
         self._fillRect = False
         self._bounds = QRectF(bounds)
         self._pix = QPixmap()
+        self._pix_path = None
+        self._rounded_pixmap = False
         self._color = color
 
         self.setCacheMode(QGraphicsItem.ItemCoordinateCache)
@@ -35,39 +40,18 @@ class RoundRectItem(QGraphicsObject):
         self._fillRect = fill
         self.update()
 
-    @property
-    def _gradient(self):
-        gradient = QLinearGradient()
-        gradient.setStart((self._bounds.topLeft() + self._bounds.topRight()) / 2)
-        gradient.setFinalStop((self._bounds.bottomLeft() + self._bounds.bottomRight()) / 2)
-        gradient.setColorAt(0, self._color)
-        gradient.setColorAt(1, self._color.darker(200))
-        return gradient
-
     def paint(self, painter, option, widget):
-        """Standard Qt paint event."""
+        """Standard Qt paint event. The rectangle and the rounded picture are blitted from the pixmap cache."""
         if self._color:
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(QColor(0, 0, 0, 64))
-            painter.drawRoundedRect(self._bounds.translated(2, 2), 25.0, 25.0)
-
-            if self._fillRect:
-                painter.setBrush(QApplication.palette().brush(QPalette.Window))
-            else:
-                painter.setBrush(self._gradient)
-
-            painter.setPen(QPen(Qt.black, 1))
-            painter.drawRoundedRect(self._bounds, 25.0, 25.0)
+            fill = QApplication.palette().color(QPalette.Window) if self._fillRect else None
+            painter.drawPixmap(self._bounds.topLeft(), rounded_rect_pixmap(self._color, self._bounds, 25.0, fill))
 
         if not self._pix.isNull():
             if self._rounded_pixmap:
-                painter.setRenderHint(QPainter.Antialiasing, True)
-                brush = QBrush(self._pix.scaled(self._bounds.width(), self._bounds.height()))
-                painter.setBrush(brush)
-                painter.drawRoundedRect(self._bounds, 25.0, 25.0)
+                painter.drawPixmap(self._bounds.topLeft(), cached_rounded_pixmap(self._pix_path, self._bounds, 25.0))
             else:
                 painter.scale(self._bounds.width() / self._pix.width(), self._bounds.height() / self._pix.height())
-                painter.drawPixmap(-self._pix.width() / 2, -self._pix.height() / 2, self._pix)
+                painter.drawPixmap(QPointF(-self._pix.width() / 2, -self._pix.height() / 2), self._pix)
 
     def boundingRect(self):
         """returns bounding rectangle"""
@@ -78,9 +62,10 @@ class RoundRectItem(QGraphicsObject):
         Sets new pixmap for this graphic object.
 
         Args:
-          pixmap_path: path to image for pixmap
+          pixmap_path: path to image for pixmap, it is loaded from disk only once
           rounded_pixmap: make the picture rounded (used, e.g., for lava in the cells)
         """
         self._rounded_pixmap = rounded_pixmap
-        self._pix = QPixmap(pixmap_path)
+        self._pix_path = pixmap_path
+        self._pix = load_pixmap(pixmap_path)
         self.update()
@@ -0,0 +1,97 @@
+"""
+Tween Clock module
+==================
+
+This module contains the clock which advances all value tweens (animated changes of numbers shown on
+the cells and labels, see `utils.value_update`) by one timer. The changed graphics items are marked
+for repainting after all tweens are advanced, so their scene repaints them in one pass per tick and
+the load doesn't grow with the number of tweens.
+
+Typical usage example:
+
+    tween_clock().start(label, label.value, new_value, label.show_value)
+"""
+
+from functools import lru_cache
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QTimer
+
+from .. import settings
+from ..utils import value_update
+
+__all__ = ('TweenClock', 'tween_clock')
+
+
+class TweenClock(QObject):
+    """
+    Advances tweens every `VALUE_UPDATE_TIME` ms while any of them is active.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        # key -> [value, target value, setter, graphics item or None, minimal step]
+        self._tweens = {}
+        self._timer = QTimer()
+        self._timer.setInterval(settings.VALUE_UPDATE_TIME)
+        self._timer.timeout.connect(self.tick)
+
+    def __len__(self):
+        """Number of active tweens."""
+
+        return len(self._tweens)
+
+    # pylint: disable=R0913
+    def start(self, key, value, target, setter, item=None, min_step=0.1):
+        """
+        Starts a tween or retargets the active tween of the key
+
+        Args:
+          key: hashable owner of the tween, e.g. a cell
+          value: current value
+          target: target value
+          setter: function which shows a value
+          item: QGraphicsItem to repaint after every step or None
+          min_step: minimal change of value per step
+        """
+        self._tweens[key] = [value, target, setter, item, min_step]
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self, key):
+        """Stops the tween of the key, its value stays as it is"""
+
+        self._tweens.pop(key, None)
+
+    def tick(self):
+        """Makes one step of all tweens and repaints the changed items."""
+
+        dirty = []
+        for key, tween in list(self._tweens.items()):
+            value, target, setter, item, min_step = tween
+            if item is not None and sip.isdeleted(item):
+                del self._tweens[key]
+                continue
+
+            tween[0], done = value_update(value, target, min_step)
+            setter(tween[0])
+            if done:
+                del self._tweens[key]
+
+            if item is not None:
+                dirty.append(item)
+
+        # the scene collects the updates and repaints the items at once
+        for item in dirty:
+            item.update()
+
+        if not self._tweens:
+            self._timer.stop()
+
+
+@lru_cache(maxsize=None)
+def tween_clock():
+    """Returns the clock shared by the application."""
+
+    return TweenClock()
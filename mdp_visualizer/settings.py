@@ -1,26 +1,80 @@
-"""Settings module"""
+"""Settings module
+
+Pure Python settings are defined here or re-exported from `config`. Texts and Qt objects
+(colors, fonts, sizes, keys) are created on the first access to any of them, so importing
+this module doesn't load Qt and the translations.
+"""
 
 import gettext
-from PyQt5.QtCore import Qt, QRectF, QSize
-from PyQt5.QtGui import QColor, QFont
+from functools import lru_cache
 
 from .utils import path
+# animation, rotation and game logic parameters live in config, so they can be imported without Qt
+from .config import (MOVE_TIME, ROTATION_TIME, MODE_SWITCH_TIME, Q_LEARNING_PLAY_SPEED,  # pylint: disable=W0611
+                     REPLAY_FRAME_TIME, REPLAY_SPEEDS, TRAINER_DISPLAY_TIME, PIXMAP_CACHE_LIMIT, FRAME_STATS_TIME,
+                     TURBO_FRAME_TIME, TURBO_LEARNING_TIME, TURBO_MAX_BATCH, TURBO_MAX_EPISODE_STEPS,
+                     VALUE_UPDATE_TIME, VALUE_UPDATE_MAX_STEPS,
+                     ROTATION_ANGLE, SCALE_WHEN_ROTATED, BASE_CELL_OPACITY,
+                     GAME_HEIGHT, GAME_WIDTH,
+                     IAMRLAGENT_LAVA_RANDOM, HIPPO_MOVE_PROB, WATERMELON_MOVE_PROB, TICK_PENALTY,
+                     AUTOMATIC_LAVA_RANDOM, GREEN_RANDOM,
+                     LAVA_REWARD, GREEN_REWARD, MIN_REWARD, MAX_REWARD, COLOR_RAMP_SIZE,
+                     MAX_FLOAT_DIFF)
 
 # LOCALISATION AND TEXTS -------------------------------------------------------
 
-ru = gettext.translation('game', path('locale'), languages=['ru'])
-_ = ru.gettext
 
-I_AM_RL_AGENT = _("I Am RL Agent")
-AUTOMATIC_RL = _("Automatic RL, Please")
-Q_LEARNING_DESCRIPTION = _("Press play to launch\nQ-learning algorithm!\n"
-                           "\nHover over cells to watch\nQ-values for them.\n")
-IAMRLAGENT_DESCRIPTION = _("Select one of 6 possible actions.\n"
-                           "\nLearn how to get as much \nreward per episode as possible!\n")
+def _(message):
+    """Marks a message for translation. Messages are translated on the first access to the texts."""
+    return message
+
+
+_TEXTS = {
+    'I_AM_RL_AGENT': _("I Am RL Agent"),
+    'AUTOMATIC_RL': _("Automatic RL, Please"),
+    'Q_LEARNING_DESCRIPTION': _("Press play to launch\nQ-learning algorithm!\n"
+                                "\nHover over cells to watch\nQ-values for them.\n"),
+    'IAMRLAGENT_DESCRIPTION': _("Select one of 6 possible actions.\n"
+                                "\nLearn how to get as much \nreward per episode as possible!\n"),
+
+    'EPISODE_END_MESSAGE1': _("Episode has finished!\nYour score: "),
+    'EPISODE_END_MESSAGE2': _("\nPress reset to start a new one!"),
+    'INFO_BOX': _("Press T to rotate the game view!"),
+
+    'REPLAY': _("Replay a Training Run"),
+    'REPLAY_DESCRIPTION': _("Open a directory recorded\nby headless training with --record.\n"
+                            "\nDrag the slider to seek and\nchoose steps per frame to fast-forward.\n"),
+    'REPLAY_OPEN': _("Open..."),
+    'REPLAY_NO_PARAMS': _("Game parameters were not saved\nin this directory!"),
+    'REPLAY_STATUS': _("Step {step} of {n_steps}, episode {episode}"),
+    'REPLAY_SPEED': _("{speed} steps per frame"),
+
+    'BACKGROUND_TRAINING_START': _("Train in background"),
+    'BACKGROUND_TRAINING_STOP': _("Stop training"),
+    'BACKGROUND_TRAINING_STATUS': _("Episode {episode}, {speed:.0f} steps/s\nmean return {mean_return:.2f}"),
+
+    'PLAY_SPEED_NORMAL': _("Step by step"),
+    'PLAY_SPEED_TURBO_STEPS': _("Turbo: steps"),
+    'PLAY_SPEED_TURBO_EPISODES': _("Turbo: episodes"),
+    'TURBO_STEPS_STATUS': _("Episode {episode}, {speed} steps per frame"),
+    'TURBO_EPISODES_STATUS': _("Episode {episode}, {speed} episodes per frame"),
+
+    'FRAME_TIME_STATUS': _("{fps:.0f} frames/s, paint {mean_time:.1f} ms (max {max_time:.1f} ms)\n"
+                           "repainted {area:.0%} of the view, {mode}"),
+    'VIEWPORT_UPDATE_DIRTY': _("dirty regions"),
+    'VIEWPORT_UPDATE_FULL': _("full viewport"),
+}
+
+
+@lru_cache(maxsize=None)
+def translation():
+    """Returns the translation of the texts."""
+    return gettext.translation('game', path('locale'), languages=['ru'])
+
+
+def _load_texts():
+    return {name: translation().gettext(message) for name, message in _TEXTS.items()}
 
-EPISODE_END_MESSAGE1 = _("Episode has finished!\nYour score: ")
-EPISODE_END_MESSAGE2 = _("\nPress reset to start a new one!")
-INFO_BOX = _("Press T to rotate the game view!")
 
 # IMAGES -----------------------------------------------------------------------
 
@@ -59,66 +113,69 @@ BUTTONS_PATHS = [
     for i in range(6)
 ]
 
-# ANIMATION TIME ---------------------------------------------------------------
+# COLOR AND DESIGN, GEOMETRY, KEYS ---------------------------------------------
+
+LEFT_SCREEN_NAILS_WIDTH = 350
+BUTTONS_NAILS_WIDTH = 200
+INFO_SIZE_NAIL = 80
+INFO_MARGIN_NAIL = 100
 
-MOVE_TIME = 300
-ROTATION_TIME = 600
-MODE_SWITCH_TIME = 400
-Q_LEARNING_PLAY_SPEED = 500
 
-VALUE_UPDATE_TIME = 15
-VALUE_UPDATE_MAX_STEPS = 20
+def _load_qt_objects():
+    # pylint: disable=C0415
+    from PyQt5.QtCore import Qt, QRectF, QSize
+    from PyQt5.QtGui import QColor, QFont
 
-# ROTATION CONFIGURATION -------------------------------------------------------
+    reward_font = QFont("Impact", weight=QFont.Bold)
+    reward_font.setPixelSize(36)
 
-ROTATION_ANGLE = 55
-SCALE_WHEN_ROTATED = 0.75
-BASE_CELL_OPACITY = 0.65
+    return {
+        'PAD_COLOR': QColor(226, 255, 92, 64),
+        'SELECTION_COLOR': QColor(Qt.gray),
+        'ICON_COLOR': QColor(80, 90, 100, 255),
+        'ICON_RECT': QRectF(-54, -54, 108, 108),
 
-# GAME LOGIC PARAMETERS --------------------------------------------------------
+        'RED_CELL': QColor(200, 10, 10, 255),
+        'YELLOW_CELL': QColor(200, 200, 10, 255),
+        'GREEN_CELL': QColor(10, 200, 10, 255),
 
-GAME_HEIGHT = 4
-GAME_WIDTH = 5
+        'REWARD_COLOR': QColor(0, 0, 0, 255),
+        'REWARD_FONT': reward_font,
 
-# IAmRLAgent mode
-IAMRLAGENT_LAVA_RANDOM = 5
-HIPPO_MOVE_PROB = 0.3
-WATERMELON_MOVE_PROB = 0.1
-TICK_PENALTY = -0.1
+        # geometry. nails
+        'Q_VISUALIZATION_NAILS': QSize(300, 250),
+        'AUTO_RL_DESCRIPTION_NAILS': QSize(300, 250),
+        'IAMRLAGENT_DESCRIPTION_NAILS': QSize(300, 175),
+        'REWARD_LABEL_NAILS': QSize(225, 150),
 
-# AutomaticRL mode
-AUTOMATIC_LAVA_RANDOM = 5
-GREEN_RANDOM = 2
+        # key to switch cells to optimal values in AutomaticRL mode
+        'OPTIMAL_VALUES_KEY': Qt.Key_V,
+        # keys to show the frame time overlay and to switch the game screen to full viewport updates
+        'FRAME_TIME_KEY': Qt.Key_F,
+        'FULL_UPDATE_KEY': Qt.Key_U,
+    }
 
-LAVA_REWARD = -10.0
-GREEN_REWARD = 10.0
-MIN_REWARD = -10
-MAX_REWARD = +10
 
-MAX_FLOAT_DIFF = 1e-6
+# LAZY SETTINGS ----------------------------------------------------------------
 
-# COLOR AND DESIGN -------------------------------------------------------------
+_LAZY_GROUPS = (
+    (frozenset(_TEXTS), _load_texts),
+    (frozenset(('PAD_COLOR', 'SELECTION_COLOR', 'ICON_COLOR', 'ICON_RECT', 'RED_CELL', 'YELLOW_CELL', 'GREEN_CELL',
+                'REWARD_COLOR', 'REWARD_FONT', 'Q_VISUALIZATION_NAILS', 'AUTO_RL_DESCRIPTION_NAILS',
+                'IAMRLAGENT_DESCRIPTION_NAILS', 'REWARD_LABEL_NAILS', 'OPTIMAL_VALUES_KEY',
+                'FRAME_TIME_KEY', 'FULL_UPDATE_KEY')), _load_qt_objects),
+)
 
-PAD_COLOR = QColor(226, 255, 92, 64)
-SELECTION_COLOR = QColor(Qt.gray)
-ICON_COLOR = QColor(80, 90, 100, 255)
-ICON_RECT = QRectF(-54, -54, 108, 108)
 
-RED_CELL = QColor(200, 10, 10, 255)
-YELLOW_CELL = QColor(200, 200, 10, 255)
-GREEN_CELL = QColor(10, 200, 10, 255)
+def __getattr__(name):
+    """Creates the group of lazy settings containing `name` and stores it in the module."""
+    for names, load in _LAZY_GROUPS:
+        if name in names:
+            globals().update(load())
+            return globals()[name]
 
-REWARD_COLOR = QColor(0, 0, 0, 255)
-REWARD_FONT = QFont("Impact", weight=QFont.Bold)
-REWARD_FONT.setPixelSize(36)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# GEOMETRY. NAILS -------------------------------------------------------------
 
-LEFT_SCREEN_NAILS_WIDTH = 350
-BUTTONS_NAILS_WIDTH = 200
-Q_VISUALIZATION_NAILS = QSize(300, 250)
-AUTO_RL_DESCRIPTION_NAILS = QSize(300, 250)
-IAMRLAGENT_DESCRIPTION_NAILS = QSize(300, 175)
-REWARD_LABEL_NAILS = QSize(225, 150)
-INFO_SIZE_NAIL = 80
-INFO_MARGIN_NAIL = 100
+def __dir__():
+    return sorted(set(globals()).union(*(names for names, _ in _LAZY_GROUPS)))
@@ -0,0 +1,219 @@
+"""Entry point for headless training
+
+Trains Q-learning on a game board without GUI and reports returns and speed.
+Only the logic is imported, so no Qt modules are loaded.
+
+Typical usage example:
+
+    python -m mdp_visualizer.train --mode iamrlagent --episodes 1000 --engine fast
+    python -m mdp_visualizer.train --config experiment.json --output q_table.npy
+
+A config file is a JSON object with the same keys as the long options, e.g.
+``{"mode": "automatic", "height": 8, "width": 8, "episodes": 500}``.
+Options given in the command line override the config file.
+"""
+
+import argparse
+import json
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from . import config
+from .logic.actions_objects_list import Modes
+from .logic.batchedGameLogic import BatchedGameLogic
+from .logic.gameLogic import GameLogic, GameParams
+from .logic.q_learning import BatchedQLearning, SparseQTable, q_learning, q_learning_fast
+from .logic.rng import spawn_rngs
+from .logic.trajectory import TrajectoryRecorder
+
+MODES = ('automatic', 'iamrlagent')
+ENGINES = ('q_learning', 'fast', 'batched')
+
+
+def build_parser():
+    """Returns the parser of command line options."""
+
+    parser = argparse.ArgumentParser(prog='python -m mdp_visualizer.train', description=__doc__.splitlines()[2])
+    parser.add_argument('--config', help='JSON file with default values of the options')
+
+    game = parser.add_argument_group('game')
+    game.add_argument('--mode', choices=MODES, default='automatic',
+                      help='automatic: lava and green cells, iamrlagent: lava, Hippo and Watermelon')
+    game.add_argument('--height', type=int, default=config.GAME_HEIGHT, help='number of rows of the board')
+    game.add_argument('--width', type=int, default=config.GAME_WIDTH, help='number of columns of the board')
+    game.add_argument('--lava', type=int, help='number of random lava cells')
+    game.add_argument('--green', type=int, default=config.GREEN_RANDOM, help='number of random green cells')
+    game.add_argument('--hippo-move-prob', type=float, default=config.HIPPO_MOVE_PROB)
+    game.add_argument('--watermelon-move-prob', type=float, default=config.WATERMELON_MOVE_PROB)
+    game.add_argument('--tick-penalty', type=float, help='reward of every step')
+    game.add_argument('--full-state', action='store_true', help='states encode all objects, not only Scrat')
+
+    training = parser.add_argument_group('training')
+    training.add_argument('--engine', choices=ENGINES, default='fast',
+                          help='q_learning: reference implementation, fast: q_learning_fast, '
+                               'batched: BatchedQLearning on --n-envs boards')
+    training.add_argument('--episodes', type=int, default=100, help='number of training episodes')
+    training.add_argument('--max-steps', type=int, default=1000, help='maximum number of steps in an episode')
+    training.add_argument('--lr', type=float, default=0.1, help='learning rate')
+    training.add_argument('--gamma', type=float, default=0.95, help='discount coefficient')
+    training.add_argument('--eps', type=float, default=0.5, help='epsilon from eps-greedy')
+    training.add_argument('--sparse', action='store_true', help='store Q-values in a sparse table')
+    training.add_argument('--n-envs', type=int, default=64, help='number of boards of the batched engine')
+    training.add_argument('--seed', type=int, help='seed of random generators')
+
+    output = parser.add_argument_group('output')
+    output.add_argument('--log-every', type=int, default=0, help='report progress every N episodes')
+    output.add_argument('--output', help='.npy file to save the final Q-values')
+    output.add_argument('--record', metavar='DIR',
+                        help='directory to record transitions into (see logic.trajectory), not for the batched engine')
+    output.add_argument('--snapshot-every', type=int, default=10,
+                        help='save a snapshot of Q-values with the recorded transitions every N episodes')
+
+    return parser
+
+
+def parse_args(argv=None):
+    """Parses command line options, taking defaults from the config file if it is given."""
+
+    parser = build_parser()
+    args, _ = parser.parse_known_args(argv)
+    if args.config is not None:
+        with open(args.config, encoding='utf-8') as config_file:
+            defaults = {key.replace('-', '_'): value for key, value in json.load(config_file).items()}
+
+        unknown = set(defaults) - set(vars(args))
+        if unknown:
+            parser.error(f"unknown options in {args.config}: {', '.join(sorted(unknown))}")
+        parser.set_defaults(**defaults)
+
+    args = parser.parse_args(argv)
+    if args.record is not None and args.engine == 'batched':
+        parser.error('--record is not supported by the batched engine')
+
+    return args
+
+
+def game_params(args):
+    """Builds GameParams from the options. Defaults are the same as in the GUI modes."""
+
+    if args.mode == 'automatic':
+        return GameParams(Modes.AUTOMATICRL, game_height=args.height, game_width=args.width,
+                          lava_random=config.AUTOMATIC_LAVA_RANDOM if args.lava is None else args.lava,
+                          lava_reward=config.LAVA_REWARD, lava_is_terminal=True,
+                          green_random=args.green, green_reward=config.GREEN_REWARD, green_is_terminal=True,
+                          tick_penalty=0 if args.tick_penalty is None else args.tick_penalty,
+                          full_state=args.full_state)
+
+    return GameParams(Modes.IAMRLAGENT, game_height=args.height, game_width=args.width,
+                      hippo_random=True, hippo_move_prob=args.hippo_move_prob,
+                      watermelon_random=True, watermelon_move_prob=args.watermelon_move_prob,
+                      lava_random=config.IAMRLAGENT_LAVA_RANDOM if args.lava is None else args.lava,
+                      lava_is_terminal=True,
+                      tick_penalty=config.TICK_PENALTY if args.tick_penalty is None else args.tick_penalty,
+                      full_state=args.full_state)
+
+
+def _report(episodes, returns, steps, start_time, log_every):
+    """Prints mean return of the last `log_every` episodes and speed."""
+
+    elapsed = perf_counter() - start_time
+    print(f"episode {episodes:>8}  mean return {np.mean(returns[-log_every:]):10.3f}  "
+          f"steps {steps:>10}  steps/s {steps / max(elapsed, 1e-9):12.0f}")
+
+
+def train(args):
+    """Trains Q-learning with a single board.
+
+    Returns:
+        tuple: (Q-values, returns of episodes, number of steps)
+    """
+
+    board_rng, train_rng = spawn_rngs(args.seed, 2)
+    logic = GameLogic(game_params(args), rng=board_rng)
+    if args.sparse:
+        q_table = SparseQTable(logic.n_states, logic.n_actions)
+    else:
+        q_table = np.zeros([logic.n_states, logic.n_actions])
+
+    engine = q_learning if args.engine == 'q_learning' else q_learning_fast
+    recorder = None
+    if args.record is not None:
+        recorder = TrajectoryRecorder(args.record)
+        recorder.save_params(logic.start_params)
+    returns = []
+    steps = 0
+    start_time = perf_counter()
+
+    for episode in range(1, args.episodes + 1):
+        r_all, q_table, _, _, info = engine(logic, logic.reset(), args.max_steps, q_table,
+                                            args.lr, args.gamma, args.eps, rng=train_rng, recorder=recorder)
+        returns.append(r_all)
+        steps += len(info['actions'])
+        if recorder is not None:
+            recorder.end_episode()
+            if args.snapshot_every and episode % args.snapshot_every == 0:
+                recorder.save_q_snapshot(q_table)
+
+        if args.log_every and episode % args.log_every == 0:
+            _report(episode, returns, steps, start_time, args.log_every)
+
+    if recorder is not None:
+        recorder.close()
+
+    return q_table, returns, steps
+
+
+def train_batched(args):
+    """Trains BatchedQLearning on `args.n_envs` boards until `args.episodes` episodes are finished.
+
+    Episodes are not truncated, but the whole run stops after ``episodes * max_steps`` steps.
+
+    Returns:
+        tuple: (Q-values of all boards, returns of episodes, number of steps)
+    """
+
+    board_rng, train_rng = spawn_rngs(args.seed, 2)
+    env = BatchedGameLogic(game_params(args), args.n_envs, rng=board_rng)
+    qlearning = BatchedQLearning(env, rng=train_rng)
+    returns = []
+    steps = 0
+    max_steps = args.episodes * args.max_steps
+    reported = 0
+    start_time = perf_counter()
+
+    while len(returns) < args.episodes and steps < max_steps:
+        _, dones, infos = qlearning.step(args.lr, args.gamma, args.eps)
+        returns.extend(infos['episode_rewards'][dones].tolist())
+        steps += args.n_envs
+
+        while args.log_every and len(returns) >= reported + args.log_every:
+            reported += args.log_every
+            _report(reported, returns[:reported], steps, start_time, args.log_every)
+
+    return qlearning.get_q_values(), returns[:args.episodes], steps
+
+
+def main(argv=None):
+    """Runs training with command line options and prints the summary."""
+
+    args = parse_args(argv)
+
+    start_time = perf_counter()
+    q_table, returns, steps = train_batched(args) if args.engine == 'batched' else train(args)
+    elapsed = perf_counter() - start_time
+
+    tail = returns[-max(1, len(returns) // 10):]
+    print(f"episodes {len(returns)}  steps {steps}  time {elapsed:.3f} s  "
+          f"steps/s {steps / max(elapsed, 1e-9):.0f}")
+    print(f"mean return {np.mean(returns):.3f}  mean return of the last 10% {np.mean(tail):.3f}")
+
+    if args.output is not None:
+        np.save(args.output, q_table.to_array() if isinstance(q_table, SparseQTable) else q_table)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,8 @@
 """Utils module"""
 
 import os
-from PyQt5.QtCore import QEasingCurve, QPropertyAnimation
 
-from . import settings
+from . import config
 
 
 def animate(obj, prop, time, val):
@@ -21,6 +20,9 @@ def animate(obj, prop, time, val):
 
     Returns: QpropertyAnimation
     """
+    # pylint: disable=C0415
+    from PyQt5.QtCore import QEasingCurve, QPropertyAnimation
+
     anim = QPropertyAnimation(obj, prop.encode())
     anim.setEasingCurve(QEasingCurve.InQuad)
     anim.setDuration(time)
@@ -43,7 +45,7 @@ def value_update(value: float, target_value: float, min_step: float = 0.1):
       done: flag if the animation has ended, bool
     """
     diff = abs(target_value - value)
-    step = max(min_step, diff / settings.VALUE_UPDATE_MAX_STEPS)
+    step = max(min_step, diff / config.VALUE_UPDATE_MAX_STEPS)
 
     if diff < step:
         return target_value, True
@@ -53,6 +55,63 @@ def value_update(value: float, target_value: float, min_step: float = 0.1):
         return value - step, False
 
 
+def adapt_batch_size(batch_size: int, elapsed: float, target: float, max_batch_size: int):
+    """By time spent on a batch of work returns the size of the next batch to fit into the target time
+
+    Args:
+      batch_size: size of the last batch
+      elapsed: time spent on the last batch
+      target: desired time of a batch, in the same units
+      max_batch_size: maximal size of a batch
+
+    Returns:
+      new_batch_size: size of the next batch, it changes at most twice per call, int
+    """
+    if elapsed <= 0:
+        new_batch_size = 2 * batch_size
+    else:
+        new_batch_size = min(max(batch_size * target / elapsed, batch_size / 2), 2 * batch_size)
+
+    return int(min(max(new_batch_size, 1), max_batch_size))
+
+
+def ramp_index(value: float, min_value: float, max_value: float, size: int):
+    """By value returns the index of the nearest entry of a ramp of `size` entries between min_value and max_value
+
+    Args:
+      value: value, it is clipped to the bounds
+      min_value: value of the first entry
+      max_value: value of the last entry
+      size: number of entries
+
+    Returns:
+      index: int
+    """
+    index = round((value - min_value) / (max_value - min_value) * (size - 1))
+    return min(max(index, 0), size - 1)
+
+
+def frame_statistics(paint_times, areas, elapsed: float):
+    """Summarizes the frames painted during some time
+
+    Args:
+      paint_times: durations of painting of the frames, in ms
+      areas: repainted parts of the view of the frames, from 0 to 1
+      elapsed: time during which the frames were painted, in ms
+
+    Returns:
+      fps: number of frames per second
+      mean_time: mean duration of painting of a frame, 0 without frames
+      max_time: maximal duration of painting of a frame, 0 without frames
+      area: mean repainted part of the view, 0 without frames
+    """
+    if not paint_times:
+        return 0., 0., 0., 0.
+
+    fps = 1000 * len(paint_times) / elapsed if elapsed > 0 else 0.
+    return fps, sum(paint_times) / len(paint_times), max(paint_times), sum(areas) / len(areas)
+
+
 def path(relative_path):
     """Returns absolute path given relative path"""
     script_dir = os.path.dirname(__file__)
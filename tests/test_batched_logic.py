@@ -0,0 +1,114 @@
+from copy import deepcopy
+
+# pylint: disable=W0611
+import pytest
+import numpy as np
+
+from mdp_visualizer.logic.gameLogic import GameParams
+from mdp_visualizer.logic.batchedGameLogic import BatchedGameLogic
+from mdp_visualizer.logic.actions_objects_list import Modes
+
+
+@pytest.mark.parametrize('full_state', [False, True])
+def test_batched_matches_single_boards(full_state):
+    num_envs = 16
+    num_steps = 500
+
+    # Immobile Hippo and Watermelon make the dynamics deterministic
+    params = GameParams(game_mode=Modes.IAMRLAGENT, game_height=3, game_width=4,
+                        scrat_random=True,
+                        hippo_random=True, hippo_move_prob=0,
+                        watermelon_random=True, watermelon_move_prob=0,
+                        lava_random=2, lava_is_terminal=True, tick_penalty=-0.1,
+                        full_state=full_state)
+    batched = BatchedGameLogic(params, num_envs)
+    logics = [deepcopy(logic) for logic in batched.logics]
+    states = batched.reset()
+
+    for logic, state in zip(logics, states):
+        assert logic.reset() == state
+
+    for _ in range(num_steps):
+        actions = np.random.randint(batched.n_actions, size=num_envs)
+        states, rewards, dones, infos = batched.step(actions)
+
+        for i, logic in enumerate(logics):
+            state, reward, done, _ = logic.step(actions[i])
+
+            assert infos['final_states'][i] == state
+            assert rewards[i] == pytest.approx(reward)
+            assert dones[i] == bool(done)
+
+            if done:
+                assert infos['episode_rewards'][i] == pytest.approx(logic.full_reward)
+                assert states[i] == logic.reset()
+            else:
+                assert states[i] == state
+                assert tuple(batched.scrat_positions[i]) == logic.scrat_position
+                assert batched.scrat_carrying_watermelon[i] == logic.scrat_carrying_watermelon
+
+
+def test_batched_random_moves():
+    num_envs = 32
+    num_steps = 300
+
+    params = GameParams(game_mode=Modes.IAMRLAGENT, game_height=5, game_width=6,
+                        scrat_random=True,
+                        hippo_random=True, hippo_move_prob=1,
+                        watermelon_random=True, watermelon_move_prob=1,
+                        lava_random=3, lava_is_terminal=False)
+    batched = BatchedGameLogic(params, num_envs)
+    lava = [set(logic.lava_cells) for logic in batched.logics]
+
+    for _ in range(num_steps):
+        prev_hippo = batched.hippo_positions
+        prev_watermelon = batched.watermelon_positions
+
+        batched.step(np.random.randint(4, size=num_envs))
+
+        hippo = batched.hippo_positions
+        watermelon = batched.watermelon_positions
+        assert np.all(np.abs(hippo - prev_hippo).sum(axis=1) <= 1)
+        assert np.all(np.abs(watermelon - prev_watermelon).sum(axis=1) <= 1)
+
+        for i in range(num_envs):
+            assert tuple(hippo[i]) not in lava[i]
+            assert tuple(watermelon[i]) not in lava[i]
+
+
+def test_batched_full_reset():
+    params = GameParams(game_mode=Modes.AUTOMATICRL, game_height=4, game_width=5,
+                        lava_random=5, lava_is_terminal=True,
+                        green_random=2, green_is_terminal=True)
+    batched = BatchedGameLogic(params, 8)
+
+    states = batched.full_reset()
+
+    assert states.shape == (8,)
+    for logic, state in zip(batched.logics, states):
+        x, y = logic.scrat_position
+        assert state == y * logic.game_size[0] + x
+        assert logic.scrat_position not in logic.terminal_cells
+
+
+def test_batched_seed():
+    params = GameParams(game_mode=Modes.IAMRLAGENT, game_height=5, game_width=6,
+                        hippo_random=True, hippo_move_prob=0.5,
+                        watermelon_random=True, watermelon_move_prob=0.5,
+                        lava_random=3, lava_is_terminal=True, seed=7)
+    actions = np.random.randint(4, size=(100, 8))
+
+    def play():
+        batched = BatchedGameLogic(params, 8)
+        trajectory = [batched.reset()]
+        for step_actions in actions:
+            states, rewards, dones, _ = batched.step(step_actions)
+            trajectory.extend((states, rewards, dones))
+        return trajectory
+
+    first, second = play(), play()
+    assert all((a == b).all() for a, b in zip(first, second))
+
+    # every board has its own stream
+    boards = [tuple(logic.lava_cells) for logic in BatchedGameLogic(params, 8).logics]
+    assert len(set(boards)) > 1
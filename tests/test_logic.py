@@ -3,6 +3,7 @@ from random import randint
 # pylint: disable=W0611
 import pytest
 
+from mdp_visualizer.logic import gameBoard
 from mdp_visualizer.logic.gameLogic import GameLogic, GameParams
 from mdp_visualizer.logic.actions_objects_list import Modes, Actions
 
@@ -75,6 +76,24 @@ def test_watermelon_hippo_actions():
         logic.full_reset()
 
 
+
+def test_put_without_hippo():
+    params = GameParams(Modes.IAMRLAGENT, game_height=3, game_width=4,
+                        scrat_random=False, scrat_start_position=(0, 0),
+                        watermelon_random=False, watermelon_start_position=(1, 0), watermelon_move_prob=0)
+    logic = GameLogic(params)
+    assert logic.hippo is None
+
+    logic.step(2)  # right
+    logic.step(Actions.TAKE.value)
+    assert logic.scrat_carrying_watermelon
+
+    # without Hippo the watermelon is put on the cell
+    state, _, done, info = logic.step(Actions.PUT_FEED.value)
+    assert (state, done, info) == (1, False, None)
+    assert not logic.scrat_carrying_watermelon
+    assert logic.watermelon_position == (1, 0)
+
 def test_with_lava():
     num_logics = 20
     num_steps = 1000
@@ -104,3 +123,150 @@ def test_with_lava():
                 break
 
         logic.full_reset()
+
+
+def test_game_board_layers():
+    params = GameParams(game_mode=Modes.IAMRLAGENT, game_height=4, game_width=5,
+                        scrat_random=True,
+                        hippo_random=True, hippo_move_prob=1,
+                        watermelon_random=True, watermelon_move_prob=1,
+                        lava_random=3, lava_is_terminal=True, lava_reward=-10)
+    logic = GameLogic(params)
+    board = logic.game_board
+    rewards = board.rewards
+
+    for _ in range(20):
+        for _ in range(50):
+            _, _, done, _ = logic.step(take_random_action(logic, max_action=3))
+            assert board.scrat_is_here(logic.scrat_position)
+            assert board.hippo_is_here(logic.hippo_position)
+            assert board.watermelon_is_here(logic.watermelon_position)
+            assert (board.layers & gameBoard.SCRAT_LAYER > 0).sum() == 1
+            if done:
+                break
+
+        for y in range(logic.game_size[1]):
+            for x in range(logic.game_size[0]):
+                cell = board.cell((x, y))
+                assert cell.lava_is_here == ((x, y) in logic.lava_cells)
+                assert cell.is_terminal == ((x, y) in logic.terminal_cells)
+                assert cell.reward == (-10 if cell.lava_is_here else 0)
+
+        logic.full_reset()
+
+        # the board is refilled in place
+        assert logic.game_board is board
+        assert board.rewards.base is rewards.base
+        assert board.scrat_is_here(logic.scrat_position)
+
+
+def test_game_objects_positions():
+    params = GameParams(Modes.IAMRLAGENT, game_height=5, game_width=6,
+                        hippo_random=True, hippo_move_prob=1,
+                        watermelon_random=True, watermelon_move_prob=1,
+                        lava_random=4, lava_is_terminal=False)
+    logic = GameLogic(params)
+
+    for obj in (logic.scrat, logic.hippo, logic.watermelon):
+        assert not hasattr(obj, '__dict__')
+
+    for _ in range(100):
+        hippo_position = logic.hippo_position
+        logic.step(take_random_action(logic, max_action=3))
+
+        # positions are cached until the object moves
+        assert logic.scrat_position is logic.scrat.cur_position
+        if logic.hippo_position != hippo_position:
+            assert logic.hippo.prev_position == hippo_position
+            assert sum(map(abs, logic.hippo.dx_dy)) == 1
+        assert logic.hippo_position not in logic.lava_cells
+
+    logic.full_reset()
+    assert logic.hippo_position not in logic.lava_cells
+    assert logic.scrat.prev_position == (-1, -1)
+
+
+def test_legal_moves_uniform():
+    num_samples = 4000
+
+    params = GameParams(Modes.IAMRLAGENT, game_height=3, game_width=3,
+                        scrat_random=False, scrat_start_position=(0, 0),
+                        hippo_random=False, hippo_start_position=(1, 1), hippo_move_prob=1,
+                        watermelon_random=False, watermelon_start_position=(2, 2), watermelon_move_prob=0,
+                        lava_cells=[(1, 0), (2, 1)], lava_is_terminal=True)
+    logic = GameLogic(params)
+    board = logic.game_board
+
+    # from the center only LEFT and DOWN lead neither to lava nor outside
+    directions = gameBoard.MOVE_DIRECTIONS
+    assert board.legal_moves[1, 1] == (1 << directions.index(Actions.LEFT.value)) | \
+        (1 << directions.index(Actions.DOWN.value))
+    assert board.legal_directions[4] == (Actions.LEFT.value, Actions.DOWN.value)
+
+    counts = {}
+    for _ in range(num_samples):
+        direction = logic.hippo.take_random_action()
+        counts[direction] = counts.get(direction, 0) + 1
+
+    # the object always moves and both directions are equally likely
+    assert set(counts) == {Actions.LEFT.value, Actions.DOWN.value}
+    assert counts[Actions.LEFT.value] / num_samples == pytest.approx(0.5, abs=0.05)
+
+    # the table is rebuilt when lava is resampled
+    params = GameParams(Modes.IAMRLAGENT, game_height=6, game_width=6,
+                        hippo_random=True, hippo_move_prob=1, lava_random=8)
+    logic = GameLogic(params)
+    for _ in range(5):
+        logic.full_reset()
+        for cell, directions in enumerate(logic.game_board.legal_directions):
+            x, y = cell % 6, cell // 6
+            for dx, dy in ((-1, 0), (0, -1), (1, 0), (0, 1)):
+                legal = 0 <= x + dx < 6 and 0 <= y + dy < 6 and (x + dx, y + dy) not in logic.lava_cells
+                assert ((dx, dy) in directions) == legal
+
+
+@pytest.mark.parametrize('size, n_lava', [((6, 5), 3), ((6, 5), 20), ((40, 30), 300)])
+def test_random_placement(size, n_lava):
+    width, height = size
+    params = GameParams(Modes.IAMRLAGENT, game_height=height, game_width=width,
+                        hippo_random=True, hippo_move_prob=0.5,
+                        watermelon_random=True, watermelon_move_prob=0.5,
+                        lava_random=n_lava, lava_is_terminal=True,
+                        green_random=2, green_is_terminal=True)
+    logic = GameLogic(params)
+
+    for _ in range(20):
+        logic.full_reset()
+
+        lava = set(logic.lava_cells)
+        assert len(lava) == n_lava
+        assert all(0 <= x < width and 0 <= y < height for x, y in lava)
+        assert not lava & set(logic.green_cells)
+        assert logic.scrat_position not in logic.terminal_cells
+        assert logic.hippo_position not in lava
+        assert logic.watermelon_position not in lava
+        assert logic.watermelon_position not in logic.terminal_cells
+
+
+def test_seeded_logic():
+    def make_params(seed=None):
+        # GameLogic stores sampled cells in its params, so every game gets its own
+        return GameParams(Modes.IAMRLAGENT, game_height=6, game_width=7,
+                          hippo_random=True, hippo_move_prob=0.5,
+                          watermelon_random=True, watermelon_move_prob=0.5,
+                          lava_random=6, lava_is_terminal=True, tick_penalty=-0.1, seed=seed)
+
+    def play(logic, n_steps=300):
+        trajectory = [tuple(logic.lava_cells)]
+        for step in range(n_steps):
+            state, reward, done, _ = logic.step(step % logic.n_actions)
+            trajectory.append((state, reward, done, logic.hippo_position, logic.watermelon_position))
+            if done:
+                logic.full_reset()
+                trajectory.append(tuple(logic.lava_cells))
+        return trajectory
+
+    # the same seed gives the same boards and moves
+    assert play(GameLogic(make_params(3))) == play(GameLogic(make_params(3)))
+    assert play(GameLogic(make_params(), rng=3)) == play(GameLogic(make_params(3)))
+    assert play(GameLogic(make_params(), rng=4)) != play(GameLogic(make_params(3)))
@@ -0,0 +1,75 @@
+# pylint: disable=W0611
+import pytest
+import numpy as np
+
+from mdp_visualizer.logic.gameLogic import GameLogic, GameParams
+from mdp_visualizer.logic.stateEncoder import StateEncoder
+from mdp_visualizer.logic.actions_objects_list import Modes
+
+
+def test_state_encoder():
+    encoder = StateEncoder((4, 3), has_hippo=True, has_watermelon=True)
+    assert encoder.n_states == 12 ** 3 * 4
+
+    states = np.arange(encoder.n_states)
+    assert (encoder.encode(*encoder.decode(states)) == states).all()
+    assert encoder.decode(encoder.encode(5, 7, 11, True, False)) == (5, 7, 11, True, False)
+
+    # without Hippo and Watermelon the state is the Scrat cell
+    encoder = StateEncoder((4, 3))
+    assert encoder.n_states == 12
+    assert encoder.encode(encoder.cell((2, 1))) == 6
+
+
+def test_mdp_automatic_rl():
+    params = GameParams(Modes.AUTOMATICRL, game_height=4, game_width=5,
+                        lava_random=5, lava_is_terminal=True, lava_reward=-10,
+                        green_random=2, green_is_terminal=True, green_reward=10)
+    logic = GameLogic(params)
+    mdp = logic.to_mdp()
+
+    assert mdp.P.shape == (logic.n_states, logic.n_actions, logic.n_states)
+    assert mdp.R.shape == (logic.n_states, logic.n_actions)
+    assert np.allclose(mdp.P.sum(axis=2), 1)
+
+    # the dynamics is deterministic
+    for state in np.flatnonzero(~mdp.terminal):
+        for action in range(logic.n_actions):
+            next_state = mdp.P[state, action].argmax()
+            assert mdp.P[state, action, next_state] == 1
+            assert mdp.R[state, action] == logic.game_board.cell_reward(mdp.encoder.position(next_state))
+
+    for x, y in logic.terminal_cells:
+        assert mdp.terminal[y * logic.game_size[0] + x]
+
+    sparse = logic.to_mdp(sparse=True)
+    assert np.allclose(sparse.P.toarray().reshape(mdp.P.shape), mdp.P)
+
+
+def test_mdp_matches_sampling():
+    num_samples = 3000
+
+    params = GameParams(game_mode=Modes.IAMRLAGENT, game_height=3, game_width=3,
+                        scrat_random=True,
+                        hippo_random=True, hippo_move_prob=0.5,
+                        watermelon_random=True, watermelon_move_prob=0.5,
+                        lava_random=1, lava_is_terminal=True, tick_penalty=-0.1)
+    logic = GameLogic(params)
+    mdp = logic.to_mdp(sparse=True)
+    n_actions = logic.n_actions
+
+    assert np.allclose(np.asarray(mdp.P.sum(axis=1)).ravel(), 1)
+
+    state = mdp.encoder.encode_logic(logic)
+    for action in range(n_actions):
+        counts = np.zeros(mdp.encoder.n_states)
+        rewards = []
+        for _ in range(num_samples):
+            logic.reset()
+            _, reward, _, _ = logic.step(action)
+            counts[mdp.encoder.encode_logic(logic)] += 1
+            rewards.append(reward)
+
+        probs = mdp.P[state * n_actions + action].toarray().ravel()
+        assert np.abs(counts / num_samples - probs).sum() / 2 < 0.05
+        assert np.mean(rewards) == pytest.approx(mdp.R[state, action], abs=0.5)
@@ -0,0 +1,63 @@
+# pylint: disable=W0611
+import pytest
+import numpy as np
+
+from mdp_visualizer.logic.gameLogic import GameLogic, GameParams
+from mdp_visualizer.logic.actions_objects_list import Modes
+from mdp_visualizer.logic import planning
+
+
+def make_logic():
+    params = GameParams(game_mode=Modes.IAMRLAGENT, game_height=2, game_width=3,
+                        scrat_random=True,
+                        hippo_random=True, hippo_move_prob=0.3,
+                        watermelon_random=True, watermelon_move_prob=0.1,
+                        lava_random=1, lava_is_terminal=True, tick_penalty=-0.1)
+    return GameLogic(params)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_planning_methods_agree(sparse):
+    mdp = make_logic().to_mdp(sparse=sparse)
+
+    vi = planning.value_iteration(mdp, gamma=0.9, tol=1e-9)
+    pi = planning.policy_iteration(mdp, gamma=0.9)
+    mpi = planning.modified_policy_iteration(mdp, gamma=0.9, tol=1e-9)
+
+    assert vi.converged and pi.converged and mpi.converged
+    assert np.allclose(vi.V, pi.V, atol=1e-6)
+    assert np.allclose(vi.V, mpi.V, atol=1e-6)
+    assert (vi.V[mdp.terminal] == 0).all()
+
+    # the optimal values satisfy the Bellman optimality equation
+    assert np.allclose(vi.Q.max(axis=1), vi.V, atol=1e-6)
+    assert np.allclose(pi.Q[np.arange(mdp.R.shape[0]), pi.policy], pi.V, atol=1e-6)
+
+
+def test_solve_automatic_rl():
+    params = GameParams(Modes.AUTOMATICRL, game_height=4, game_width=5,
+                        lava_random=5, lava_is_terminal=True, lava_reward=-10,
+                        green_random=2, green_is_terminal=True, green_reward=10)
+    logic = GameLogic(params)
+
+    result = planning.solve(logic, gamma=0.95)
+
+    assert result.converged
+    assert result.V.shape == (logic.n_states,)
+    assert result.V.max() <= 10
+    assert result.iterations > 0 and result.time >= 0
+
+
+
+def test_solve_chooses_sparse(monkeypatch):
+    logic = make_logic()
+    dense = planning.solve(logic, gamma=0.9, tol=1e-9)
+
+    requested = []
+    to_mdp = logic.to_mdp
+    monkeypatch.setattr(logic, 'to_mdp', lambda sparse: requested.append(sparse) or to_mdp(sparse))
+    monkeypatch.setattr(planning, 'DENSE_MAX_ELEMENTS', logic.state_encoder.n_states ** 2 * logic.n_actions - 1)
+    sparse = planning.solve(logic, gamma=0.9, tol=1e-9)
+
+    assert requested == [True]
+    assert np.allclose(dense.V, sparse.V, atol=1e-6)
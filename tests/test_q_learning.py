@@ -2,7 +2,11 @@ import pytest
 import numpy as np
 import gym
 
-from mdp_visualizer.logic.q_learning import q_learning, QLearning
+from mdp_visualizer.logic.q_learning import q_learning, q_learning_fast, QLearning, BatchedQLearning, SparseQTable
+from mdp_visualizer.logic.gameLogic import GameLogic, GameParams
+from mdp_visualizer.logic.batchedGameLogic import BatchedGameLogic
+from mdp_visualizer.logic.actions_objects_list import Modes
+from mdp_visualizer.logic import planning
 
 
 class TestEnv:
@@ -68,6 +72,29 @@ def test_q_learning_frozen_lake():
     assert mean_reward >= 0.45
 
 
+def test_q_learning_fast_frozen_lake():
+    env = TestEnv()
+    num_episodes = 5000
+    q_table = None
+    min_epsilon, max_epsilon = 0.001, 1.0
+    decay_rate = 0.005
+
+    r_all = []
+    for e in range(num_episodes):
+        s = env.reset()
+        eps = min_epsilon + (max_epsilon - min_epsilon) * np.exp(-decay_rate * e)
+        r, q_table, s, done, info = q_learning_fast(env, s, n_steps=100, q_table=q_table, lr=0.3, gamma=0.95,
+                                                    eps=eps, block_size=16)
+        r_all.append(r)
+
+        assert len(info['states']) == len(info['actions']) + 1 == len(info['rewards']) + 1
+        assert info['states'][-1] == s
+        assert info['rewards'].sum() == r
+
+    mean_reward = np.mean(r_all)
+    assert mean_reward >= 0.45
+
+
 # pylint: disable=R0914
 def test_q_learning_class():
     env = TestEnv()
@@ -101,3 +128,135 @@ def test_q_learning_class():
 
     mean_reward = np.mean(r_all)
     assert mean_reward >= 0.45
+
+
+def test_sparse_q_table():
+    q_table = SparseQTable(1000, 4)
+    assert q_table[10, :].tolist() == [0.] * 4
+    assert len(q_table) == 0
+
+    q_table[10, 2] = q_table[10, 2] + 1.5
+    assert q_table[10, 2] == 1.5
+    assert np.max(q_table[10]) == 1.5
+    assert len(q_table) == 1
+    assert q_table.to_array()[10].tolist() == [0., 0., 1.5, 0.]
+
+
+def test_q_learning_full_state():
+    # Scrat has to take the Watermelon and feed the immobile Hippo,
+    # which can't be learned from Scrat position only
+    params = GameParams(game_mode=Modes.IAMRLAGENT, game_height=2, game_width=3,
+                        scrat_start_position=(0, 0),
+                        hippo_start_position=(2, 1), hippo_move_prob=0,
+                        watermelon_start_position=(2, 0), watermelon_move_prob=0,
+                        tick_penalty=-1, full_state=True)
+    logic = GameLogic(params)
+    assert logic.n_states == logic.state_encoder.n_states
+
+    qlearning = QLearning(logic, sparse=True)
+    for e in range(500):
+        qlearning.reset()
+        eps = max(0.01, np.exp(-0.01 * e))
+        for _ in range(50):
+            # pylint: disable=W0612
+            r, done, info = qlearning.step(lr=0.5, gamma=0.95, eps=eps)
+            if done:
+                break
+
+    # greedy policy feeds the Hippo
+    state = logic.reset()
+    for _ in range(10):
+        state, reward, done, _ = logic.step(qlearning.get_q_values(state).argmax())
+        if done:
+            break
+
+    assert logic.hippo_is_fed
+    assert len(qlearning.get_q_values()) < logic.n_states
+
+
+def test_batched_q_learning():
+    num_envs = 8
+    params = GameParams(Modes.AUTOMATICRL, game_height=3, game_width=4,
+                        lava_random=2, lava_is_terminal=True, lava_reward=-10,
+                        green_random=1, green_is_terminal=True, green_reward=10)
+    env = BatchedGameLogic(params, num_envs)
+
+    # the last environment doesn't learn
+    lr = np.full(num_envs, 0.5)
+    lr[-1] = 0.
+    qlearning = BatchedQLearning(env)
+    for _ in range(5000):
+        qlearning.step(lr=lr, gamma=0.9, eps=0.3)
+
+    assert qlearning.get_q_values().shape == (num_envs, env.n_states, env.n_actions)
+    assert (qlearning.get_q_values(num_envs - 1) == 0).all()
+
+    for i, logic in enumerate(env.logics[:-1]):
+        optimal = planning.value_iteration(logic.to_mdp(), gamma=0.9)
+        start = logic.reset()
+        assert qlearning.get_q_values(i)[start].max() == pytest.approx(optimal.V[start], abs=0.1)
+
+
+def test_batched_q_learning_shared():
+    # all boards are the same, so they can share one Q-table
+    params = GameParams(Modes.AUTOMATICRL, game_height=3, game_width=4,
+                        scrat_random=False, scrat_start_position=(0, 2),
+                        lava_cells=[(1, 1), (2, 1)], lava_is_terminal=True, lava_reward=-10,
+                        green_cells=[(3, 0)], green_is_terminal=True, green_reward=10)
+    env = BatchedGameLogic(params, 16)
+    qlearning = BatchedQLearning(env, shared=True)
+    for _ in range(1000):
+        qlearning.step(lr=0.3, gamma=0.9, eps=0.3)
+
+    logic = env.logics[0]
+    optimal = planning.value_iteration(logic.to_mdp(), gamma=0.9)
+    start = logic.reset()
+    assert qlearning.get_q_values().shape == (env.n_states, env.n_actions)
+    assert qlearning.get_q_values()[start].max() == pytest.approx(optimal.V[start], abs=0.1)
+
+
+def test_q_learning_rng():
+    params = GameParams(Modes.AUTOMATICRL, game_height=3, game_width=4,
+                        lava_random=2, lava_is_terminal=True, lava_reward=-10,
+                        green_random=1, green_is_terminal=True, green_reward=10, seed=0)
+
+    for function in (q_learning, q_learning_fast):
+        runs = []
+        for _ in range(2):
+            logic = GameLogic(params)
+            rng = np.random.default_rng(1)
+            q_table = None
+            for _ in range(20):
+                _, q_table, _, _, info = function(logic, logic.reset(), 50, q_table, eps=0.5, rng=rng)
+            runs.append((q_table, info['actions']))
+
+        assert (runs[0][0] == runs[1][0]).all()
+        assert list(runs[0][1]) == list(runs[1][1])
+
+    q_tables = []
+    for _ in range(2):
+        qlearning = BatchedQLearning(BatchedGameLogic(params, 4), rng=np.random.default_rng(2))
+        for _ in range(200):
+            qlearning.step(0.5, 0.9, 0.5)
+        q_tables.append(qlearning.get_q_values())
+    assert (q_tables[0] == q_tables[1]).all()
+
+
+def test_q_learning_run():
+    params = GameParams(Modes.AUTOMATICRL, game_height=3, game_width=4,
+                        scrat_random=False, scrat_start_position=(0, 2),
+                        lava_cells=[(1, 1), (2, 1)], lava_is_terminal=True, lava_reward=-10,
+                        green_cells=[(3, 0)], green_is_terminal=True, green_reward=10)
+    logic = GameLogic(params)
+    qlearning = QLearning(logic, rng=np.random.default_rng(0))
+
+    made, finished = qlearning.run_steps(500, lr=0.3, gamma=0.9, eps=0.3)
+    assert made == 500 and finished >= 1
+
+    made, finished = qlearning.run_episodes(1000, lr=0.3, gamma=0.9, eps=0.3)
+    assert finished == 1000 and made >= 1000
+    assert qlearning.done and logic.done
+
+    optimal = planning.value_iteration(logic.to_mdp(), gamma=0.9)
+    start = logic.reset()
+    assert qlearning.get_q_values()[start].max() == pytest.approx(optimal.V[start], abs=0.1)
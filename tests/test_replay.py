@@ -0,0 +1,102 @@
+# pylint: disable=W0611
+import pytest
+import numpy as np
+
+from mdp_visualizer.logic.gameLogic import GameLogic, GameParams
+from mdp_visualizer.logic.actions_objects_list import Modes
+from mdp_visualizer.logic.q_learning import q_learning_fast
+from mdp_visualizer.logic.replay import Replay
+from mdp_visualizer.logic.trajectory import TrajectoryRecorder, Trajectories
+
+
+def record_run(directory, params, n_episodes=30, max_steps=20):
+    logic = GameLogic(params)
+    positions = []
+    q_table = np.zeros([logic.n_states, logic.n_actions])
+    with TrajectoryRecorder(directory, chunk_size=50) as recorder:
+        recorder.save_params(logic.start_params)
+        for episode in range(n_episodes):
+            state = logic.reset()
+            positions.append((logic.scrat_position, logic.hippo_position, logic.watermelon_position))
+            for _ in range(max_steps):
+                action = int(logic.rng.integers(logic.n_actions))
+                next_state, reward, done, _ = logic.step(action)
+                recorder.record(state, action, reward, next_state, done)
+                q_table[state, action] += 1
+                positions.append((logic.scrat_position, logic.hippo_position, logic.watermelon_position))
+                state = next_state
+                if done:
+                    break
+            recorder.end_episode()
+            if episode % 10 == 9:
+                recorder.save_q_snapshot(q_table)
+
+    return logic, positions
+
+
+def test_params_saved(tmp_path):
+    params = GameParams(Modes.AUTOMATICRL, game_height=4, game_width=5,
+                        lava_random=3, lava_is_terminal=True, green_random=2, green_is_terminal=True, seed=0)
+    logic, _ = record_run(str(tmp_path), params, n_episodes=1)
+
+    loaded = GameLogic(Trajectories(str(tmp_path)).params)
+    assert sorted(loaded.lava_cells) == sorted(logic.lava_cells)
+    assert sorted(loaded.green_cells) == sorted(logic.green_cells)
+    assert sorted(set(loaded.terminal_cells)) == sorted(set(logic.terminal_cells))
+    assert loaded.scrat_position == logic.start_params.scrat_start_position
+
+
+@pytest.mark.parametrize('full_state', [False, True])
+def test_replay_seek(tmp_path, full_state):
+    params = GameParams(Modes.IAMRLAGENT, game_height=4, game_width=5,
+                        hippo_random=True, hippo_move_prob=0.5,
+                        watermelon_random=True, watermelon_move_prob=0.5,
+                        lava_random=3, lava_is_terminal=True, full_state=full_state, seed=2)
+    _, positions = record_run(str(tmp_path), params)
+    trajectories = Trajectories(str(tmp_path))
+    replay = Replay(trajectories)
+
+    # every transition of an episode shows the state after it, positions of the recorded run are restored
+    dones = trajectories['done']
+    episodes = trajectories['episode']
+    shown = [positions[0]]
+    index = 0
+    for step in range(len(trajectories)):
+        index += 1
+        shown.append(positions[index])
+        if step + 1 < len(trajectories) and episodes[step + 1] != episodes[step]:
+            index += 1  # the start of the next episode isn't a position of the replay
+
+    for position in np.random.default_rng(0).permutation(len(trajectories) + 1)[:100].tolist():
+        assert replay.seek(position) == position
+        scrat, hippo, watermelon = shown[position]
+        assert replay.logic.scrat_position == scrat
+        if full_state:
+            assert replay.logic.hippo_position == hippo
+            assert replay.logic.watermelon_position == watermelon
+        if position:
+            assert replay.logic.done == dones[position - 1]
+
+    assert replay.seek(10 ** 9) == len(trajectories) and replay.finished
+    assert replay.advance(-5) == len(trajectories) - 5
+
+
+def test_replay_snapshots(tmp_path):
+    params = GameParams(Modes.AUTOMATICRL, game_height=4, game_width=5,
+                        lava_random=3, lava_is_terminal=True, green_random=2, green_is_terminal=True, seed=3)
+    record_run(str(tmp_path), params)
+    trajectories = Trajectories(str(tmp_path))
+    replay = Replay(trajectories)
+
+    assert len(trajectories.snapshot_steps) == 3
+    first = int(trajectories.snapshot_steps[0])
+    replay.seek(first - 1)
+    assert replay.q_values is None and replay.cell_values() is None
+
+    replay.seek(first)
+    assert replay.snapshot_step == first
+    assert replay.cell_values().tolist() == np.asarray(replay.q_values).max(axis=1).tolist()
+    assert replay.q_values.sum() == first
+
+    replay.seek(len(trajectories))
+    assert replay.snapshot_step == trajectories.snapshot_steps[-1]
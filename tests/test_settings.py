@@ -0,0 +1,26 @@
+import gettext
+import subprocess
+import sys
+
+from mdp_visualizer import settings
+from mdp_visualizer.utils import path
+
+
+def test_imports_without_qt():
+    code = ("import sys\n"
+            "import mdp_visualizer.logic, mdp_visualizer.settings\n"
+            "assert not [name for name in sys.modules if name.startswith('PyQt5')]\n"
+            "assert 'scipy' not in sys.modules\n")
+    subprocess.run([sys.executable, '-c', code], check=True, capture_output=True)
+
+
+def test_lazy_settings():
+    # pylint: disable=W0212
+    translation = gettext.translation('game', path('locale'), languages=['ru'])
+    assert settings.I_AM_RL_AGENT == translation.gettext("I Am RL Agent")
+    assert settings.REWARD_FONT.pixelSize() == 36
+    assert settings.RED_CELL.red() == 200
+
+    lazy_names = set().union(*(names for names, _ in settings._LAZY_GROUPS))
+    assert lazy_names == set(settings._TEXTS) | set(settings._load_qt_objects())
+    assert lazy_names <= set(dir(settings))
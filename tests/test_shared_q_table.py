@@ -0,0 +1,35 @@
+import numpy as np
+
+from mdp_visualizer.logic.shared_q_table import SharedQTable
+
+
+def test_shared_table_publish():
+    with SharedQTable((5, 3)) as table:
+        assert table.version == 0
+        assert table.read().state == -1 and not table.read().result.any()
+
+        with SharedQTable(table.shape, table.name) as other:
+            q_table = np.arange(15, dtype=float).reshape(5, 3)
+            other.publish(q_table, state=4, episode=2, steps=30)
+
+        snapshot = table.read(lambda shared: shared.max(axis=1))
+        assert snapshot.version == table.version == 1
+        assert (snapshot.state, snapshot.episode, snapshot.steps) == (4, 2, 30)
+        assert snapshot.result.tolist() == [2, 5, 8, 11, 14]
+        assert table.q_values(1).tolist() == [3, 4, 5]
+
+
+def test_shared_table_read_retries():
+    with SharedQTable((4, 2)) as table:
+        writes = []
+
+        def read_during_write(shared):
+            # the writer publishes a new table while it is being read
+            if len(writes) < 3:
+                writes.append(len(writes))
+                table.publish(np.full(shared.shape, len(writes)), episode=len(writes))
+            return shared.sum()
+
+        snapshot = table.read(read_during_write)
+        assert snapshot.version == 3
+        assert snapshot.result == 3 * 8 and snapshot.episode == 3
@@ -0,0 +1,36 @@
+# pylint: disable=W0611
+import pytest
+import numpy as np
+
+from mdp_visualizer.logic.gameLogic import GameParams
+from mdp_visualizer.logic.actions_objects_list import Modes
+from mdp_visualizer.logic.sweep import make_grid, run_sweep, iter_sweep, load_results
+
+
+def test_sweep(tmp_path):
+    params = GameParams(Modes.AUTOMATICRL, game_height=3, game_width=4,
+                        lava_random=2, lava_is_terminal=True, lava_reward=-10,
+                        green_random=1, green_is_terminal=True, green_reward=10)
+    configs = make_grid(lr=[0.1, 0.5], gamma=[0.9], eps=[0.2], n_boards=2)
+    assert len(configs) == 4
+
+    path = tmp_path / 'sweep.npz'
+    results = run_sweep(params, configs, n_episodes=20, max_steps=50, seed=1, n_workers=2, path=path)
+
+    assert [result.config for result in results] == configs
+    for result in results:
+        assert result.returns.shape == (20,)
+        assert result.q_table.shape == (12, 4)
+
+    # results are reproducible and don't depend on the number of workers
+    again = sorted(iter_sweep(params, configs, n_episodes=20, max_steps=50, seed=1, n_workers=1),
+                   key=lambda result: result.index)
+    for result, other in zip(results, again):
+        assert np.array_equal(result.returns, other.returns)
+        assert np.array_equal(result.q_table, other.q_table)
+
+    loaded = load_results(path)
+    assert [result.config for result in loaded] == configs
+    for result, other in zip(results, loaded):
+        assert np.array_equal(result.returns, other.returns)
+        assert np.allclose(result.q_table, other.q_table, atol=1e-5)
@@ -0,0 +1,36 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from mdp_visualizer import train
+from mdp_visualizer.logic.trajectory import Trajectories
+
+
+def test_train_imports_no_qt():
+    code = ("import sys\n"
+            "from mdp_visualizer import train\n"
+            "train.main(['--episodes', '5', '--seed', '0'])\n"
+            "assert not [name for name in sys.modules if name.startswith('PyQt5')]\n")
+    subprocess.run([sys.executable, '-c', code], check=True, capture_output=True)
+
+
+def test_train_config(tmp_path, capsys):
+    config_path = tmp_path / 'config.json'
+    output_path = tmp_path / 'q_table.npy'
+    config_path.write_text(json.dumps({'mode': 'iamrlagent', 'height': 3, 'width': 3, 'lava': 1,
+                                       'full-state': True, 'sparse': True, 'episodes': 1000}))
+
+    record_path = tmp_path / 'trajectories'
+    assert train.main(['--config', str(config_path), '--episodes', '10', '--max-steps', '20',
+                       '--output', str(output_path), '--record', str(record_path), '--seed', '0']) == 0
+
+    assert 'episodes 10' in capsys.readouterr().out
+    assert np.load(output_path).shape == (9 ** 3 * 4, 6)
+    assert Trajectories(str(record_path)).n_episodes == 10
+
+
+def test_train_batched(capsys):
+    assert train.main(['--engine', 'batched', '--n-envs', '8', '--episodes', '20', '--seed', '0']) == 0
+    assert 'episodes 20' in capsys.readouterr().out
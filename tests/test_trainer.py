@@ -0,0 +1,96 @@
+# pylint: disable=W0611
+import multiprocessing
+import sys
+
+import pytest
+import numpy as np
+
+from mdp_visualizer.logic.gameLogic import GameLogic, GameParams
+from mdp_visualizer.logic.actions_objects_list import Modes
+from mdp_visualizer.logic import planning
+from mdp_visualizer.logic.trainer import BackgroundTrainer, ProcessTrainer, make_trainer
+
+
+def make_params():
+    return GameParams(Modes.AUTOMATICRL, game_height=3, game_width=4,
+                      scrat_random=False, scrat_start_position=(0, 2),
+                      lava_cells=[(1, 1), (2, 1)], lava_is_terminal=True, lava_reward=-10,
+                      green_cells=[(3, 0)], green_is_terminal=True, green_reward=10)
+
+
+@pytest.mark.parametrize('trainer_class', [BackgroundTrainer, ProcessTrainer])
+def test_trainer_converges(trainer_class):
+    with trainer_class(make_params(), lr=0.3, gamma=0.9, eps=0.3, max_steps=100, publish_interval=0.,
+                       max_episodes=2000, max_events=10, rng=np.random.default_rng(0)) as trainer:
+        first = trainer.latest()
+        assert first.episode == 0 and not first.q_table.any()
+
+        trainer.start()
+        trainer.join(timeout=60)
+        assert not trainer.running
+
+        # the queue keeps only the latest episodes
+        events = trainer.events()
+        assert [event.episode for event in events] == list(range(1991, 2001))
+        assert trainer.events() == []
+
+        last = trainer.latest()
+        assert last.version > first.version and last.episode == 2000
+        assert last.steps >= 2000
+
+        logic = GameLogic(make_params())
+        optimal = planning.value_iteration(logic.to_mdp(), gamma=0.9)
+        start = logic.reset()
+        q_table = trainer.stop()
+        assert q_table[start].max() == pytest.approx(optimal.V[start], abs=0.1)
+        assert last.q_table.tolist() == q_table.tolist()
+
+
+@pytest.mark.parametrize('trainer_class', [BackgroundTrainer, ProcessTrainer])
+def test_trainer_stop(trainer_class):
+    logic = GameLogic(make_params())
+    q_table = np.ones([logic.n_states, logic.n_actions])
+    with trainer_class(logic.start_params, q_table, publish_interval=0.01) as trainer:
+        trainer.start()
+        trainer.start()
+        assert trainer.running
+
+        trained = trainer.stop()
+        assert not trainer.running
+        assert trained.shape == q_table.shape
+
+        # training continues from the trained values
+        episode = trainer.latest().episode
+        trainer.start()
+        trainer.stop()
+        assert trainer.latest().episode >= episode
+
+    # the initial table is copied
+    assert (q_table == 1).all()
+    # the game board isn't touched by the trainer
+    assert logic.scrat_position == (0, 2)
+
+
+@pytest.mark.parametrize('trainer_class', [BackgroundTrainer, ProcessTrainer])
+def test_trainer_reads_latest_table(trainer_class):
+    with trainer_class(make_params(), max_episodes=100) as trainer:
+        trainer.start()
+        trainer.join(timeout=60)
+
+        version = trainer.version
+        snapshot = trainer.latest(lambda q_table: q_table.max(axis=1))
+        assert snapshot.version == version
+        assert snapshot.q_table.tolist() == trainer.latest().q_table.max(axis=1).tolist()
+        assert snapshot.state >= 0
+        assert trainer.q_values(3).tolist() == trainer.latest().q_table[3].tolist()
+
+
+def test_make_trainer(monkeypatch):
+    with make_trainer(make_params(), max_episodes=10) as trainer:
+        assert isinstance(trainer, ProcessTrainer)
+
+    # without shared memory the trainer runs in a thread
+    monkeypatch.setitem(sys.modules, 'multiprocessing.shared_memory', None)
+    monkeypatch.delattr(multiprocessing, 'shared_memory', raising=False)
+    with make_trainer(make_params(), max_episodes=10) as trainer:
+        assert isinstance(trainer, BackgroundTrainer)
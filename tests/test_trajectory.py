@@ -0,0 +1,87 @@
+# pylint: disable=W0611
+import pytest
+import numpy as np
+
+from mdp_visualizer.logic.gameLogic import GameLogic, GameParams
+from mdp_visualizer.logic.actions_objects_list import Modes
+from mdp_visualizer.logic.q_learning import q_learning, q_learning_fast, QLearning
+from mdp_visualizer.logic.trajectory import TrajectoryRecorder, Trajectories
+
+
+def test_recorder_segments(tmp_path):
+    chunk_size = 7
+    transitions = []
+    with TrajectoryRecorder(str(tmp_path), chunk_size=chunk_size) as recorder:
+        for step in range(30):
+            done = step % 4 == 3
+            transitions.append((step // 4, step, step % 3, 0.5 * step, step + 1, done))
+            recorder.record(step, step % 3, 0.5 * step, step + 1, done)
+        assert recorder.n_steps == 30
+
+    trajectories = Trajectories(str(tmp_path))
+    assert len(trajectories.segments) == 5
+    assert len(trajectories) == 30
+    assert isinstance(trajectories.segments[0]['state'], np.memmap)
+
+    columns = ('episode', 'state', 'action', 'reward', 'next_state', 'done')
+    for i, column in enumerate(columns):
+        assert trajectories[column].tolist() == [transition[i] for transition in transitions]
+
+    # episodes crossing segments are concatenated
+    assert trajectories.n_episodes == 8
+    assert trajectories.episode(1)['state'].tolist() == [4, 5, 6, 7]
+    assert trajectories.episode(7)['done'].tolist() == [False, False]
+    with pytest.raises(KeyError):
+        trajectories.episode(8)
+
+    # recording continues with new segments and a new episode
+    with TrajectoryRecorder(str(tmp_path), chunk_size=chunk_size) as recorder:
+        recorder.record(0, 0, 1., 1, False)
+    trajectories = Trajectories(str(tmp_path))
+    assert len(trajectories.segments) == 6
+    assert list(trajectories.episode_ids) == list(range(9))
+
+
+@pytest.mark.parametrize('function', [q_learning, q_learning_fast])
+def test_q_learning_recorder(tmp_path, function):
+    params = GameParams(Modes.AUTOMATICRL, game_height=3, game_width=4,
+                        lava_random=2, lava_is_terminal=True, lava_reward=-10,
+                        green_random=1, green_is_terminal=True, green_reward=10, seed=0)
+    logic = GameLogic(params)
+
+    infos = []
+    with TrajectoryRecorder(str(tmp_path), chunk_size=16) as recorder:
+        q_table = None
+        for _ in range(20):
+            _, q_table, _, done, info = function(logic, logic.reset(), 10, q_table, eps=0.5, recorder=recorder)
+            recorder.end_episode()
+            infos.append((info, done))
+
+    trajectories = Trajectories(str(tmp_path))
+    assert trajectories.n_episodes == 20
+    for (info, done), (episode_id, episode) in zip(infos, trajectories.iter_episodes()):
+        assert (episode['episode'] == episode_id).all()
+        assert episode['state'].tolist() == list(info['states'][:-1])
+        assert episode['next_state'].tolist() == list(info['states'][1:])
+        assert episode['action'].tolist() == list(info['actions'])
+        assert episode['reward'].tolist() == pytest.approx(list(info['rewards']))
+        assert episode['done'].tolist() == [False] * (len(info['actions']) - 1) + [done]
+
+
+def test_q_learning_class_recorder(tmp_path):
+    params = GameParams(Modes.AUTOMATICRL, game_height=3, game_width=4,
+                        lava_random=2, lava_is_terminal=True, green_random=1, green_is_terminal=True, seed=1)
+
+    with TrajectoryRecorder(str(tmp_path)) as recorder:
+        qlearning = QLearning(GameLogic(params), recorder=recorder)
+        for _ in range(5):
+            qlearning.reset()
+            for _ in range(8):
+                _, done, _ = qlearning.step(eps=1.)
+                if done:
+                    break
+
+    trajectories = Trajectories(str(tmp_path))
+    assert trajectories.n_episodes == 5
+    assert trajectories['done'].sum() == sum(1 for _, episode in trajectories.iter_episodes()
+                                             if episode['done'][-1])
@@ -1,6 +1,6 @@
 import pytest
 
-from mdp_visualizer.utils import value_update
+from mdp_visualizer.utils import value_update, adapt_batch_size, ramp_index, frame_statistics
 
 
 def test_value_update():
@@ -15,3 +15,39 @@ def test_value_update():
     new_val, done = value_update(-9.9, -10, 1)
     assert done
     assert new_val == -10
+
+
+def test_adapt_batch_size():
+    # a fast batch grows, but not more than twice
+    assert adapt_batch_size(10, 1, 10, 1000) == 20
+    assert adapt_batch_size(10, 0, 10, 1000) == 20
+    assert adapt_batch_size(10, 5, 10, 1000) == 20
+    assert adapt_batch_size(10, 8, 10, 1000) == 12
+
+    # a slow batch shrinks, but not less than twice and to 1 at least
+    assert adapt_batch_size(10, 40, 10, 1000) == 5
+    assert adapt_batch_size(1, 40, 10, 1000) == 1
+
+    assert adapt_batch_size(800, 1, 10, 1000) == 1000
+
+
+def test_ramp_index():
+    assert ramp_index(-10, -10, 10, 257) == 0
+    assert ramp_index(0, -10, 10, 257) == 128
+    assert ramp_index(10, -10, 10, 257) == 256
+    assert ramp_index(5, -10, 10, 257) == 192
+
+    # values out of the bounds get the nearest colour
+    assert ramp_index(-100, -10, 10, 257) == 0
+    assert ramp_index(100, -10, 10, 257) == 256
+
+
+def test_frame_statistics():
+    fps, mean_time, max_time, area = frame_statistics([2., 4., 6.], [0.1, 0.2, 0.6], 500)
+    assert fps == pytest.approx(6)
+    assert mean_time == pytest.approx(4)
+    assert max_time == 6
+    assert area == pytest.approx(0.3)
+
+    assert frame_statistics([], [], 500) == (0, 0, 0, 0)
+    assert frame_statistics([1.], [1.], 0)[0] == 0